@@ -0,0 +1,235 @@
+"""Offline benchmark for ``FeedWorker.run_once``.
+
+Serves synthetic feeds and articles from a local HTTP server and replaces
+Telegram and the LLM providers with stand-ins of configurable latency and
+error rate, then reports throughput and per-stage p50/p99 latency.
+
+    python -m benchmarks.pipeline --feeds 10 100 1000 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.pipeline --baseline benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.db import Database
+from src.feed_worker import FeedWorker, WorkerConfig
+
+from .stand_ins import FakeBot, FakeSummarizer, FeedServer
+
+STAGES = ("feed", "article", "extract", "summarize", "deliver")
+
+# Ignore p99 increases smaller than this; sub-millisecond stages are mostly noise.
+_MIN_REGRESSION_SECONDS = 0.005
+
+
+@dataclass
+class BenchConfig:
+    entries_per_feed: int = 3
+    paragraphs: int = 12
+    http_latency: float = 0.0
+    summary_latency: float = 0.05
+    summary_error_rate: float = 0.0
+    bot_latency: float = 0.005
+    bot_error_rate: float = 0.0
+    feed_concurrency: int = 8
+    article_workers: int = 8
+    extract_workers: int = 2
+    summarize_workers: int = 4
+    seed: int = 0
+
+
+@dataclass
+class RunResult:
+    feeds: int
+    delivered: int
+    wall_seconds: float
+    stage_seconds: dict[str, list[float]] = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        return {
+            "delivered": self.delivered,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "entries_per_second": round(self.delivered / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+            "stages": {
+                name: {
+                    "count": len(samples),
+                    "p50": round(percentile(samples, 0.5), 6),
+                    "p99": round(percentile(samples, 0.99), 6),
+                }
+                for name, samples in self.stage_seconds.items()
+            },
+        }
+
+
+def percentile(samples: list[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def _timed(samples: list[float], fn):
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+
+    return wrapper
+
+
+async def run_once(server: FeedServer, feeds: int, cfg: BenchConfig) -> RunResult:
+    """Poll ``feeds`` synthetic feeds once through a fresh worker and database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        bot = FakeBot(cfg.bot_latency, cfg.bot_error_rate, seed=cfg.seed)
+        summarizer = FakeSummarizer(cfg.summary_latency, cfg.summary_error_rate, seed=cfg.seed)
+        config = WorkerConfig(
+            channel_id="@bench",
+            quiet_start_hour=0,
+            quiet_end_hour=0,
+            feed_concurrency=cfg.feed_concurrency,
+            # Every synthetic feed lives on 127.0.0.1, so the per-host cap would
+            # serialise the whole run.
+            feed_per_host_concurrency=cfg.feed_concurrency,
+            article_workers=cfg.article_workers,
+            extract_workers=cfg.extract_workers,
+            summarize_workers=cfg.summarize_workers,
+            # Measure the pipeline, not Telegram's channel limit.
+            telegram_messages_per_minute=600_000,
+            telegram_burst=100,
+        )
+        worker = FeedWorker(db=db, bot=bot, summarizer=summarizer, config=config)
+        stages = {name: [] for name in STAGES}
+        worker._collect_entries = _timed(stages["feed"], worker._collect_entries)
+        worker._stage_fetch = _timed(stages["article"], worker._stage_fetch)
+        worker._stage_extract = _timed(stages["extract"], worker._stage_extract)
+        worker._stage_summarize = _timed(stages["summarize"], worker._stage_summarize)
+        for n in range(feeds):
+            db.add_feed(server.feed_url(n))
+
+        started = time.perf_counter()
+        try:
+            await worker.run_once()
+            while await db.aio.outbox_size():
+                if not await worker.delivery.drain():
+                    await asyncio.sleep(0.05)
+            wall = time.perf_counter() - started
+        finally:
+            await worker.aclose()
+            db.close()
+        stages["deliver"] = bot.send_seconds
+        return RunResult(feeds=feeds, delivered=len(bot.sent), wall_seconds=wall, stage_seconds=stages)
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a line per metric that regressed by more than ``tolerance``."""
+    problems: list[str] = []
+    for feeds, result in current.items():
+        base = baseline.get(feeds)
+        if base is None:
+            continue
+        floor = base["entries_per_second"] * (1 - tolerance)
+        if result["entries_per_second"] < floor:
+            problems.append(
+                f"{feeds} feeds: throughput {result['entries_per_second']}/s < {floor:.2f}/s "
+                f"(baseline {base['entries_per_second']}/s)"
+            )
+        for stage, stats in result["stages"].items():
+            base_p99 = base.get("stages", {}).get(stage, {}).get("p99")
+            if base_p99 is None:
+                continue
+            ceiling = max(base_p99 * (1 + tolerance), base_p99 + _MIN_REGRESSION_SECONDS)
+            if stats["p99"] > ceiling:
+                problems.append(
+                    f"{feeds} feeds: {stage} p99 {stats['p99'] * 1000:.1f}ms > {ceiling * 1000:.1f}ms "
+                    f"(baseline {base_p99 * 1000:.1f}ms)"
+                )
+    return problems
+
+
+def format_report(results: dict) -> str:
+    header = f"{'feeds':>6} {'sent':>6} {'wall s':>8} {'sent/s':>8}  " + "  ".join(
+        f"{name + ' p50/p99 ms':>24}" for name in STAGES
+    )
+    lines = [header]
+    for feeds, r in results.items():
+        cells = "  ".join(
+            f"{r['stages'][name]['p50'] * 1000:>11.1f}/{r['stages'][name]['p99'] * 1000:<12.1f}"
+            for name in STAGES
+        )
+        lines.append(
+            f"{feeds:>6} {r['delivered']:>6} {r['wall_seconds']:>8.2f} {r['entries_per_second']:>8.1f}  {cells}"
+        )
+    return "\n".join(lines)
+
+
+async def run_suite(feed_counts: list[int], cfg: BenchConfig) -> dict:
+    server = FeedServer(cfg.entries_per_feed, cfg.paragraphs, cfg.http_latency).start()
+    try:
+        results = {}
+        for feeds in feed_counts:
+            results[str(feeds)] = (await run_once(server, feeds, cfg)).summary()
+        return results
+    finally:
+        server.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--entries", type=int, default=BenchConfig.entries_per_feed, help="entries per feed")
+    parser.add_argument("--http-latency", type=float, default=BenchConfig.http_latency)
+    parser.add_argument("--summary-latency", type=float, default=BenchConfig.summary_latency)
+    parser.add_argument("--summary-error-rate", type=float, default=BenchConfig.summary_error_rate)
+    parser.add_argument("--bot-latency", type=float, default=BenchConfig.bot_latency)
+    parser.add_argument("--bot-error-rate", type=float, default=BenchConfig.bot_error_rate)
+    parser.add_argument("--feed-concurrency", type=int, default=BenchConfig.feed_concurrency)
+    parser.add_argument("--summarize-workers", type=int, default=BenchConfig.summarize_workers)
+    parser.add_argument("--save-baseline", type=Path, help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against this JSON file; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    cfg = BenchConfig(
+        entries_per_feed=args.entries,
+        http_latency=args.http_latency,
+        summary_latency=args.summary_latency,
+        summary_error_rate=args.summary_error_rate,
+        bot_latency=args.bot_latency,
+        bot_error_rate=args.bot_error_rate,
+        feed_concurrency=args.feed_concurrency,
+        summarize_workers=args.summarize_workers,
+    )
+    results = asyncio.run(run_suite(args.feeds, cfg))
+    print(format_report(results))
+
+    if args.save_baseline:
+        payload = {"python": platform.python_version(), "config": vars(cfg), "results": results}
+        args.save_baseline.write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        problems = compare(results, baseline["results"], args.tolerance)
+        for line in problems:
+            print(f"REGRESSION {line}")
+        if problems:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
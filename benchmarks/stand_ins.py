@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telegram.error import RetryAfter
+
+_WORDS = (
+    "market rates inflation earnings guidance supply demand policy yield credit growth "
+    "margin capital spending revenue forecast risk valuation liquidity consumer export"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _article_html(feed: int, entry: int, paragraphs: int) -> str:
+    rng = random.Random(feed * 10_007 + entry)
+    body = "\n".join(
+        f"<p>{' '.join(_sentence(rng) for _ in range(4))}</p>" for _ in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>Post {feed}-{entry}</title></head><body>"
+        f"<nav>Home | About | Subscribe</nav><article><h1>Post {feed}-{entry}</h1>\n{body}\n</article>"
+        f"<footer>Copyright</footer></body></html>"
+    )
+
+
+class FeedServer:
+    """Local HTTP server serving synthetic feeds and article pages.
+
+    ``/feed/<n>.xml`` is RSS for even ``n`` and Atom for odd ``n``; each lists
+    ``entries`` posts published within the last day, linking to
+    ``/article/<n>/<i>.html``. ``latency`` delays every response.
+    """
+
+    def __init__(self, entries: int = 3, paragraphs: int = 12, latency: float = 0.0):
+        self.entries = entries
+        self.paragraphs = paragraphs
+        self.latency = latency
+        self.requests = 0
+        self._now = datetime.now(timezone.utc)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_url(self, n: int) -> str:
+        return f"{self.base_url}/feed/{n}.xml"
+
+    def start(self) -> FeedServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def render(self, path: str) -> tuple[str, bytes] | None:
+        parts = path.strip("/").split("/")
+        try:
+            if parts[0] == "feed" and len(parts) == 2:
+                return self._feed(int(parts[1].removesuffix(".xml")))
+            if parts[0] == "article" and len(parts) == 3:
+                feed, entry = int(parts[1]), int(parts[2].removesuffix(".html"))
+                return "text/html; charset=utf-8", _article_html(feed, entry, self.paragraphs).encode()
+        except ValueError:
+            pass
+        return None
+
+    def _feed(self, n: int) -> tuple[str, bytes]:
+        items = []
+        for i in range(self.entries):
+            # Newest first, one post per hour, so every entry is inside the lookback window.
+            published = self._now - timedelta(hours=i + 1)
+            link = f"{self.base_url}/article/{n}/{i}.html"
+            title = escape(f"Post {n}-{i}")
+            if n % 2 == 0:
+                items.append(
+                    f"<item><title>{title}</title><link>{link}</link><guid>{link}</guid>"
+                    f"<pubDate>{format_datetime(published)}</pubDate></item>"
+                )
+            else:
+                items.append(
+                    f'<entry><title>{title}</title><link href="{link}"/><id>{link}</id>'
+                    f"<updated>{published.isoformat()}</updated></entry>"
+                )
+        if n % 2 == 0:
+            body = (
+                '<?xml version="1.0"?><rss version="2.0"><channel>'
+                f"<title>Feed {n}</title><link>{self.base_url}</link>{''.join(items)}</channel></rss>"
+            )
+            return "application/rss+xml", body.encode()
+        body = (
+            '<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            f"<title>Feed {n}</title><id>{self.feed_url(n)}</id>{''.join(items)}</feed>"
+        )
+        return "application/atom+xml", body.encode()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                rendered = server.render(self.path)
+                if rendered is None:
+                    self.send_error(404)
+                    return
+                content_type, body = rendered
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+
+class FakeBot:
+    """Stands in for ``telegram.Bot``: sleeps ``latency`` per send and answers
+    ``error_rate`` of sends with flood control (RetryAfter)."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.sent: list[str] = []
+        self.send_seconds: list[float] = []
+        self._rng = random.Random(seed)
+
+    async def send_message(self, chat_id: str, text: str, **kwargs: object) -> None:
+        started = time.perf_counter()
+        await asyncio.sleep(self.latency)
+        if self._rng.random() < self.error_rate:
+            raise RetryAfter(1)
+        self.sent.append(text)
+        self.send_seconds.append(time.perf_counter() - started)
+
+
+class FakeSummarizer:
+    """Stands in for ``Summarizer``: sleeps ``latency`` (±50%) per call and
+    returns nothing for ``error_rate`` of calls."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    async def summarize_ko(self, title: str, url: str, content: str) -> str | None:
+        await asyncio.sleep(self.latency * self._rng.uniform(0.5, 1.5))
+        if self._rng.random() < self.error_rate:
+            return None
+        return f"{title} 요약: {content[:200]}"
+
+    async def aclose(self) -> None:
+        pass
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .content import normalize_url
+from .metrics import metrics
+
+KIND_HTML = "html"
+KIND_TEXT = "text"
+KIND_SUMMARY = "summary"
+
+# Cache hits only bump accessed_at in memory; written out in one go this often.
+_TOUCH_FLUSH_EVERY = 64
+
+
+def content_hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8", errors="replace")).hexdigest()
+
+
+class ContentCache:
+    """Persistent cache for each stage of the entry lifecycle.
+
+    Raw HTML is keyed by the normalized article URL; extracted text by the hash
+    of the HTML it came from; summaries by the hash of the extracted text. A
+    retry therefore resumes at the stage that failed, and identical content is
+    never extracted or summarized twice.
+
+    Methods are synchronous; ``cache.aio`` runs them on a dedicated thread so
+    multi-megabyte reads and writes stay off the event loop.
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: int = 7 * 24 * 3600, max_bytes: int = 200_000_000):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._puts = 0
+        self._total_bytes = 0
+        self._touched: dict[tuple[str, str], float] = {}
+        self._lock = threading.RLock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache")
+        self.aio = AsyncCache(self)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY(kind, key)
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache(accessed_at)")
+        self.conn.commit()
+        self.purge_expired()
+        row = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+        self._total_bytes = int(row[0])
+
+    def get(self, kind: str, key: str) -> str | None:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM cache WHERE kind = ? AND key = ?",
+                (kind, key),
+            ).fetchone()
+            if row is None:
+                metrics.inc("rss_cache_requests_total", kind=kind, result="miss")
+                return None
+            now = time.time()
+            if now - row[1] > self.ttl_seconds:
+                self._delete(kind, key)
+                metrics.inc("rss_cache_requests_total", kind=kind, result="miss")
+                return None
+            metrics.inc("rss_cache_requests_total", kind=kind, result="hit")
+            self._touched[(kind, key)] = now
+            if len(self._touched) >= _TOUCH_FLUSH_EVERY:
+                self._flush_touches()
+            return str(row[0])
+
+    def put(self, kind: str, key: str, value: str) -> None:
+        size = len(value.encode("utf-8", errors="replace"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM cache WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cache (kind, key, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (kind, key, value, size, now, now),
+                )
+            self._touched.pop((kind, key), None)
+            self._total_bytes += size - (int(old[0]) if old else 0)
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self.purge_expired()
+            if self._total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+
+    def get_html(self, url: str) -> str | None:
+        return self.get(KIND_HTML, normalize_url(url))
+
+    def put_html(self, url: str, html: str) -> None:
+        self.put(KIND_HTML, normalize_url(url), html)
+
+    def get_text(self, html: str) -> str | None:
+        return self.get(KIND_TEXT, content_hash(html))
+
+    def put_text(self, html: str, text: str) -> None:
+        self.put(KIND_TEXT, content_hash(html), text)
+
+    def get_summary(self, text: str) -> str | None:
+        return self.get(KIND_SUMMARY, content_hash(text))
+
+    def put_summary(self, text: str, summary: str) -> None:
+        self.put(KIND_SUMMARY, content_hash(text), summary)
+
+    def purge_expired(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock, self.conn:
+            freed = self.conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache WHERE created_at < ?", (cutoff,)
+            ).fetchone()[0]
+            self.conn.execute("DELETE FROM cache WHERE created_at < ?", (cutoff,))
+            self._total_bytes -= int(freed)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            self._flush_touches()
+            self.conn.close()
+
+    def _flush_touches(self) -> None:
+        if not self._touched:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE kind = ? AND key = ?",
+                [(at, kind, key) for (kind, key), at in self._touched.items()],
+            )
+        self._touched.clear()
+
+    def _evict(self, target_bytes: int) -> None:
+        """Drop least recently used rows until the cache fits in ``target_bytes``."""
+        self._flush_touches()
+        rows = self.conn.execute("SELECT kind, key, size FROM cache ORDER BY accessed_at ASC").fetchall()
+        doomed: list[tuple[str, str]] = []
+        for kind, key, size in rows:
+            if self._total_bytes <= target_bytes:
+                break
+            doomed.append((kind, key))
+            self._total_bytes -= int(size)
+        with self.conn:
+            self.conn.executemany("DELETE FROM cache WHERE kind = ? AND key = ?", doomed)
+
+    def _delete(self, kind: str, key: str) -> None:
+        row = self.conn.execute("SELECT size FROM cache WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        if row is None:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM cache WHERE kind = ? AND key = ?", (kind, key))
+        self._touched.pop((kind, key), None)
+        self._total_bytes -= int(row[0])
+
+
+class AsyncCache:
+    """Coroutine versions of the ``ContentCache`` lookups and stores.
+
+    Calls run one at a time on the cache's own thread, like ``db.aio`` writes.
+    """
+
+    def __init__(self, cache: ContentCache):
+        self._cache = cache
+
+    def __getattr__(self, name: str):
+        if not name.startswith(("get", "put")):
+            raise AttributeError(name)
+        method = getattr(self._cache, name)
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._cache._pool, functools.partial(method, *args, **kwargs))
+
+        call.__name__ = name
+        return call
@@ -12,6 +12,9 @@ class Settings:
     telegram_bot_token: str
     telegram_channel_id: str
     admin_user_ids: set[int]
+    telegram_mode: str
+    telegram_webhook_url: str
+    telegram_webhook_secret: str
     default_summary_provider: str
     gemini_api_key: str
     gemini_model: str
@@ -19,16 +22,55 @@ class Settings:
     openai_model: str
     database_path: Path
     poll_interval_minutes: int
+    poll_min_interval_minutes: int
+    poll_max_interval_minutes: int
     quiet_start_hour: int
     quiet_end_hour: int
+    quiet_prefetch: bool
+    quiet_release_spacing_seconds: int
+    digest_mode: bool
+    import_concurrency: int
     seed_feed_urls: list[str]
     lookback_hours: int
+    feed_concurrency: int
+    feed_per_host_concurrency: int
+    http2: bool
+    article_max_bytes: int
+    content_cache_path: Path
+    content_cache_ttl_hours: int
+    content_cache_max_mb: int
+    extract_processes: int
+    extract_timeout_seconds: int
+    article_workers: int
+    summarize_workers: int
+    summary_concurrency: int
+    gemini_rpm: int
+    gemini_tpm: int
+    openai_rpm: int
+    openai_tpm: int
+    hedge_percentile: float
+    provider_cooldown_seconds: int
+    summary_max_input_tokens: int
+    telegram_messages_per_minute: int
+    feed_stream_parse: bool
+    feed_retry_base_minutes: int
+    feed_retry_max_minutes: int
+    feed_degraded_after_errors: int
+    feed_stream_stop_after_seen: int
+    http_host: str
+    http_port: int
+    websub_callback_url: str
+    websub_poll_interval_minutes: int
 
 
 def _parse_seed_feeds(raw: str) -> list[str]:
     return [u.strip() for u in raw.split(",") if u.strip()]
 
 
+def _parse_bool(raw: str) -> bool:
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
 def _parse_admin_ids(raw: str) -> set[int]:
     result: set[int] = set()
     if not raw.strip():
@@ -51,10 +93,26 @@ def load_settings() -> Settings:
 
     db_path = Path(os.getenv("DATABASE_PATH", "./data/rss_bot.db")).resolve()
 
+    telegram_mode = os.getenv("TELEGRAM_MODE", "polling").strip().lower()
+    if telegram_mode not in ("polling", "webhook"):
+        raise ValueError("TELEGRAM_MODE must be 'polling' or 'webhook'.")
+    webhook_url = os.getenv("TELEGRAM_WEBHOOK_URL", "").strip()
+    http_port = int(os.getenv("HTTP_PORT", "0"))
+    if telegram_mode == "webhook":
+        if not webhook_url:
+            raise ValueError("TELEGRAM_WEBHOOK_URL is required when TELEGRAM_MODE=webhook.")
+        # PaaS platforms such as Railway pass the port to listen on in PORT.
+        http_port = http_port or int(os.getenv("PORT", "0"))
+        if not http_port:
+            raise ValueError("HTTP_PORT (or PORT) is required when TELEGRAM_MODE=webhook.")
+
     return Settings(
         telegram_bot_token=token,
         telegram_channel_id=channel,
         admin_user_ids=_parse_admin_ids(os.getenv("ADMIN_USER_IDS", "")),
+        telegram_mode=telegram_mode,
+        telegram_webhook_url=webhook_url,
+        telegram_webhook_secret=os.getenv("TELEGRAM_WEBHOOK_SECRET", "").strip(),
         default_summary_provider=os.getenv("DEFAULT_SUMMARY_PROVIDER", "gemini").strip().lower(),
         gemini_api_key=os.getenv("GEMINI_API_KEY", "").strip(),
         gemini_model=os.getenv("GEMINI_MODEL", "gemini-1.5-flash").strip(),
@@ -62,9 +120,46 @@ def load_settings() -> Settings:
         openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini").strip(),
         database_path=db_path,
         poll_interval_minutes=int(os.getenv("POLL_INTERVAL_MINUTES", "60")),
+        poll_min_interval_minutes=int(os.getenv("POLL_MIN_INTERVAL_MINUTES", "15")),
+        poll_max_interval_minutes=int(os.getenv("POLL_MAX_INTERVAL_MINUTES", "1440")),
         quiet_start_hour=int(os.getenv("QUIET_START_HOUR", "23")),
         quiet_end_hour=int(os.getenv("QUIET_END_HOUR", "8")),
+        quiet_prefetch=_parse_bool(os.getenv("QUIET_PREFETCH", "false")),
+        quiet_release_spacing_seconds=int(os.getenv("QUIET_RELEASE_SPACING_SECONDS", "20")),
+        digest_mode=_parse_bool(os.getenv("DIGEST_MODE", "false")),
+        import_concurrency=int(os.getenv("IMPORT_CONCURRENCY", "32")),
         seed_feed_urls=_parse_seed_feeds(os.getenv("SEED_FEEDS", "")),
         lookback_hours=int(os.getenv("LOOKBACK_HOURS", "48")),
+        feed_concurrency=int(os.getenv("FEED_CONCURRENCY", "8")),
+        feed_per_host_concurrency=int(os.getenv("FEED_PER_HOST_CONCURRENCY", "2")),
+        http2=_parse_bool(os.getenv("HTTP2", "false")),
+        article_max_bytes=int(os.getenv("ARTICLE_MAX_BYTES", "5000000")),
+        content_cache_path=Path(
+            os.getenv("CONTENT_CACHE_PATH", "").strip() or db_path.with_name("content_cache.db")
+        ).resolve(),
+        content_cache_ttl_hours=int(os.getenv("CONTENT_CACHE_TTL_HOURS", "168")),
+        content_cache_max_mb=int(os.getenv("CONTENT_CACHE_MAX_MB", "200")),
+        extract_processes=int(os.getenv("EXTRACT_PROCESSES", "2")),
+        extract_timeout_seconds=int(os.getenv("EXTRACT_TIMEOUT_SECONDS", "30")),
+        article_workers=int(os.getenv("ARTICLE_WORKERS", "8")),
+        summarize_workers=int(os.getenv("SUMMARIZE_WORKERS", "4")),
+        summary_concurrency=int(os.getenv("SUMMARY_CONCURRENCY", "4")),
+        gemini_rpm=int(os.getenv("GEMINI_RPM", "0")),
+        gemini_tpm=int(os.getenv("GEMINI_TPM", "0")),
+        openai_rpm=int(os.getenv("OPENAI_RPM", "0")),
+        openai_tpm=int(os.getenv("OPENAI_TPM", "0")),
+        hedge_percentile=float(os.getenv("HEDGE_PERCENTILE", "0.9")),
+        provider_cooldown_seconds=int(os.getenv("PROVIDER_COOLDOWN_SECONDS", "300")),
+        summary_max_input_tokens=int(os.getenv("SUMMARY_MAX_INPUT_TOKENS", "4000")),
+        telegram_messages_per_minute=int(os.getenv("TELEGRAM_MESSAGES_PER_MINUTE", "20")),
+        feed_retry_base_minutes=int(os.getenv("FEED_RETRY_BASE_MINUTES", "5")),
+        feed_retry_max_minutes=int(os.getenv("FEED_RETRY_MAX_MINUTES", "1440")),
+        feed_degraded_after_errors=int(os.getenv("FEED_DEGRADED_AFTER_ERRORS", "8")),
+        feed_stream_parse=_parse_bool(os.getenv("FEED_STREAM_PARSE", "true")),
+        feed_stream_stop_after_seen=int(os.getenv("FEED_STREAM_STOP_AFTER_SEEN", "20")),
+        http_host=os.getenv("HTTP_HOST", "0.0.0.0").strip(),
+        http_port=http_port,
+        websub_callback_url=os.getenv("WEBSUB_CALLBACK_URL", "").strip(),
+        websub_poll_interval_minutes=int(os.getenv("WEBSUB_POLL_INTERVAL_MINUTES", "720")),
     )
 
@@ -1,12 +1,87 @@
 from __future__ import annotations
 
 import re
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+if TYPE_CHECKING:
+    import httpx
+
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme and host, drop default ports and fragments."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+# Query parameters that only track where a click came from.
+_TRACKING_PARAMS = frozenset(
+    "fbclid gclid dclid msclkid yclid igshid mc_cid mc_eid mkt_tok _hsenc _hsmi ref ref_src "
+    "ref_url cmpid source share_source".split()
+)
+_TRACKING_PREFIXES = ("utm_",)
+
+
+def canonical_url(url: str) -> str:
+    """Key for recognising the same article across feeds.
+
+    On top of ``normalize_url`` this treats http and https alike, drops a
+    leading ``www.``, a trailing slash and tracking parameters, and sorts the
+    remaining query.
+    """
+    parts = urlsplit(normalize_url(url))
+    host = parts.netloc.removeprefix("www.").rstrip(".")
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)
+    )
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
 
 
 def is_substack_url(url: str) -> bool:
     return "substack.com" in url.lower()
 
 
+# Substack paywall markup, matched case-insensitively in one pass. The same
+# pattern runs over decoded HTML and over raw bytes while streaming.
+_PAYWALL_PATTERN = (
+    r"this post is for paid subscribers|become a paid subscriber|subscribe to continue reading|"
+    r"paid subscribers|paywall|subscriber-only|premium"
+)
+_PAYWALL_RE = re.compile(_PAYWALL_PATTERN, re.IGNORECASE)
+_PAYWALL_BYTES_RE = re.compile(_PAYWALL_PATTERN.encode("ascii"), re.IGNORECASE)
+_PAYWALL_MAX_MARKER = len("this post is for paid subscribers")
+
+
+class PaywallScanner:
+    """Incremental paywall check over a response body as it arrives.
+
+    Keeps the last few bytes of each chunk so markers split across chunk
+    boundaries are still found.
+    """
+
+    def __init__(self) -> None:
+        self.matched = False
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        if not self.matched:
+            window = self._tail + chunk
+            self.matched = _PAYWALL_BYTES_RE.search(window) is not None
+            self._tail = window[-(_PAYWALL_MAX_MARKER - 1) :]
+        return self.matched
+
+
 def is_probably_paid_substack(entry_title: str, entry_url: str, html: str | None = None) -> bool:
     title = (entry_title or "").lower()
     if any(token in title for token in ("paid", "subscriber", "members-only", "members only")):
@@ -16,33 +91,50 @@ def is_probably_paid_substack(entry_title: str, entry_url: str, html: str | None
     if "/p/" not in url_lower:
         return False
 
-    if html:
-        markers = [
-            "this post is for paid subscribers",
-            "become a paid subscriber",
-            "subscribe to continue reading",
-            "paid subscribers",
-        ]
-        lower_html = html.lower()
-        if any(m in lower_html for m in markers):
-            return True
+    # Heuristic: paywalled posts carry subscriber prompts or paywall markup.
+    return bool(html) and _PAYWALL_RE.search(html) is not None
 
-        # Heuristic: heavy paywall markup often includes these terms.
-        if re.search(r"paywall|subscriber-only|premium", lower_html):
-            return True
-    return False
 
+async def fetch_html(
+    client: httpx.AsyncClient,
+    url: str,
+    max_bytes: int = 5_000_000,
+    max_decoded_bytes: int = 10_000_000,
+    scanner: PaywallScanner | None = None,
+    on_redirect: Callable[[str], None] | None = None,
+) -> str | None:
+    """Stream an article page, stopping once either byte cap is reached.
 
-def fetch_html(url: str, timeout_seconds: int = 20) -> str | None:
-    import httpx
-
+    ``max_bytes`` bounds what is read off the wire and ``max_decoded_bytes``
+    bounds what gzip/brotli may expand into. A page that hits a cap is cut
+    short rather than dropped; the article body is almost always near the top.
+    With a ``scanner``, the download also stops as soon as it sees paywall
+    markup; check ``scanner.matched`` afterwards. ``on_redirect`` is called
+    with the final URL when the request was redirected.
+    """
     try:
-        resp = httpx.get(url, timeout=timeout_seconds, follow_redirects=True)
-        if resp.status_code >= 400:
-            return None
-        return resp.text
+        async with client.stream("GET", url) as resp:
+            if resp.status_code >= 400:
+                return None
+            if on_redirect is not None and resp.history:
+                on_redirect(str(resp.url))
+            chunks: list[bytes] = []
+            decoded = 0
+            async for chunk in resp.aiter_bytes():
+                chunks.append(chunk)
+                decoded += len(chunk)
+                if scanner is not None and scanner.feed(chunk):
+                    break
+                if decoded >= max_decoded_bytes or resp.num_bytes_downloaded >= max_bytes:
+                    break
+            body = b"".join(chunks)[:max_decoded_bytes]
+            encoding = resp.charset_encoding or "utf-8"
     except Exception:
         return None
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
 
 
 def extract_main_text(url: str, html: str | None) -> str:
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import json
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .metrics import metrics
+
 
 @dataclass
 class Feed:
@@ -12,41 +21,247 @@ class Feed:
     url: str
     paused: bool
     created_at: str
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    poll_interval_seconds: int | None = None
+    next_poll_at: float | None = None
+    consecutive_errors: int = 0
+    last_error: str | None = None
+    next_retry_at: float | None = None
+    degraded: bool = False
+    digest: bool = False
+
+    @property
+    def due_at(self) -> float:
+        """When the feed should next be polled: its schedule, or later while backing off."""
+        return max(self.next_poll_at or 0.0, self.next_retry_at or 0.0)
+
+
+@dataclass
+class OutboxMessage:
+    id: int
+    chat_id: str
+    text: str
+    attempts: int
+
+
+@dataclass
+class WebSubSubscription:
+    feed_id: int
+    hub_url: str
+    topic_url: str
+    secret: str
+    state: str
+    lease_until: float | None
+    requested_at: float
+
+    def active(self, now: float) -> bool:
+        # A renewal keeps pushing on the current lease until the hub verifies it.
+        return self.state in ("active", "renewing") and (self.lease_until or 0.0) > now
+
+
+_FEED_COLUMNS = (
+    "id, url, paused, created_at, etag, last_modified, content_hash, poll_interval_seconds, next_poll_at, "
+    "consecutive_errors, last_error, next_retry_at, degraded, digest"
+)
+
+# next_attempt_at of digest parts still being collected; never due until packed.
+_DIGEST_PENDING = float("inf")
+
+
+def _read(method):
+    @functools.wraps(method)
+    def timed(self: Database, *args, **kwargs):
+        with metrics.timer("rss_db_seconds", op=method.__name__):
+            return method(self, *args, **kwargs)
+
+    timed.db_access = "read"
+    return timed
+
+
+def _write(method):
+    @functools.wraps(method)
+    def locked(self: Database, *args, **kwargs):
+        # Timed including the wait for the write lock.
+        with metrics.timer("rss_db_seconds", op=method.__name__):
+            with self._write_lock:
+                return method(self, *args, **kwargs)
+
+    locked.db_access = "write"
+    return locked
 
 
 class Database:
-    def __init__(self, db_path: Path):
+    """SQLite store in WAL mode: one writer connection, one reader per thread.
+
+    Methods are synchronous; ``db.aio`` exposes the same methods as
+    coroutines that run on a single writer thread or a small reader pool, so
+    the event loop never waits on disk.
+    """
+
+    def __init__(self, db_path: Path, readers: int = 4):
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.db_path = db_path
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self.conn = self._connect()
         self._init_schema()
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._reader_pool = ThreadPoolExecutor(max_workers=max(1, readers), thread_name_prefix="db-reader")
+        self.aio = AsyncDatabase(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A larger statement cache keeps every query this class issues prepared.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read-only connection; WAL lets it read during writes."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def close(self) -> None:
+        self._writer_pool.shutdown(wait=True)
+        self._reader_pool.shutdown(wait=True)
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self.conn.close()
 
     def _init_schema(self) -> None:
         cur = self.conn.cursor()
+        # Incremental auto-vacuum lets prune_entries() hand pages back to the OS.
+        # Switching an existing database over needs a one-off VACUUM.
+        if cur.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            cur.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            cur.execute("VACUUM")
+        # WAL keeps readers off the writer's lock; NORMAL only syncs at checkpoints.
+        cur.execute("PRAGMA journal_mode = WAL")
+        cur.execute("PRAGMA synchronous = NORMAL")
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS feeds (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 url TEXT UNIQUE NOT NULL,
                 paused INTEGER NOT NULL DEFAULT 0,
-                created_at TEXT NOT NULL
+                created_at TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                poll_interval_seconds INTEGER,
+                next_poll_at REAL,
+                consecutive_errors INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                next_retry_at REAL,
+                degraded INTEGER NOT NULL DEFAULT 0
             )
             """
         )
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS entries (
+            CREATE TABLE IF NOT EXISTS outbox (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id TEXT NOT NULL,
+                text TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        self._ensure_columns(
+            "feeds",
+            {
+                "etag": "TEXT",
+                "last_modified": "TEXT",
+                "content_hash": "TEXT",
+                "poll_interval_seconds": "INTEGER",
+                "next_poll_at": "REAL",
+                "consecutive_errors": "INTEGER NOT NULL DEFAULT 0",
+                "last_error": "TEXT",
+                "next_retry_at": "REAL",
+                "degraded": "INTEGER NOT NULL DEFAULT 0",
+                "digest": "INTEGER NOT NULL DEFAULT 0",
+            },
+        )
+        # Messages prepared during quiet hours are held until release_at; digest
+        # parts wait under their digest_id until the cycle packs them.
+        self._ensure_columns("outbox", {"release_at": "REAL", "digest_id": "INTEGER"})
+        # Seen entries are keyed by a 64-bit hash of the UID instead of the UID
+        # text, in a WITHOUT ROWID table so the primary key is the only b-tree.
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_entries (
                 feed_id INTEGER NOT NULL,
-                entry_uid TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                UNIQUE(feed_id, entry_uid),
-                FOREIGN KEY(feed_id) REFERENCES feeds(id)
+                uid_hash INTEGER NOT NULL,
+                seen_at INTEGER NOT NULL,
+                PRIMARY KEY(feed_id, uid_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        # Canonical URLs of articles already handled by any feed, hashed like UIDs.
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                url_hash INTEGER PRIMARY KEY,
+                feed_id INTEGER NOT NULL,
+                seen_at INTEGER NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        # WebSub subscriptions: state is pending (or renewing) until the hub verifies intent.
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS websub (
+                feed_id INTEGER PRIMARY KEY,
+                hub_url TEXT NOT NULL,
+                topic_url TEXT NOT NULL,
+                secret TEXT NOT NULL,
+                state TEXT NOT NULL,
+                lease_until REAL,
+                requested_at REAL NOT NULL
             )
             """
         )
+        self._migrate_entries()
         self.conn.commit()
 
+    def _migrate_entries(self) -> None:
+        """Move rows from the old text-keyed ``entries`` table, then drop it."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entries'"
+        ).fetchone()
+        if not exists:
+            return
+        now = int(time.time())
+        rows = self.conn.execute("SELECT feed_id, entry_uid FROM entries").fetchall()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO seen_entries (feed_id, uid_hash, seen_at) VALUES (?, ?, ?)",
+            [(int(r["feed_id"]), _uid_hash(str(r["entry_uid"])), now) for r in rows],
+        )
+        self.conn.execute("DROP TABLE entries")
+
+    def _ensure_columns(self, table: str, columns: dict[str, str]) -> None:
+        """Add columns missing from databases created by older versions."""
+        existing = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+        for name, decl in columns.items():
+            if name not in existing:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+    @_write
     def add_feed(self, url: str) -> int:
         cur = self.conn.cursor()
         cur.execute(
@@ -56,28 +271,41 @@ class Database:
         self.conn.commit()
         return int(cur.lastrowid)
 
+    @_write
+    def add_feeds(self, urls: list[str]) -> list[str]:
+        """Insert ``urls`` in one transaction, skipping known ones. Returns the URLs added."""
+        added: list[str] = []
+        now = _utc_now_iso()
+        with self.conn:
+            cur = self.conn.cursor()
+            for url in urls:
+                cur.execute("INSERT OR IGNORE INTO feeds (url, paused, created_at) VALUES (?, 0, ?)", (url, now))
+                if cur.rowcount:
+                    added.append(url)
+        return added
+
+    @_read
     def list_feeds(self) -> list[Feed]:
-        cur = self.conn.cursor()
-        rows = cur.execute(
-            "SELECT id, url, paused, created_at FROM feeds ORDER BY id ASC"
-        ).fetchall()
-        return [
-            Feed(
-                id=int(r["id"]),
-                url=str(r["url"]),
-                paused=bool(r["paused"]),
-                created_at=str(r["created_at"]),
-            )
-            for r in rows
-        ]
+        cur = self._reader().cursor()
+        rows = cur.execute(f"SELECT {_FEED_COLUMNS} FROM feeds ORDER BY id ASC").fetchall()
+        return [_row_to_feed(r) for r in rows]
+
+    @_read
+    def get_feed(self, feed_id: int) -> Feed | None:
+        row = self._reader().execute(f"SELECT {_FEED_COLUMNS} FROM feeds WHERE id = ?", (feed_id,)).fetchone()
+        return None if row is None else _row_to_feed(row)
 
+    @_write
     def remove_feed(self, feed_id: int) -> bool:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM feeds WHERE id = ?", (feed_id,))
         changed = cur.rowcount > 0
+        cur.execute("DELETE FROM seen_entries WHERE feed_id = ?", (feed_id,))
+        cur.execute("DELETE FROM websub WHERE feed_id = ?", (feed_id,))
         self.conn.commit()
         return changed
 
+    @_write
     def set_paused(self, feed_id: int, paused: bool) -> bool:
         cur = self.conn.cursor()
         cur.execute("UPDATE feeds SET paused = ? WHERE id = ?", (1 if paused else 0, feed_id))
@@ -85,29 +313,95 @@ class Database:
         self.conn.commit()
         return changed
 
-    def active_feeds(self) -> list[Feed]:
+    @_write
+    def set_digest(self, feed_id: int, digest: bool) -> bool:
         cur = self.conn.cursor()
+        cur.execute("UPDATE feeds SET digest = ? WHERE id = ?", (1 if digest else 0, feed_id))
+        changed = cur.rowcount > 0
+        self.conn.commit()
+        return changed
+
+    @_read
+    def active_feeds(self) -> list[Feed]:
+        cur = self._reader().cursor()
         rows = cur.execute(
-            "SELECT id, url, paused, created_at FROM feeds WHERE paused = 0 ORDER BY id ASC"
+            f"SELECT {_FEED_COLUMNS} FROM feeds WHERE paused = 0 ORDER BY id ASC"
         ).fetchall()
-        return [
-            Feed(
-                id=int(r["id"]),
-                url=str(r["url"]),
-                paused=bool(r["paused"]),
-                created_at=str(r["created_at"]),
-            )
-            for r in rows
-        ]
+        return [_row_to_feed(r) for r in rows]
 
-    def seen_entry(self, feed_id: int, entry_uid: str) -> bool:
+    @_write
+    def update_feed_validators(
+        self,
+        feed_id: int,
+        etag: str | None,
+        last_modified: str | None,
+        content_hash: str | None,
+    ) -> None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE feeds SET etag = ?, last_modified = ?, content_hash = ? WHERE id = ?",
+            (etag, last_modified, content_hash, feed_id),
+        )
+        self.conn.commit()
+
+    @_write
+    def update_feed_schedule(self, feed_id: int, interval_seconds: int, next_poll_at: float) -> None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE feeds SET poll_interval_seconds = ?, next_poll_at = ? WHERE id = ?",
+            (interval_seconds, next_poll_at, feed_id),
+        )
+        self.conn.commit()
+
+    @_write
+    def record_feed_failure(self, feed_id: int, error: str, next_retry_at: float, degraded: bool) -> None:
+        """Count a failed poll and hold the feed back until ``next_retry_at``."""
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            UPDATE feeds
+            SET consecutive_errors = consecutive_errors + 1, last_error = ?, next_retry_at = ?,
+                next_poll_at = ?, degraded = ?
+            WHERE id = ?
+            """,
+            (error, next_retry_at, next_retry_at, 1 if degraded else 0, feed_id),
+        )
+        self.conn.commit()
+
+    @_write
+    def record_feed_success(self, feed_id: int) -> None:
+        """Clear the failure streak; ``last_error`` is kept for reference."""
         cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE feeds SET consecutive_errors = 0, next_retry_at = NULL, degraded = 0 WHERE id = ?",
+            (feed_id,),
+        )
+        self.conn.commit()
+
+    @_read
+    def seen_entry(self, feed_id: int, entry_uid: str) -> bool:
+        cur = self._reader().cursor()
         row = cur.execute(
-            "SELECT 1 FROM entries WHERE feed_id = ? AND entry_uid = ?",
-            (feed_id, entry_uid),
+            "SELECT 1 FROM seen_entries WHERE feed_id = ? AND uid_hash = ?",
+            (feed_id, _uid_hash(entry_uid)),
         ).fetchone()
         return row is not None
 
+    @_read
+    def unseen_entry_uids(self, feed_id: int, entry_uids: list[str]) -> list[str]:
+        """Return the UIDs not yet seen for this feed, in input order."""
+        hashes = {uid: _uid_hash(uid) for uid in entry_uids}
+        # One JSON array parameter keeps a single prepared statement for any
+        # batch size, instead of a new IN (?, ?, ...) text per length.
+        rows = self._reader().execute(
+            "SELECT uid_hash FROM seen_entries WHERE feed_id = ? "
+            "AND uid_hash IN (SELECT value FROM json_each(?))",
+            (feed_id, json.dumps(list(set(hashes.values())))),
+        ).fetchall()
+        seen = {int(r["uid_hash"]) for r in rows}
+        return [uid for uid, h in hashes.items() if h not in seen]
+
+    @_write
     def ensure_feed(self, url: str) -> bool:
         """Add feed if not already present. Returns True if newly added."""
         cur = self.conn.cursor()
@@ -121,14 +415,283 @@ class Database:
         self.conn.commit()
         return True
 
+    @_write
     def mark_entry_seen(self, feed_id: int, entry_uid: str) -> None:
         cur = self.conn.cursor()
         cur.execute(
-            "INSERT OR IGNORE INTO entries (feed_id, entry_uid, created_at) VALUES (?, ?, ?)",
-            (feed_id, entry_uid, _utc_now_iso()),
+            "INSERT OR IGNORE INTO seen_entries (feed_id, uid_hash, seen_at) VALUES (?, ?, ?)",
+            (feed_id, _uid_hash(entry_uid), int(time.time())),
+        )
+        self.conn.commit()
+
+    @_write
+    def mark_entries_seen(self, feed_id: int, entry_uids: list[str]) -> None:
+        if not entry_uids:
+            return
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_entries (feed_id, uid_hash, seen_at) VALUES (?, ?, ?)",
+                [(feed_id, _uid_hash(uid), now) for uid in entry_uids],
+            )
+
+    @_write
+    def prune_entries(self, feed_id: int, present_uids: list[str], older_than: float) -> int:
+        """Forget entries seen before ``older_than`` that have left the feed.
+
+        Such entries can no longer come back: the feed no longer lists them and
+        they are outside the lookback window. Returns the number removed.
+        """
+        present = {_uid_hash(uid) for uid in present_uids}
+        rows = self.conn.execute(
+            "SELECT uid_hash FROM seen_entries WHERE feed_id = ? AND seen_at < ?",
+            (feed_id, int(older_than)),
+        ).fetchall()
+        doomed = [(feed_id, int(r["uid_hash"])) for r in rows if int(r["uid_hash"]) not in present]
+        if doomed:
+            with self.conn:
+                self.conn.executemany("DELETE FROM seen_entries WHERE feed_id = ? AND uid_hash = ?", doomed)
+        return len(doomed)
+
+    @_read
+    def known_articles(self, canonical_urls: list[str]) -> set[str]:
+        """Return the canonical URLs that some feed has already handled."""
+        hashes = {url: _uid_hash(url) for url in canonical_urls}
+        rows = self._reader().execute(
+            "SELECT url_hash FROM articles WHERE url_hash IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(set(hashes.values()))),),
+        ).fetchall()
+        known = {int(r["url_hash"]) for r in rows}
+        return {url for url, h in hashes.items() if h in known}
+
+    @_write
+    def record_articles(self, feed_id: int, canonical_urls: list[str]) -> None:
+        if not canonical_urls:
+            return
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles (url_hash, feed_id, seen_at) VALUES (?, ?, ?)",
+                [(_uid_hash(url), feed_id, now) for url in canonical_urls],
+            )
+
+    @_write
+    def prune_articles(self, older_than: float) -> int:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM articles WHERE seen_at < ?", (int(older_than),))
+        self.conn.commit()
+        return cur.rowcount
+
+    @_read
+    def websub_subscription(self, feed_id: int) -> WebSubSubscription | None:
+        row = self._reader().execute(f"SELECT {_WEBSUB_COLUMNS} FROM websub WHERE feed_id = ?", (feed_id,)).fetchone()
+        return None if row is None else WebSubSubscription(**dict(row))
+
+    @_read
+    def websub_subscriptions(self) -> list[WebSubSubscription]:
+        rows = self._reader().execute(f"SELECT {_WEBSUB_COLUMNS} FROM websub ORDER BY feed_id").fetchall()
+        return [WebSubSubscription(**dict(r)) for r in rows]
+
+    @_write
+    def save_websub_request(self, feed_id: int, hub_url: str, topic_url: str, secret: str, state: str) -> None:
+        """Record a (un)subscribe request sent to a hub; the lease is kept until verified."""
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO websub (feed_id, hub_url, topic_url, secret, state, requested_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(feed_id) DO UPDATE SET
+                hub_url = excluded.hub_url, topic_url = excluded.topic_url, secret = excluded.secret,
+                state = excluded.state, requested_at = excluded.requested_at
+            """,
+            (feed_id, hub_url, topic_url, secret, state, time.time()),
         )
         self.conn.commit()
 
+    @_write
+    def activate_websub(self, feed_id: int, lease_until: float) -> None:
+        cur = self.conn.cursor()
+        cur.execute("UPDATE websub SET state = 'active', lease_until = ? WHERE feed_id = ?", (lease_until, feed_id))
+        self.conn.commit()
+
+    @_write
+    def delete_websub(self, feed_id: int) -> None:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM websub WHERE feed_id = ?", (feed_id,))
+        self.conn.commit()
+
+    @_read
+    def entry_count(self) -> int:
+        return int(self._reader().execute("SELECT COUNT(*) FROM seen_entries").fetchone()[0])
+
+    @_write
+    def incremental_vacuum(self, pages: int = 1000) -> None:
+        self.conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        self.conn.commit()
+
+    @_write
+    def enqueue_message(
+        self, chat_id: str, text: str, release_at: float | None = None, spacing_seconds: float = 0.0
+    ) -> int:
+        """Queue a message, held until ``release_at`` when given.
+
+        Held messages are released ``spacing_seconds`` apart, and a message
+        queued while others are still held goes behind them, so the outbox
+        keeps its order.
+        """
+        cur = self.conn.cursor()
+        message_id = self._insert_message(cur, chat_id, text, release_at, spacing_seconds)
+        self.conn.commit()
+        return message_id
+
+    def _insert_message(
+        self, cur: sqlite3.Cursor, chat_id: str, text: str, release_at: float | None, spacing_seconds: float
+    ) -> int:
+        tail = cur.execute("SELECT MAX(release_at) FROM outbox").fetchone()[0]
+        if tail is not None and (release_at is not None or tail > time.time()):
+            release_at = max(release_at or 0.0, tail + spacing_seconds)
+        cur.execute(
+            "INSERT INTO outbox (chat_id, text, next_attempt_at, release_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            (chat_id, text, release_at or 0.0, release_at, _utc_now_iso()),
+        )
+        return int(cur.lastrowid)
+
+    @_write
+    def enqueue_digest_part(self, digest_id: int, chat_id: str, text: str) -> None:
+        """Store one entry's message until ``replace_digest`` packs the cycle's parts."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "INSERT INTO outbox (chat_id, text, next_attempt_at, digest_id, created_at) VALUES (?, ?, ?, ?, ?)",
+            (chat_id, text, _DIGEST_PENDING, digest_id, _utc_now_iso()),
+        )
+        self.conn.commit()
+
+    @_read
+    def pending_digest_ids(self) -> list[int]:
+        rows = self._reader().execute("SELECT DISTINCT digest_id FROM outbox WHERE digest_id IS NOT NULL").fetchall()
+        return [int(r[0]) for r in rows]
+
+    @_read
+    def digest_parts(self, digest_id: int) -> list[tuple[str, str]]:
+        """``(chat_id, text)`` of a digest's parts in the order they were queued."""
+        rows = self._reader().execute(
+            "SELECT chat_id, text FROM outbox WHERE digest_id = ? ORDER BY id ASC", (digest_id,)
+        ).fetchall()
+        return [(str(r["chat_id"]), str(r["text"])) for r in rows]
+
+    @_write
+    def replace_digest(
+        self,
+        digest_id: int,
+        chat_id: str,
+        texts: list[str],
+        release_at: float | None = None,
+        spacing_seconds: float = 0.0,
+    ) -> None:
+        """Swap a digest's parts for the packed messages in one transaction."""
+        with self.conn:
+            cur = self.conn.cursor()
+            cur.execute("DELETE FROM outbox WHERE digest_id = ?", (digest_id,))
+            for text in texts:
+                self._insert_message(cur, chat_id, text, release_at, spacing_seconds)
+
+    @_read
+    def due_messages(self, now: float, limit: int = 50) -> list[OutboxMessage]:
+        """Messages ready to send, oldest first."""
+        cur = self._reader().cursor()
+        rows = cur.execute(
+            "SELECT id, chat_id, text, attempts FROM outbox WHERE next_attempt_at <= ? ORDER BY id ASC LIMIT ?",
+            (now, limit),
+        ).fetchall()
+        return [
+            OutboxMessage(id=int(r["id"]), chat_id=str(r["chat_id"]), text=str(r["text"]), attempts=int(r["attempts"]))
+            for r in rows
+        ]
+
+    @_read
+    def next_message_due_at(self) -> float | None:
+        row = self._reader().execute("SELECT MIN(next_attempt_at) AS due FROM outbox").fetchone()
+        return None if row["due"] is None else float(row["due"])
+
+    @_read
+    def outbox_size(self) -> int:
+        return int(self._reader().execute("SELECT COUNT(*) FROM outbox").fetchone()[0])
+
+    @_read
+    def held_message_count(self, now: float) -> int:
+        row = self._reader().execute("SELECT COUNT(*) FROM outbox WHERE release_at > ?", (now,)).fetchone()
+        return int(row[0])
+
+    @_write
+    def delete_message(self, message_id: int) -> None:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+        self.conn.commit()
+
+    @_write
+    def reschedule_message(self, message_id: int, next_attempt_at: float | None, error: str) -> None:
+        """Record a failed attempt; ``next_attempt_at=None`` keeps the message's place in line."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = COALESCE(?, next_attempt_at), "
+            "last_error = ? WHERE id = ?",
+            (next_attempt_at, error, message_id),
+        )
+        self.conn.commit()
+
+
+class AsyncDatabase:
+    """Coroutine versions of the ``Database`` methods marked read or write.
+
+    Writes are serialised on one thread; reads run on a pool of threads,
+    each with its own connection.
+    """
+
+    def __init__(self, db: Database):
+        self._db = db
+
+    def __getattr__(self, name: str):
+        method = getattr(self._db, name)
+        access = getattr(method, "db_access", None)
+        if access is None:
+            raise AttributeError(name)
+        executor = self._db._writer_pool if access == "write" else self._db._reader_pool
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, functools.partial(method, *args, **kwargs))
+
+        call.__name__ = name
+        return call
+
+
+_WEBSUB_COLUMNS = "feed_id, hub_url, topic_url, secret, state, lease_until, requested_at"
+
+
+def _row_to_feed(r: sqlite3.Row) -> Feed:
+    return Feed(
+        id=int(r["id"]),
+        url=str(r["url"]),
+        paused=bool(r["paused"]),
+        created_at=str(r["created_at"]),
+        etag=r["etag"],
+        last_modified=r["last_modified"],
+        content_hash=r["content_hash"],
+        poll_interval_seconds=r["poll_interval_seconds"],
+        next_poll_at=r["next_poll_at"],
+        consecutive_errors=int(r["consecutive_errors"] or 0),
+        last_error=r["last_error"],
+        next_retry_at=r["next_retry_at"],
+        degraded=bool(r["degraded"]),
+        digest=bool(r["digest"]),
+    )
+
+
+def _uid_hash(entry_uid: str) -> int:
+    """Fixed-width key for an entry UID: the first 8 bytes of its SHA-256."""
+    digest = hashlib.sha256(entry_uid.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from .db import Database, OutboxMessage
+from .metrics import metrics
+from .rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+_IDLE_SECONDS = 60.0
+
+
+class DeliveryLoop:
+    """Drains the persistent outbox to Telegram at the channel's allowed rate.
+
+    Messages go out oldest-first through a token bucket. RetryAfter pauses the
+    bucket for the requested time and network errors pause it for a growing
+    backoff; in both cases the message stays at the head of the outbox so
+    order is kept and nothing is lost. Messages Telegram rejects outright are retried a few times, then
+    dropped.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        bot: Bot,
+        messages_per_minute: int = 20,
+        burst: int = 3,
+        max_attempts: int = 5,
+    ):
+        self.db = db
+        self.bot = bot
+        self.max_attempts = max_attempts
+        self._bucket = TokenBucket(rate=messages_per_minute / 60.0, capacity=float(max(1, burst)))
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    async def drain(self) -> int:
+        """Send every message that is due now. Returns how many were sent."""
+        sent = 0
+        async with self._lock:
+            while True:
+                batch = await self.db.aio.due_messages(time.time())
+                if not batch:
+                    return sent
+                for message in batch:
+                    await self._bucket.acquire()
+                    outcome = await self._send(message)
+                    if outcome is None:
+                        # Channel-wide problem: stop here and keep the order.
+                        return sent
+                    if outcome:
+                        sent += 1
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Outbox delivery failed")
+            due = await self.db.aio.next_message_due_at()
+            timeout = _IDLE_SECONDS if due is None else min(_IDLE_SECONDS, max(0.5, due - time.time()))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send(self, message: OutboxMessage) -> bool | None:
+        """Returns True when sent, False when skipped, None to stop draining."""
+        try:
+            with metrics.timer("rss_stage_seconds", stage="telegram_send"):
+                await self.bot.send_message(chat_id=message.chat_id, text=message.text, parse_mode="HTML")
+        except RetryAfter as e:
+            metrics.inc("rss_telegram_send_total", result="retry_after")
+            delay = _seconds(e.retry_after)
+            logger.warning("Telegram asked to retry after %.0fs", delay)
+            self._bucket.pause(delay)
+            return None
+        except (BadRequest, Forbidden) as e:
+            metrics.inc("rss_telegram_send_total", result="rejected")
+            if message.attempts + 1 >= self.max_attempts:
+                logger.error("Dropping outbox message %d after %d attempts: %s", message.id, message.attempts + 1, e)
+                await self.db.aio.delete_message(message.id)
+            else:
+                await self._reschedule(message, e)
+            return False
+        except NetworkError as e:
+            metrics.inc("rss_telegram_send_total", result="network_error")
+            delay = _backoff(message.attempts)
+            logger.warning("Telegram send failed, retrying in %.0fs: %s", delay, e)
+            # Pause instead of pushing the head back, or later rows would overtake it.
+            self._bucket.pause(delay)
+            await self.db.aio.reschedule_message(message.id, None, str(e))
+            return None
+        metrics.inc("rss_telegram_send_total", result="sent")
+        await self.db.aio.delete_message(message.id)
+        return True
+
+    async def _reschedule(self, message: OutboxMessage, error: Exception) -> None:
+        await self.db.aio.reschedule_message(message.id, time.time() + _backoff(message.attempts), str(error))
+
+
+def _backoff(attempts: int) -> float:
+    return min(600.0, 5.0 * 2**attempts)
+
+
+def _seconds(value: object) -> float:
+    # python-telegram-bot 21 reports an int; newer releases a timedelta.
+    total_seconds = getattr(value, "total_seconds", None)
+    return float(total_seconds() if callable(total_seconds) else value)
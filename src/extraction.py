@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from .content import extract_main_text
+
+logger = logging.getLogger(__name__)
+
+ExtractFn = Callable[[str, "str | None"], str]
+
+
+class ExtractionPool:
+    """Runs ``extract_main_text`` off the event loop.
+
+    With ``processes > 0`` extraction runs in a process pool so it scales
+    across cores instead of contending for the GIL. Workers are recycled after
+    ``max_tasks_per_child`` documents to contain lxml leaks, and a document that
+    exceeds ``timeout_seconds`` has its pool torn down and replaced. With
+    ``processes == 0`` it falls back to a thread, as before.
+    """
+
+    def __init__(self, processes: int = 0, timeout_seconds: float = 30.0, max_tasks_per_child: int = 50):
+        self.processes = processes
+        self.timeout_seconds = timeout_seconds
+        self.max_tasks_per_child = max_tasks_per_child
+        self._pool: ProcessPoolExecutor | None = self._new_pool() if processes > 0 else None
+
+    async def extract(self, url: str, html: str | None, fn: ExtractFn = extract_main_text) -> str:
+        if not html:
+            return ""
+        if self._pool is None:
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(fn, url, html), self.timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning("Extraction timed out after %.0fs: %s", self.timeout_seconds, url)
+                return ""
+
+        # A pool can break under us when another document's timeout restarts it;
+        # retry once on the fresh pool before giving up.
+        for attempt in range(2):
+            pool = self._pool
+            loop = asyncio.get_running_loop()
+            try:
+                future = loop.run_in_executor(pool, fn, url, html)
+                return await asyncio.wait_for(future, self.timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning("Extraction timed out after %.0fs: %s", self.timeout_seconds, url)
+                self._restart(pool)
+                return ""
+            except BrokenProcessPool:
+                logger.warning("Extraction pool broke (attempt %d): %s", attempt + 1, url)
+                self._restart(pool)
+        return ""
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.processes, max_tasks_per_child=self.max_tasks_per_child)
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        if self._pool is not broken:
+            return
+        self._pool = self._new_pool()
+        # ProcessPoolExecutor has no public way to stop a running task, so a hung
+        # lxml call is only reclaimed by killing its process.
+        for proc in list((getattr(broken, "_processes", None) or {}).values()):
+            proc.terminate()
+        broken.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+
+_ROOTS = {"rss", "feed", "RDF"}
+_ENTRIES = {"item", "entry"}
+_CHANNELS = {"channel", "feed"}
+# Namespaces whose title/link/id elements are the entry's own; itunes:title,
+# media:title and the like must not override them.
+_CORE_NAMESPACES = {
+    "",
+    "http://www.w3.org/2005/Atom",
+    "http://purl.org/atom/ns#",
+    "http://purl.org/rss/1.0/",
+    "http://my.netscape.com/rdf/simple/0.9/",
+}
+_XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+
+
+class FeedStreamError(Exception):
+    """The document is malformed or not RSS/Atom; parse it with feedparser instead."""
+
+
+class EntryStream:
+    """Reads RSS/Atom entries lazily from a feed document.
+
+    The document is fed to a pull parser in chunks and each entry is turned
+    into a small feedparser-style dict (``id``, ``title``, ``link``,
+    ``published_parsed``, ``updated_parsed``) and then dropped from the tree,
+    so memory holds one entry at a time and parsing stops as soon as the
+    caller stops reading. ``title`` holds the feed's own title once parsed.
+    Relative links resolve against ``xml:base`` and then ``base_url``, as
+    feedparser resolves them against the response's location.
+    """
+
+    def __init__(self, content: bytes, base_url: str = "", chunk_size: int = 64 * 1024):
+        self._content = memoryview(content)
+        self._chunk_size = chunk_size
+        self._offset = 0
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: list[ET.Element] = []
+        # xml:base in effect for each element on the stack, outermost first.
+        self._bases: list[str] = [base_url]
+        self._ready: list[dict] = []
+        self.title = ""
+        self.done = False
+
+    def read(self, n: int) -> list[dict]:
+        """Return up to ``n`` more entries; an empty list at the end of the feed."""
+        try:
+            while len(self._ready) < n and not self.done:
+                chunk = self._content[self._offset : self._offset + self._chunk_size]
+                self._offset += len(chunk)
+                if chunk:
+                    self._parser.feed(bytes(chunk))
+                else:
+                    self._parser.close()
+                    self.done = True
+                self._collect()
+        except ET.ParseError as e:
+            raise FeedStreamError(str(e)) from e
+        entries, self._ready = self._ready[:n], self._ready[n:]
+        return entries
+
+    def _collect(self) -> None:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if not self._stack and _local(elem.tag) not in _ROOTS:
+                    raise FeedStreamError(f"not an RSS/Atom document: <{_local(elem.tag)}>")
+                self._stack.append(elem)
+                self._bases.append(_base(self._bases[-1], elem))
+                continue
+            self._stack.pop()
+            base = self._bases.pop()
+            name = _local(elem.tag)
+            if name in _ENTRIES and self._stack:
+                self._ready.append(_entry_dict(elem, base))
+                self._stack[-1].remove(elem)
+            elif _core(elem.tag) == "title" and self._stack and _local(self._stack[-1].tag) in _CHANNELS:
+                self.title = "".join(elem.itertext()).strip()
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _core(tag: str) -> str | None:
+    """Local name of an RSS/Atom element, None for extension namespaces."""
+    namespace, _, name = tag[1:].rpartition("}") if tag.startswith("{") else ("", "", tag)
+    return name if namespace in _CORE_NAMESPACES else None
+
+
+def _base(parent: str, elem: ET.Element) -> str:
+    base = elem.get(_XML_BASE)
+    return urljoin(parent, base.strip()) if base else parent
+
+
+def _entry_dict(elem: ET.Element, base: str = "") -> dict:
+    entry: dict = {}
+    permalink = None
+    for child in elem:
+        name = _local(child.tag)
+        core = _core(child.tag)
+        text = "".join(child.itertext()).strip()
+        if core == "title":
+            entry["title"] = text
+        elif core == "link":
+            href = child.get("href")
+            if href is None:
+                entry.setdefault("link", urljoin(_base(base, child), text) if text else text)
+            elif child.get("rel", "alternate") == "alternate":
+                entry.setdefault("link", urljoin(_base(base, child), href.strip()))
+        elif core in ("guid", "id"):
+            entry["id"] = text
+            # Like feedparser, an RSS guid doubles as the link unless isPermaLink="false".
+            if core == "guid" and child.get("isPermaLink", "true").lower() == "true":
+                permalink = text
+            else:
+                permalink = None
+        elif name in ("pubDate", "published", "issued", "date"):
+            entry.setdefault("published_parsed", _parse_date(text))
+        elif name in ("updated", "modified"):
+            entry["updated_parsed"] = _parse_date(text)
+    if not entry.get("link") and permalink:
+        entry["link"] = permalink
+    return {k: v for k, v in entry.items() if v}
+
+
+def _parse_date(value: str) -> time.struct_time | None:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).timetuple()
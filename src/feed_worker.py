@@ -1,21 +1,51 @@
 from __future__ import annotations
 
 import asyncio
+import calendar
 import html
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable
+from urllib.parse import urljoin
 
 import feedparser
+import httpx
 from telegram import Bot
 
-from .content import extract_main_text, fetch_html, is_probably_paid_substack, is_substack_url
+from .cache import ContentCache
+from .content import (
+    PaywallScanner,
+    canonical_url,
+    extract_main_text,
+    fetch_html,
+    is_probably_paid_substack,
+    is_substack_url,
+)
 from .db import Database, Feed
+from .delivery import DeliveryLoop
+from .extraction import ExtractionPool
+from .feed_stream import EntryStream, FeedStreamError
+from .fetcher import FeedFetchResult, HostLimiter, build_http_client, fetch_feed
+from .metrics import metrics
+from .scheduler import estimate_interval, next_poll_time
 from .summarizer import Summarizer
-from .time_utils import is_in_quiet_hours
+from .time_utils import is_in_quiet_hours, quiet_hours_end
+from .websub import WebSubManager, discover_hub
 
 logger = logging.getLogger(__name__)
 
+# Entries parsed per step of a streamed feed read, between seen-UID lookups.
+_STREAM_BATCH = 20
+# Longest message _send queues; Telegram's hard limit is 4096 characters.
+_MAX_MESSAGE_CHARS = 3900
+_DIGEST_SEPARATOR = "\n\n"
+# A validation fetch stands in for the feed's first poll if that comes this soon.
+_PREFETCH_TTL_SECONDS = 600
+# Bodies held for first polls, in total; an import of thousands of feeds keeps only this much.
+_PREFETCH_MAX_BYTES = 16 * 1024 * 1024
+
 
 @dataclass
 class WorkerConfig:
@@ -23,84 +53,818 @@ class WorkerConfig:
     quiet_start_hour: int
     quiet_end_hour: int
     lookback_hours: int = 48
+    feed_concurrency: int = 8
+    feed_per_host_concurrency: int = 2
+    http_timeout_seconds: float = 30.0
+    http_max_connections: int = 32
+    http2: bool = False
+    article_max_bytes: int = 5_000_000
+    extract_processes: int = 0
+    extract_timeout_seconds: float = 30.0
+    extract_max_tasks_per_child: int = 50
+    pipeline_queue_size: int = 32
+    article_workers: int = 8
+    extract_workers: int = 2
+    summarize_workers: int = 4
+    telegram_messages_per_minute: int = 20
+    telegram_burst: int = 3
+    poll_interval_minutes: int = 60
+    poll_min_interval_minutes: int = 15
+    poll_max_interval_minutes: int = 24 * 60
+    poll_jitter: float = 0.1
+    stream_parse: bool = True
+    stream_stop_after_seen: int = 20
+    feed_retry_base_minutes: int = 5
+    feed_retry_max_minutes: int = 24 * 60
+    feed_degraded_after_errors: int = 8
+    feed_degraded_timeout_seconds: float = 10.0
+    article_index_days: int = 30
+    quiet_prefetch: bool = False
+    quiet_release_spacing_seconds: float = 20.0
+    digest: bool = False
+    import_concurrency: int = 32
+    websub_callback_url: str = ""
+    websub_poll_interval_minutes: int = 12 * 60
+    websub_lease_seconds: int = 7 * 86400
 
 
 class FeedWorker:
-    def __init__(self, db: Database, bot: Bot, summarizer: Summarizer, config: WorkerConfig):
+    def __init__(
+        self,
+        db: Database,
+        bot: Bot,
+        summarizer: Summarizer,
+        config: WorkerConfig,
+        http_client: httpx.AsyncClient | None = None,
+        cache: ContentCache | None = None,
+    ):
         self.db = db
         self.bot = bot
         self.summarizer = summarizer
         self.config = config
+        self.cache = cache
+        self.http = http_client or build_http_client(
+            timeout_seconds=config.http_timeout_seconds,
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_connections // 2,
+            http2=config.http2,
+        )
+        self._limiter = HostLimiter(config.feed_concurrency, config.feed_per_host_concurrency)
+        self._probe_limiter = HostLimiter(config.import_concurrency, config.feed_per_host_concurrency)
+        # Feed responses fetched while validating new feeds, by URL, for their first poll.
+        self._prefetched: dict[str, tuple[float, FeedFetchResult]] = {}
+        self.extractor = ExtractionPool(
+            processes=config.extract_processes,
+            timeout_seconds=config.extract_timeout_seconds,
+            max_tasks_per_child=config.extract_max_tasks_per_child,
+        )
+        # Canonical URLs claimed by jobs still in flight, so two feeds carrying
+        # the same article in one cycle do not both process it.
+        self._claimed: set[str] = set()
+        self.delivery = DeliveryLoop(
+            db,
+            bot,
+            messages_per_minute=config.telegram_messages_per_minute,
+            burst=config.telegram_burst,
+        )
+        self.websub: WebSubManager | None = None
+        if config.websub_callback_url:
+            self.websub = WebSubManager(
+                db,
+                self.http,
+                config.websub_callback_url,
+                on_push=self.ingest_push,
+                lease_seconds=config.websub_lease_seconds,
+            )
+
+    def start(self) -> None:
+        self.delivery.start()
+
+    async def aclose(self) -> None:
+        if self.websub is not None:
+            await self.websub.aclose()
+        await self.delivery.stop()
+        await self.http.aclose()
+        await self.summarizer.aclose()
+        self.extractor.close()
 
-    async def run_once(self) -> None:
-        if is_in_quiet_hours(self.config.quiet_start_hour, self.config.quiet_end_hour):
+    def in_quiet_hours(self) -> bool:
+        return is_in_quiet_hours(self.config.quiet_start_hour, self.config.quiet_end_hour)
+
+    def polling_paused(self) -> bool:
+        """Quiet hours stop polling unless posts are prepared ahead for the morning."""
+        return self.in_quiet_hours() and not self.config.quiet_prefetch
+
+    async def run_once(self, feeds: list[Feed] | None = None) -> None:
+        if self.polling_paused():
             logger.info("Quiet hours: skip feed polling.")
             return
 
-        feeds = self.db.active_feeds()
-        for feed in feeds:
-            await self._process_feed(feed)
+        if feeds is None:
+            # Feeds backing off after errors keep their slots free for healthy ones.
+            now = time.time()
+            feeds = [f for f in await self.db.aio.active_feeds() if (f.next_retry_at or 0.0) <= now]
+        # Parts left over by an interrupted cycle go out with this one's.
+        for stale in await self.db.aio.pending_digest_ids():
+            await self._flush_digest(stale)
+        digest_id = time.time_ns()
+        with metrics.timer("rss_stage_seconds", stage="cycle"):
+            try:
+                await self._run_pipeline(feeds, digest_id)
+            finally:
+                await self._flush_digest(digest_id)
+        await self.db.aio.prune_articles(time.time() - self.config.article_index_days * 86400)
+        # Return pages freed by pruned entries; a no-op when nothing was freed.
+        await self.db.aio.incremental_vacuum()
+        if self.websub is not None:
+            await self.websub.renew_due()
+
+    async def _run_pipeline(self, feeds: list[Feed], digest_id: int | None = None) -> None:
+        """Run feeds through bounded fetch → extract → summarize → deliver stages.
+
+        Each stage has its own queue and worker count, so a slow LLM call keeps
+        the network and CPU stages busy instead of idle. Delivery restores the
+        chronological order of each feed's entries.
+        """
+        cfg = self.config
+        article_q: asyncio.Queue[EntryJob] = asyncio.Queue(cfg.pipeline_queue_size)
+        extract_q: asyncio.Queue[EntryJob] = asyncio.Queue(cfg.pipeline_queue_size)
+        summarize_q: asyncio.Queue[EntryJob] = asyncio.Queue(cfg.pipeline_queue_size)
+        deliver_q: asyncio.Queue[EntryJob] = asyncio.Queue(cfg.pipeline_queue_size)
+        queues = {"article": article_q, "extract": extract_q, "summarize": summarize_q, "deliver": deliver_q}
+        for name, q in queues.items():
+            metrics.set_gauge("rss_queue_depth", q.qsize, queue=name)
+        stages = [
+            (article_q, self._stage_fetch, extract_q, cfg.article_workers),
+            (extract_q, self._stage_extract, summarize_q, cfg.extract_workers),
+            (summarize_q, self._stage_summarize, deliver_q, cfg.summarize_workers),
+        ]
+        tasks = [
+            asyncio.create_task(self._stage_worker(inbox, stage, outbox))
+            for inbox, stage, outbox, workers in stages
+            for _ in range(max(1, workers))
+        ]
+        tasks.append(asyncio.create_task(self._deliver_worker(deliver_q)))
+        try:
+            await asyncio.gather(*(self._feed_stage(feed, article_q, digest_id) for feed in feeds))
+            for q in (article_q, extract_q, summarize_q, deliver_q):
+                await q.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for name in queues:
+                metrics.remove_gauge("rss_queue_depth", queue=name)
+
+    async def _feed_stage(self, feed: Feed, outbox: asyncio.Queue[EntryJob], digest_id: int | None) -> None:
+        async with self._limiter.slot(feed.url):
+            try:
+                batch = await self._collect_entries(feed)
+            except Exception:
+                logger.exception("Feed processing failed [%s]", feed.url)
+                return
+        if batch is None:
+            return
+        self._assign_digest(batch, digest_id)
+        for job in batch.jobs:
+            await outbox.put(job)
+
+    async def _stage_worker(
+        self,
+        inbox: asyncio.Queue[EntryJob],
+        stage: Callable[[EntryJob], Awaitable[None]],
+        outbox: asyncio.Queue[EntryJob],
+    ) -> None:
+        while True:
+            job = await inbox.get()
+            try:
+                if not job.finished:
+                    try:
+                        await stage(job)
+                    except Exception:
+                        logger.exception("Entry stage failed: %s", job.link)
+                        job.finish(handled=False)
+                # Finished jobs still flow downstream so delivery can keep order.
+                await outbox.put(job)
+            finally:
+                inbox.task_done()
+
+    async def _deliver_worker(self, inbox: asyncio.Queue[EntryJob]) -> None:
+        while True:
+            job = await inbox.get()
+            try:
+                batch = job.batch
+                if batch is None:
+                    await self._complete_job_safely(job)
+                    continue
+                batch.pending[job.seq] = job
+                while batch.next_seq in batch.pending:
+                    await self._complete_job_safely(batch.pending.pop(batch.next_seq))
+                    batch.next_seq += 1
+            finally:
+                inbox.task_done()
+
+    async def _complete_job_safely(self, job: EntryJob) -> None:
+        # This is the only deliver task; letting it die would hang the pipeline's join.
+        try:
+            await self._complete_job(job)
+        except Exception:
+            logger.exception("Completing entry failed: %s", job.link)
+            if job.batch is not None:
+                # Keep the old validators so the next poll sees this entry again.
+                job.batch.complete = False
 
     async def _process_feed(self, feed: Feed) -> None:
-        parsed = feedparser.parse(feed.url)
-        if parsed.bozo:
-            logger.warning("Feed fetch failed [%s]: %s", feed.url, parsed.get("bozo_exception", "unknown error"))
-        entries = parsed.entries or []
-        logger.info("Feed [%s]: %d entries fetched", feed.url, len(entries))
+        await self._process_batch(await self._collect_entries(feed))
+
+    async def _process_batch(self, batch: _FeedBatch | None) -> None:
+        if batch is None:
+            return
+        digest_id = time.time_ns()
+        self._assign_digest(batch, digest_id)
+        try:
+            for job in batch.jobs:
+                await self._run_stages(job)
+                await self._complete_job(job)
+        finally:
+            await self._flush_digest(digest_id)
+
+    def _assign_digest(self, batch: _FeedBatch, digest_id: int | None) -> None:
+        if digest_id is not None and (self.config.digest or batch.feed.digest):
+            batch.digest_id = digest_id
+
+    async def _flush_digest(self, digest_id: int) -> None:
+        """Pack a cycle's digest parts into as few messages as fit and queue them."""
+        parts = await self.db.aio.digest_parts(digest_id)
+        if not parts:
+            return
+        messages = pack_messages([text for _, text in parts], _MAX_MESSAGE_CHARS, _DIGEST_SEPARATOR)
+        logger.info("Digest: %d entries in %d messages", len(parts), len(messages))
+        cfg = self.config
+        await self.db.aio.replace_digest(
+            digest_id, parts[0][0], messages, self._release_at(), cfg.quiet_release_spacing_seconds
+        )
+        self.delivery.notify()
+
+    async def ingest_push(self, feed_id: int, body: bytes, headers: dict[str, str]) -> None:
+        """Process a feed document pushed by a WebSub hub, as if just polled."""
+        feed = await self.db.aio.get_feed(feed_id)
+        if feed is None or feed.paused:
+            return
+        if self.polling_paused():
+            # Leave the entries unseen and let the first poll after quiet hours take them.
+            interval = feed.poll_interval_seconds or self.config.poll_interval_minutes * 60
+            await self.db.aio.update_feed_schedule(feed.id, interval, time.time())
+            return
+        logger.info("Feed [%s]: WebSub push received", feed.url)
+        result = FeedFetchResult(url=feed.url, status_code=200, content=body, headers=headers)
+        try:
+            batch = await self._parse_result(feed, result, [], pushed=True)
+        except _FeedFailure as e:
+            logger.warning("Ignoring WebSub push for [%s]: %s", feed.url, e)
+            return
+        await self._process_batch(batch)
+
+    async def _collect_entries(self, feed: Feed) -> _FeedBatch | None:
+        published: list[float] = []
+        try:
+            batch = await self._read_feed(feed, published)
+        except Exception as e:
+            await self._record_failure(feed, e)
+            return None
+        if feed.consecutive_errors:
+            await self.db.aio.record_feed_success(feed.id)
+            if feed.degraded:
+                logger.info("Feed [%s] recovered after %d failures", feed.url, feed.consecutive_errors)
+        await self._reschedule(feed, published)
+        return batch
+
+    async def _record_failure(self, feed: Feed, error: Exception) -> None:
+        """Back off exponentially; after enough failures in a row mark the feed degraded.
+
+        A degraded feed is only probed once per ``feed_retry_max_minutes`` until
+        a poll succeeds again.
+        """
+        cfg = self.config
+        errors = feed.consecutive_errors + 1
+        degraded = errors >= cfg.feed_degraded_after_errors
+        max_delay = cfg.feed_retry_max_minutes * 60
+        delay = max_delay if degraded else min(max_delay, cfg.feed_retry_base_minutes * 60 * 2 ** (errors - 1))
+        if isinstance(error, _FeedFailure) and error.retry_after:
+            delay = max(delay, error.retry_after)
+        next_retry_at = next_poll_time(time.time(), delay, cfg.poll_jitter)
+        if isinstance(error, (_FeedFailure, httpx.HTTPError)):
+            logger.warning(
+                "Feed fetch failed [%s] (%d in a row, retry in %.0fm): %s", feed.url, errors, delay / 60, error
+            )
+        else:
+            logger.error("Feed processing failed [%s]", feed.url, exc_info=error)
+        if degraded and not feed.degraded:
+            logger.warning("Feed [%s] marked degraded after %d consecutive failures", feed.url, errors)
+        metrics.inc("rss_feed_failures_total")
+        message = str(error) or type(error).__name__
+        await self.db.aio.record_feed_failure(feed.id, message[:500], next_retry_at, degraded)
+
+    async def _reschedule(self, feed: Feed, published: list[float]) -> None:
+        """Store the feed's next poll time, learning its cadence from ``published``."""
+        cfg = self.config
+        now = time.time()
+        default = cfg.poll_interval_minutes * 60
+        if published:
+            interval = estimate_interval(
+                published,
+                now,
+                cfg.poll_min_interval_minutes * 60,
+                cfg.poll_max_interval_minutes * 60,
+                default,
+            )
+        else:
+            interval = feed.poll_interval_seconds or default
+        if self.websub is not None and await self.websub.is_active(feed.id):
+            # Pushes deliver new entries; polling only catches what the hub missed.
+            interval = max(interval, cfg.websub_poll_interval_minutes * 60)
+        await self.db.aio.update_feed_schedule(feed.id, int(interval), next_poll_time(now, interval, cfg.poll_jitter))
+
+    async def _read_feed(self, feed: Feed, published: list[float]) -> _FeedBatch | None:
+        result = self._take_prefetched(feed.url)
+        if result is None:
+            # A probe of a degraded feed must not hold a slot for the full timeout.
+            timeout = self.config.feed_degraded_timeout_seconds if feed.degraded else None
+            try:
+                with metrics.timer("rss_stage_seconds", stage="feed_fetch"):
+                    result = await fetch_feed(
+                        self.http, feed.url, etag=feed.etag, last_modified=feed.last_modified, timeout=timeout
+                    )
+            except httpx.HTTPError:
+                metrics.inc("rss_feed_fetch_total", result="error")
+                raise
+        if result.not_modified:
+            logger.info("Feed [%s]: not modified", feed.url)
+            metrics.inc("rss_feed_fetch_total", result="not_modified")
+            return None
+        if result.status_code >= 400:
+            metrics.inc("rss_feed_fetch_total", result="error")
+            raise _FeedFailure(f"HTTP {result.status_code}", _retry_after(result.headers.get("retry-after")))
+        if self.websub is not None:
+            await self.websub.discover(feed.id, feed.url, discover_hub(feed.url, result.headers, result.content))
+        if feed.content_hash and result.content_hash == feed.content_hash:
+            logger.info("Feed [%s]: body unchanged", feed.url)
+            metrics.inc("rss_feed_fetch_total", result="unchanged")
+            return None
+        metrics.inc("rss_feed_fetch_total", result="ok")
+        return await self._parse_result(feed, result, published)
+
+    async def _parse_result(
+        self, feed: Feed, result: FeedFetchResult, published: list[float], pushed: bool = False
+    ) -> _FeedBatch:
+        """Turn a fetched or pushed feed document into a batch of unseen entries.
+
+        A pushed document usually carries only the new entries, so it neither
+        prunes the seen index nor stores validators.
+        """
+        with metrics.timer("rss_stage_seconds", stage="feed_parse"):
+            streamed = await self._stream_entries(feed, result) if self.config.stream_parse else None
+            if streamed is None:
+                parsed = await asyncio.to_thread(feedparser.parse, result.content, response_headers=result.headers)
+                if parsed.bozo:
+                    problem = parsed.get("bozo_exception", "unknown error")
+                    if not parsed.entries:
+                        raise _FeedFailure(f"unparseable feed: {problem}")
+                    logger.warning("Feed [%s] parsed with errors: %s", feed.url, problem)
+                entries, unseen, exhausted = parsed.entries or [], None, True
+                # Links still relative after xml:base resolve against the feed URL, as when streamed.
+                for entry in entries:
+                    if entry.get("link"):
+                        entry["link"] = urljoin(_feed_base(feed, result), entry["link"])
+            else:
+                entries, unseen, exhausted = streamed
+        logger.info(
+            "Feed [%s]: %d entries fetched%s", feed.url, len(entries), "" if exhausted else " (stopped at seen entries)"
+        )
+        for entry in entries:
+            stamp = entry.get("published_parsed") or entry.get("updated_parsed")
+            if stamp:
+                published.append(float(calendar.timegm(stamp)))
         # Feeds are newest-first. Collect unseen entries, take up to 10 newest,
         # then process oldest-first so notifications arrive in chronological order.
         cutoff = datetime.now(timezone.utc) - timedelta(hours=self.config.lookback_hours)
-        candidates: list[tuple[str, dict]] = []
+        by_uid: dict[str, dict] = {}
         for entry in entries:
-            uid = str(entry.get("id") or entry.get("link") or entry.get("title") or "").strip()
-            if not uid:
-                continue
-            if self.db.seen_entry(feed.id, uid):
-                continue
+            uid = _entry_uid(entry)
+            if uid and uid not in by_uid:
+                by_uid[uid] = entry
+        if unseen is None:
+            unseen_uids = await self.db.aio.unseen_entry_uids(feed.id, list(by_uid))
+        else:
+            unseen_uids = [uid for uid in by_uid if uid in unseen]
+        candidates: list[tuple[str, dict]] = []
+        too_old: list[str] = []
+        for uid in unseen_uids:
+            entry = by_uid[uid]
             # Skip entries older than lookback window; mark seen so they don't repeat.
             pub = entry.get("published_parsed") or entry.get("updated_parsed")
             if pub:
                 entry_dt = datetime(*pub[:6], tzinfo=timezone.utc)
                 if entry_dt < cutoff:
-                    self.db.mark_entry_seen(feed.id, uid)
+                    too_old.append(uid)
                     logger.debug("Skipping old entry (before cutoff): %s", uid)
                     continue
             candidates.append((uid, entry))
-        for uid, entry in reversed(candidates[:10]):
-            sent = await self._handle_entry(entry)
-            if sent:
-                self.db.mark_entry_seen(feed.id, uid)
+        await self.db.aio.mark_entries_seen(feed.id, too_old)
+        # After a partial read the entries further down are unknown, so they
+        # could be pruned while still listed.
+        if by_uid and exhausted and not pushed:
+            await self.db.aio.prune_entries(feed.id, list(by_uid), cutoff.timestamp())
+
+        # Validators are only stored once every candidate is handled; otherwise a
+        # 304 or an unchanged body next cycle would hide the entries still pending.
+        batch = _FeedBatch(
+            feed=feed,
+            etag=result.etag,
+            last_modified=result.last_modified,
+            content_hash=result.content_hash,
+            complete=len(candidates) <= 10 and not pushed,
+        )
+        for seq, (uid, entry) in enumerate(reversed(candidates[:10])):
+            batch.jobs.append(EntryJob(entry=entry, feed_id=feed.id, uid=uid, seq=seq, batch=batch))
+        if not batch.jobs:
+            await self._finish_batch(batch)
+        return batch
+
+    async def _stream_entries(
+        self, feed: Feed, result: FeedFetchResult
+    ) -> tuple[list[dict], set[str], bool] | None:
+        """Parse entries lazily, stopping after a run of already-seen entries.
+
+        Returns the entries read, the unseen UIDs among them, and whether the
+        whole feed was read; or None when the document should go to feedparser
+        (malformed, not RSS/Atom, or no entries found).
+        """
+        stream = EntryStream(result.content, base_url=_feed_base(feed, result))
+        entries: list[dict] = []
+        unseen: set[str] = set()
+        seen_run = 0
+        try:
+            while True:
+                chunk = await asyncio.to_thread(stream.read, _STREAM_BATCH)
+                if not chunk:
+                    break
+                entries.extend(chunk)
+                uids = [uid for uid in map(_entry_uid, chunk) if uid]
+                fresh = set(await self.db.aio.unseen_entry_uids(feed.id, uids))
+                unseen |= fresh
+                for uid in uids:
+                    seen_run = 0 if uid in fresh else seen_run + 1
+                limit = self.config.stream_stop_after_seen
+                if limit and seen_run >= limit:
+                    return entries, unseen, False
+        except FeedStreamError as e:
+            logger.debug("Streaming parse failed [%s], using feedparser: %s", feed.url, e)
+            return None
+        return (entries, unseen, True) if entries else None
+
+    async def probe_feeds(self, urls: list[str]) -> list[FeedProbe]:
+        """Validate candidate feeds concurrently, ``import_concurrency`` at a time.
+
+        Per-host limits still apply, so a long list is bounded by its slowest
+        host rather than by the sum of all fetches. Response bodies are only
+        carried on the probes up to the prefetch budget.
+        """
+        budget = _PREFETCH_MAX_BYTES
+
+        async def probe(url: str) -> FeedProbe:
+            nonlocal budget
+            result = await self.probe_feed(url)
+            if result.response is not None:
+                size = len(result.response.content)
+                if size > budget:
+                    result.response = None
+                else:
+                    budget -= size
+            return result
+
+        return list(await asyncio.gather(*(probe(url) for url in urls)))
+
+    async def probe_feed(self, url: str) -> FeedProbe:
+        """Fetch and check a candidate feed; pass it to ``keep_prefetched`` once the feed is added."""
+        async with self._probe_limiter.slot(url):
+            try:
+                result = await fetch_feed(self.http, url)
+            except httpx.HTTPError as e:
+                return FeedProbe(url=url, error=str(e) or type(e).__name__)
+        if result.status_code >= 400:
+            return FeedProbe(url=url, error=f"HTTP {result.status_code}")
+        try:
+            title, entries = await asyncio.to_thread(_scan_feed, result.content)
+        except FeedStreamError:
+            parsed = await asyncio.to_thread(feedparser.parse, result.content, response_headers=result.headers)
+            title, entries = parsed.feed.get("title", ""), len(parsed.entries)
+            if not entries and not title:
+                return FeedProbe(url=url, error="not an RSS/Atom feed")
+        hub = discover_hub(url, result.headers, result.content)
+        return FeedProbe(url=url, title=title, entries=entries, hub=hub, response=result)
+
+    def keep_prefetched(self, probes: list[FeedProbe]) -> None:
+        """Hold the validation fetches of newly added feeds for their first poll.
+
+        Entries expire after a few minutes and the oldest go first once the
+        total passes ``_PREFETCH_MAX_BYTES``.
+        """
+        now = time.monotonic()
+        kept = {u: p for u, p in self._prefetched.items() if now - p[0] < _PREFETCH_TTL_SECONDS}
+        for probe in probes:
+            if probe.response is not None:
+                kept.pop(probe.url, None)
+                kept[probe.url] = (now, probe.response)
+        total = sum(len(result.content) for _, result in kept.values())
+        for url in list(kept):
+            if total <= _PREFETCH_MAX_BYTES:
+                break
+            total -= len(kept.pop(url)[1].content)
+        self._prefetched = kept
+
+    def _take_prefetched(self, url: str) -> FeedFetchResult | None:
+        prefetched = self._prefetched.pop(url, None)
+        if prefetched is None or time.monotonic() - prefetched[0] >= _PREFETCH_TTL_SECONDS:
+            return None
+        return prefetched[1]
+
+    async def _complete_job(self, job: EntryJob) -> None:
+        try:
+            sent = await self._deliver(job)
+        except Exception:
+            logger.exception("Delivery failed: %s", job.link)
+            sent = False
+        await self._settle_articles(job, sent)
+        batch = job.batch
+        if sent and batch is not None:
+            await self.db.aio.mark_entry_seen(job.feed_id, job.uid)
+        if batch is None:
+            return
+        if not sent:
+            batch.complete = False
+        batch.delivered += 1
+        if batch.delivered == len(batch.jobs):
+            await self._finish_batch(batch)
+
+    async def _finish_batch(self, batch: _FeedBatch) -> None:
+        if batch.complete:
+            await self.db.aio.update_feed_validators(batch.feed.id, batch.etag, batch.last_modified, batch.content_hash)
 
     async def _handle_entry(self, entry: dict) -> bool:
-        title = str(entry.get("title") or "Untitled")
-        link = str(entry.get("link") or "")
-        if not link:
-            return False
+        job = EntryJob(entry=entry)
+        await self._run_stages(job)
+        sent = await self._deliver(job)
+        await self._settle_articles(job, sent)
+        return sent
 
-        logger.info("Processing entry: %s", title)
-        html_doc = await asyncio.to_thread(fetch_html, link)
+    async def _claim_article(self, job: EntryJob, url: str) -> bool:
+        """Claim ``url`` for this job; if another feed already has it, finish the job.
 
-        if is_substack_url(link) and is_probably_paid_substack(title, link, html_doc):
-            logger.info("Skipping paid/suspected-paid Substack post: %s", title)
+        Returns False for a duplicate. Only feed entries take part; a single
+        entry passed to ``_handle_entry`` is always processed.
+        """
+        key = canonical_url(url)
+        if job.batch is None or key in job.canonical_urls:
             return True
+        if key in self._claimed:
+            duplicate = True
+        else:
+            self._claimed.add(key)
+            job.canonical_urls.append(key)
+            duplicate = bool(await self.db.aio.known_articles([key]))
+        if duplicate:
+            logger.info("Skipping article already handled via another feed: %s", url)
+            metrics.inc("rss_duplicate_articles_total")
+            job.finish(handled=True)
+        return not duplicate
+
+    async def _settle_articles(self, job: EntryJob, handled: bool) -> None:
+        """Record a handled job's canonical URLs and release its claims."""
+        if not job.canonical_urls:
+            return
+        try:
+            if handled:
+                await self.db.aio.record_articles(job.feed_id, job.canonical_urls)
+        finally:
+            self._claimed.difference_update(job.canonical_urls)
+
+    async def _run_stages(self, job: EntryJob) -> None:
+        for stage in (self._stage_fetch, self._stage_extract, self._stage_summarize):
+            if job.finished:
+                return
+            await stage(job)
+
+    async def _stage_fetch(self, job: EntryJob) -> None:
+        link = job.link
+        if not link:
+            job.finish(handled=False)
+            return
+
+        logger.info("Processing entry: %s", job.title)
+        if not await self._claim_article(job, link):
+            return
+        substack = is_substack_url(link)
+        # The title or URL alone may already mark the post as paid.
+        if substack and is_probably_paid_substack(job.title, link):
+            self._skip_paid(job)
+            return
+        html_doc = await self.cache.aio.get_html(link) if self.cache else None
+        if html_doc is None:
+            # Page markup only counts for post URLs (see is_probably_paid_substack);
+            # there the scanner stops the download at the first paywall marker.
+            scanner = PaywallScanner() if substack and "/p/" in link.lower() else None
+            redirects: list[str] = []
+            with metrics.timer("rss_stage_seconds", stage="article_fetch"):
+                html_doc = await fetch_html(
+                    self.http,
+                    link,
+                    max_bytes=self.config.article_max_bytes,
+                    max_decoded_bytes=self.config.article_max_bytes * 2,
+                    scanner=scanner,
+                    on_redirect=redirects.append,
+                )
+            if scanner is not None and scanner.matched:
+                self._skip_paid(job)
+                return
+            # Shorteners and feed proxies only reveal the article URL on redirect.
+            if redirects and not await self._claim_article(job, redirects[-1]):
+                return
+            if html_doc and self.cache:
+                await self.cache.aio.put_html(link, html_doc)
+        job.html = html_doc
+
+        if substack and is_probably_paid_substack(job.title, link, html_doc):
+            self._skip_paid(job)
 
-        main_text = await asyncio.to_thread(extract_main_text, link, html_doc)
+    def _skip_paid(self, job: EntryJob) -> None:
+        logger.info("Skipping paid/suspected-paid Substack post: %s", job.title)
+        metrics.inc("rss_paywall_skipped_total")
+        job.finish(handled=True)
+
+    async def _stage_extract(self, job: EntryJob) -> None:
+        html_doc, link, title = job.html, job.link, job.title
+        main_text = await self.cache.aio.get_text(html_doc) if self.cache and html_doc else None
+        if main_text is None:
+            with metrics.timer("rss_stage_seconds", stage="extract"):
+                main_text = await self.extractor.extract(link, html_doc, extract_main_text)
+            if main_text and self.cache:
+                await self.cache.aio.put_text(html_doc, main_text)
         if not main_text:
             logger.warning("Failed to extract text from: %s", link)
             text = f"<b>{html.escape(title)}</b>\nFailed to extract article text. Link: {html.escape(link)}"
-            await self._send(text)
-            return True
+            job.finish(handled=True, message=text)
+            return
+        job.text = main_text
 
-        summary = await asyncio.to_thread(self.summarizer.summarize_ko, title, link, main_text)
-        if not summary:
-            logger.warning("Summarizer returned nothing for: %s", title)
-            return False
+    async def _stage_summarize(self, job: EntryJob) -> None:
+        main_text, link, title = job.text or "", job.link, job.title
+        summary = await self.cache.aio.get_summary(main_text) if self.cache else None
+        if summary is None:
+            with metrics.timer("rss_stage_seconds", stage="summarize"):
+                summary = await self.summarizer.summarize_ko(title, link, main_text)
+            if not summary:
+                logger.warning("Summarizer returned nothing for: %s", title)
+                job.finish(handled=False)
+                return
+            if self.cache:
+                await self.cache.aio.put_summary(main_text, summary)
         msg = f"<b>{html.escape(title)}</b>\n{html.escape(link)}\n\n{html.escape(summary)}"
-        await self._send(msg)
-        return True
+        job.finish(handled=True, message=msg)
 
-    async def _send(self, text: str) -> None:
-        max_len = 3900
+    async def _deliver(self, job: EntryJob) -> bool:
+        if job.message:
+            await self._send(job.message, job.batch.digest_id if job.batch else None)
+        return job.handled
+
+    async def _send(self, text: str, digest_id: int | None = None) -> None:
+        # Queued in the outbox; DeliveryLoop paces the actual Telegram calls.
+        cfg = self.config
+        max_len = _MAX_MESSAGE_CHARS
         safe_text = text if len(text) <= max_len else text[:max_len] + "\n\n(Truncated due to message length)"
-        await self.bot.send_message(chat_id=self.config.channel_id, text=safe_text, parse_mode="HTML")
+        if digest_id is not None:
+            # Persisted now so the entry can be marked seen; packed when the cycle ends.
+            await self.db.aio.enqueue_digest_part(digest_id, cfg.channel_id, safe_text)
+            return
+        await self.db.aio.enqueue_message(
+            cfg.channel_id, safe_text, self._release_at(), cfg.quiet_release_spacing_seconds
+        )
+        self.delivery.notify()
+
+    def _release_at(self) -> float | None:
+        if self.config.quiet_prefetch and self.in_quiet_hours():
+            # Prepared overnight; held in the outbox until quiet hours end.
+            return quiet_hours_end(self.config.quiet_end_hour).timestamp()
+        return None
+
+
+class _FeedFailure(Exception):
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(value: str | None) -> float | None:
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
 
+def pack_messages(texts: list[str], max_len: int, separator: str = "\n\n") -> list[str]:
+    """Join ``texts`` in order into as few messages of at most ``max_len`` as possible.
+
+    Messages are only split between texts; a text longer than ``max_len`` on
+    its own stays a message of its own.
+    """
+    messages: list[str] = []
+    current = ""
+    for text in texts:
+        if current and len(current) + len(separator) + len(text) <= max_len:
+            current += separator + text
+            continue
+        if current:
+            messages.append(current)
+        current = text
+    if current:
+        messages.append(current)
+    return messages
+
+
+def _feed_base(feed: Feed, result: FeedFetchResult) -> str:
+    """URL that relative entry links resolve against: Content-Location, else where the feed was fetched."""
+    return urljoin(result.url or feed.url, result.headers.get("content-location", ""))
+
+
+def _scan_feed(content: bytes) -> tuple[str, int]:
+    """Title and entry count of an RSS/Atom document, read without keeping the entries."""
+    stream = EntryStream(content)
+    entries = 0
+    while chunk := stream.read(100):
+        entries += len(chunk)
+    return stream.title, entries
+
+
+def _entry_uid(entry: dict) -> str:
+    return str(entry.get("id") or entry.get("link") or entry.get("title") or "").strip()
+
+
+@dataclass
+class FeedProbe:
+    """Outcome of validating a candidate feed URL."""
+
+    url: str
+    title: str = ""
+    entries: int = 0
+    error: str | None = None
+    hub: tuple[str, str] | None = None
+    # The validating response, reusable as the feed's first poll.
+    response: FeedFetchResult | None = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class EntryJob:
+    """One feed entry moving through the pipeline stages."""
+
+    entry: dict
+    feed_id: int = 0
+    uid: str = ""
+    seq: int = 0
+    batch: _FeedBatch | None = None
+    html: str | None = None
+    text: str | None = None
+    message: str | None = None
+    handled: bool = False
+    finished: bool = False
+    canonical_urls: list[str] = field(default_factory=list)
+
+    @property
+    def title(self) -> str:
+        return str(self.entry.get("title") or "Untitled")
+
+    @property
+    def link(self) -> str:
+        return str(self.entry.get("link") or "")
+
+    def finish(self, handled: bool, message: str | None = None) -> None:
+        self.finished = True
+        self.handled = handled
+        self.message = message
+
+
+@dataclass
+class _FeedBatch:
+    feed: Feed
+    etag: str | None
+    last_modified: str | None
+    content_hash: str
+    complete: bool
+    jobs: list[EntryJob] = field(default_factory=list)
+    pending: dict[int, EntryJob] = field(default_factory=dict)
+    next_seq: int = 0
+    delivered: int = 0
+    digest_id: int | None = None
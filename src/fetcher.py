@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "kp-rss-bot/1.0"
+
+
+@dataclass
+class FeedFetchResult:
+    url: str
+    status_code: int
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("last-modified")
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.content).hexdigest()
+
+
+class HostLimiter:
+    """Global concurrency cap plus a per-host cap for outgoing fetches."""
+
+    def __init__(self, global_limit: int, per_host_limit: int):
+        self._global = asyncio.Semaphore(max(1, global_limit))
+        self._per_host_limit = max(1, per_host_limit)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        host = (urlsplit(url).hostname or "").lower()
+        sem = self._hosts.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self._per_host_limit)
+            self._hosts[host] = sem
+        # Wait for the host first so a busy host does not hold a global slot.
+        async with sem:
+            async with self._global:
+                yield
+
+
+def build_http_client(
+    timeout_seconds: float = 30.0,
+    max_connections: int = 32,
+    max_keepalive_connections: int = 16,
+    http2: bool = False,
+) -> httpx.AsyncClient:
+    """Long-lived pooled client shared by feed and article fetches."""
+    if http2 and not _h2_available():
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1.")
+        http2 = False
+    return httpx.AsyncClient(
+        timeout=timeout_seconds,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        http2=http2,
+    )
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def fetch_feed(
+    client: httpx.AsyncClient,
+    url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    timeout: float | None = None,
+) -> FeedFetchResult:
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    if timeout is None:
+        resp = await client.get(url, headers=headers)
+    else:
+        resp = await client.get(url, headers=headers, timeout=timeout)
+    return FeedFetchResult(
+        url=str(resp.url),
+        status_code=resp.status_code,
+        content=resp.content,
+        headers={k.lower(): v for k, v in resp.headers.items()},
+    )
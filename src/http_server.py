@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+_MAX_BODY_BYTES = 1_000_000
+_READ_TIMEOUT_SECONDS = 10.0
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    204: "No Content",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    410: "Gone",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes = b""
+
+    def param(self, name: str) -> str | None:
+        values = self.query.get(name)
+        return values[0] if values else None
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def text(cls, text: str, status: int = 200, content_type: str = "text/plain; charset=utf-8") -> Response:
+        return cls(status=status, body=text.encode("utf-8"), headers={"Content-Type": content_type})
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class HttpServer:
+    """Small asyncio HTTP/1.1 server for the bot's own endpoints.
+
+    Routes are matched on exact path. One request per connection; bodies need
+    a Content-Length and are capped at 1 MB unless the route sets its own cap.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 8080):
+        self.host = host
+        self.port = port
+        self._routes: dict[str, dict[str, Handler]] = {}
+        self._body_caps: dict[tuple[str, str], int] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    def route(
+        self,
+        path: str,
+        handler: Handler,
+        methods: tuple[str, ...] = ("GET",),
+        max_body_bytes: int = _MAX_BODY_BYTES,
+    ) -> None:
+        for method in methods:
+            self._routes.setdefault(path, {})[method.upper()] = handler
+            self._body_caps[(method.upper(), path)] = max_body_bytes
+
+    def _body_cap(self, method: str, path: str) -> int:
+        return self._body_caps.get((method, path), _MAX_BODY_BYTES)
+
+    @property
+    def bound_port(self) -> int:
+        if self._server is None or not self._server.sockets:
+            return self.port
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def start(self) -> None:
+        if self._server is None:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+            logger.info("HTTP server listening on %s:%d", self.host, self.bound_port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = await asyncio.wait_for(_read_request(reader, self._body_cap), _READ_TIMEOUT_SECONDS)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                return
+            if request is None:
+                response = Response.text("payload too large", status=413)
+            else:
+                response = await self._dispatch(request)
+            writer.write(_encode_response(response))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: Request) -> Response:
+        methods = self._routes.get(request.path)
+        if methods is None:
+            return Response.text("not found", status=404)
+        handler = methods.get(request.method)
+        if handler is None:
+            return Response.text("method not allowed", status=405)
+        try:
+            return await handler(request)
+        except Exception:
+            logger.exception("HTTP handler failed: %s %s", request.method, request.path)
+            return Response.text("internal error", status=500)
+
+
+async def _read_request(reader: asyncio.StreamReader, body_cap: Callable[[str, str], int]) -> Request | None:
+    """Parse one request. Returns None when the body is over the route's size cap."""
+    request_line = (await reader.readuntil(b"\r\n")).decode("latin-1").strip()
+    method, target, _ = request_line.split(" ", 2)
+    headers: dict[str, str] = {}
+    while True:
+        line = (await reader.readuntil(b"\r\n")).decode("latin-1")
+        if line == "\r\n":
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    parts = urlsplit(target)
+    path = parts.path or "/"
+    length = int(headers.get("content-length") or 0)
+    if length > body_cap(method.upper(), path):
+        return None
+    body = await reader.readexactly(length) if length else b""
+    return Request(
+        method=method.upper(),
+        path=path,
+        query=parse_qs(parts.query),
+        headers=headers,
+        body=body,
+    )
+
+
+def _encode_response(response: Response) -> bytes:
+    headers = {"Content-Length": str(len(response.body)), "Connection": "close", **response.headers}
+    head = f"HTTP/1.1 {response.status} {_REASONS.get(response.status, 'Unknown')}\r\n"
+    head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return head.encode("latin-1") + b"\r\n" + response.body
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import secrets
 
 from telegram import Bot
 
+from .cache import ContentCache
 from .config import load_settings
 from .db import Database
 from .feed_worker import FeedWorker, WorkerConfig
+from .http_server import HttpServer
 from .summarizer import Summarizer, SummaryConfig
-from .telegram_app import build_application
+from .telegram_app import build_application, run_webhook
 
 
 def main() -> None:
@@ -31,9 +35,23 @@ def main() -> None:
             gemini_model=settings.gemini_model,
             openai_api_key=settings.openai_api_key,
             openai_model=settings.openai_model,
+            concurrency=settings.summary_concurrency,
+            gemini_rpm=settings.gemini_rpm,
+            gemini_tpm=settings.gemini_tpm,
+            openai_rpm=settings.openai_rpm,
+            openai_tpm=settings.openai_tpm,
+            hedge_percentile=settings.hedge_percentile,
+            provider_cooldown_seconds=settings.provider_cooldown_seconds,
+            max_input_tokens=settings.summary_max_input_tokens,
         )
     )
 
+    cache = ContentCache(
+        settings.content_cache_path,
+        ttl_seconds=settings.content_cache_ttl_hours * 3600,
+        max_bytes=settings.content_cache_max_mb * 1024 * 1024,
+    )
+
     worker = FeedWorker(
         db=db,
         bot=Bot(token=settings.telegram_bot_token),
@@ -42,19 +60,52 @@ def main() -> None:
             channel_id=settings.telegram_channel_id,
             quiet_start_hour=settings.quiet_start_hour,
             quiet_end_hour=settings.quiet_end_hour,
+            quiet_prefetch=settings.quiet_prefetch,
+            quiet_release_spacing_seconds=settings.quiet_release_spacing_seconds,
+            digest=settings.digest_mode,
+            import_concurrency=settings.import_concurrency,
             lookback_hours=settings.lookback_hours,
+            feed_concurrency=settings.feed_concurrency,
+            feed_per_host_concurrency=settings.feed_per_host_concurrency,
+            http2=settings.http2,
+            article_max_bytes=settings.article_max_bytes,
+            extract_processes=settings.extract_processes,
+            extract_timeout_seconds=settings.extract_timeout_seconds,
+            article_workers=settings.article_workers,
+            extract_workers=max(1, settings.extract_processes),
+            summarize_workers=settings.summarize_workers,
+            telegram_messages_per_minute=settings.telegram_messages_per_minute,
+            poll_interval_minutes=settings.poll_interval_minutes,
+            poll_min_interval_minutes=settings.poll_min_interval_minutes,
+            poll_max_interval_minutes=settings.poll_max_interval_minutes,
+            stream_parse=settings.feed_stream_parse,
+            feed_retry_base_minutes=settings.feed_retry_base_minutes,
+            feed_retry_max_minutes=settings.feed_retry_max_minutes,
+            feed_degraded_after_errors=settings.feed_degraded_after_errors,
+            stream_stop_after_seen=settings.feed_stream_stop_after_seen,
+            # Hub callbacks arrive on the embedded HTTP server.
+            websub_callback_url=settings.websub_callback_url if settings.http_port else "",
+            websub_poll_interval_minutes=settings.websub_poll_interval_minutes,
         ),
+        cache=cache,
     )
 
+    http_server = HttpServer(settings.http_host, settings.http_port) if settings.http_port else None
+
     app = build_application(
         token=settings.telegram_bot_token,
         db=db,
         worker=worker,
-        poll_interval_minutes=settings.poll_interval_minutes,
         admin_user_ids=settings.admin_user_ids,
+        http_server=http_server,
     )
 
-    app.run_polling(allowed_updates=["message"])
+    if settings.telegram_mode == "webhook":
+        # Without a configured secret a fresh one is registered on every start.
+        secret = settings.telegram_webhook_secret or secrets.token_urlsafe(32)
+        asyncio.run(run_webhook(app, settings.telegram_webhook_url, secret, allowed_updates=["message"]))
+    else:
+        app.run_polling(allowed_updates=["message"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+# Upper bounds in seconds; spans sub-millisecond DB calls to multi-minute cycles.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Process-wide counters, gauges and latency histograms.
+
+    Thread-safe, since database calls are timed on executor threads. Rendered
+    in the Prometheus text format by ``render()`` and summarised for ``/stats``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters: dict[str, dict[Labels, float]] = {}
+            self.histograms: dict[str, dict[Labels, Histogram]] = {}
+            self.gauges: dict[str, dict[Labels, Callable[[], float]]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, seconds: float, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def set_gauge(self, name: str, read: Callable[[], float], **labels: object) -> None:
+        """Register a gauge whose value is read from ``read`` at scrape time."""
+        with self._lock:
+            self.gauges.setdefault(name, {})[_labels(labels)] = read
+
+    def remove_gauge(self, name: str, **labels: object) -> None:
+        with self._lock:
+            self.gauges.get(name, {}).pop(_labels(labels), None)
+
+    def counter(self, name: str, **labels: object) -> float:
+        with self._lock:
+            return self.counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def histogram(self, name: str, **labels: object) -> Histogram | None:
+        with self._lock:
+            return self.histograms.get(name, {}).get(_labels(labels))
+
+    def histogram_series(self, name: str) -> dict[Labels, Histogram]:
+        with self._lock:
+            return dict(self.histograms.get(name, {}))
+
+    def counter_series(self, name: str) -> dict[Labels, float]:
+        with self._lock:
+            return dict(self.counters.get(name, {}))
+
+    def gauge_values(self, name: str) -> dict[Labels, float]:
+        with self._lock:
+            reads = dict(self.gauges.get(name, {}))
+        return {key: float(read()) for key, read in reads.items()}
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            counters = {n: dict(s) for n, s in self.counters.items()}
+            histograms = {n: dict(s) for n, s in self.histograms.items()}
+            gauge_names = sorted(self.gauges)
+        for name, series in sorted(counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        for name in gauge_names:
+            lines.append(f"# TYPE {name} gauge")
+            for key, value in sorted(self.gauge_values(name).items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(series.items()):
+                cumulative = 0
+                for bound, n in zip(hist.buckets, hist.counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {hist.count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(hist.sum)}")
+                lines.append(f"{name}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(key: Labels) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+
+class OpmlError(Exception):
+    """The document is not OPML."""
+
+
+def parse_opml(content: bytes) -> list[str]:
+    """Feed URLs (``xmlUrl`` of every outline, nested ones included) in document order."""
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        raise OpmlError(str(e)) from e
+    if root.tag.lower() != "opml":
+        raise OpmlError(f"not an OPML document: <{root.tag}>")
+    urls: list[str] = []
+    for outline in root.iter("outline"):
+        url = (outline.get("xmlUrl") or outline.get("xmlurl") or "").strip()
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def build_opml(feeds: list[tuple[str, str]], title: str = "RSS Insight Bot feeds") -> bytes:
+    """An OPML 2.0 subscription list of ``(url, title)`` pairs."""
+    root = ET.Element("opml", version="2.0")
+    head = ET.SubElement(root, "head")
+    ET.SubElement(head, "title").text = title
+    ET.SubElement(head, "dateCreated").text = format_datetime(datetime.now(timezone.utc))
+    body = ET.SubElement(root, "body")
+    for url, text in feeds:
+        ET.SubElement(body, "outline", type="rss", text=text or url, xmlUrl=url)
+    ET.indent(root)
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# trafilatura's text output puts each paragraph on its own line.
+_LINE_BREAK_RE = re.compile(r"\s*\n\s*")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。])\s+")
+
+# Short paragraphs that open with one of these phrases are site chrome, not
+# article content. Anchored so ordinary words ("subscribers", "광고 매출") survive.
+_BOILERPLATE_RE = re.compile(
+    r"^(?:subscribe (?:now|today|here|to (?:our|the|my|this) )|sign up (?:for|to) (?:our|the|my|this) |"
+    r"share this (?:post|article|story|page)|follow us (?:on|for)|all rights reserved|"
+    r"we use cookies|this (?:site|website) uses cookies|cookie (?:policy|settings|preferences)|"
+    r"click here to|read more\b|related (?:posts?|articles?|stories)\b|leave a (?:comment|reply)|"
+    r"©|copyright (?:©|\(c\)|\d{4})|구독하기|뉴스레터 구독|공유하기|무단 ?전재|저작권자)"
+    r"|^(?:advertisement|sponsored|광고|댓글(?:\s*\d+개?)?|구독|공유)\W*$",
+    re.IGNORECASE,
+)
+_BOILERPLATE_MAX_CHARS = 200
+
+_STOPWORDS = frozenset(
+    "the a an and or but of to in on for with at by from as is are was were be been "
+    "it this that these those we you they he she i not no so if then than can will "
+    "would could should has have had do does did about into over more most also".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    # Mixed Korean/English text runs about 3 characters per token.
+    return len(text) // 3 + 1
+
+
+def prepare_content(text: str, max_tokens: int) -> str:
+    """Shrink article text for the prompt without a blind character cut.
+
+    Duplicate and boilerplate paragraphs are dropped first. If the rest is
+    still over ``max_tokens``, the most informative paragraphs are kept in
+    their original order.
+    """
+    paragraphs = _clean_paragraphs(text)
+    cleaned = "\n\n".join(paragraphs)
+    if estimate_tokens(cleaned) <= max_tokens:
+        return cleaned
+    return "\n\n".join(_select_paragraphs(paragraphs, max_tokens))
+
+
+def _clean_paragraphs(text: str) -> list[str]:
+    result: list[str] = []
+    seen: set[str] = set()
+    for raw in _LINE_BREAK_RE.split(text):
+        para = raw.strip()
+        if not para:
+            continue
+        key = " ".join(para.lower().split())
+        if key in seen:
+            continue
+        seen.add(key)
+        if len(para) <= _BOILERPLATE_MAX_CHARS and _BOILERPLATE_RE.search(para):
+            continue
+        result.append(para)
+    return result
+
+
+def _words(text: str) -> list[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if len(w) > 1 and w not in _STOPWORDS]
+
+
+def _select_paragraphs(paragraphs: list[str], max_tokens: int) -> list[str]:
+    """Greedy extractive pick: score paragraphs by TF-IDF, then fit the budget.
+
+    Terms the article keeps returning to score high; terms spread across every
+    paragraph (templated filler) are discounted by their paragraph frequency.
+    """
+    words_per_para = [_words(p) for p in paragraphs]
+    doc_tf = Counter(w for words in words_per_para for w in words)
+    df = Counter(w for words in words_per_para for w in set(words))
+    n = len(paragraphs)
+    scores: list[tuple[float, int]] = []
+    last = n - 1
+    for i, words in enumerate(words_per_para):
+        if not words:
+            continue
+        score = sum(math.log1p(doc_tf[w]) * math.log(1 + n / df[w]) for w in set(words))
+        score /= math.sqrt(len(words))
+        # Openings state the thesis and endings the conclusion.
+        if i == 0:
+            score *= 1.5
+        elif i == last:
+            score *= 1.2
+        scores.append((score, i))
+
+    chosen: set[int] = set()
+    used = 0
+    for _, i in sorted(scores, reverse=True):
+        cost = estimate_tokens(paragraphs[i])
+        if used + cost > max_tokens:
+            continue
+        chosen.add(i)
+        used += cost
+    if not chosen and paragraphs:
+        return [_leading_sentences(paragraphs[0], max_tokens)]
+    return [paragraphs[i] for i in sorted(chosen)]
+
+
+def _leading_sentences(paragraph: str, max_tokens: int) -> str:
+    """Whole sentences from the start of an oversized paragraph, cut mid-sentence only as a last resort."""
+    kept = ""
+    for sentence in _SENTENCE_END_RE.split(paragraph):
+        candidate = f"{kept} {sentence}".strip()
+        if estimate_tokens(candidate) > max_tokens:
+            break
+        kept = candidate
+    return kept or paragraph[: max_tokens * 3]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+ProviderCall = Callable[[], Awaitable["str | None"]]
+
+
+class ProviderStats:
+    """Sliding window of recent latencies and outcomes for one provider."""
+
+    def __init__(self, window: int = 50):
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.cooldown_until = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(latency)
+
+    def percentile(self, p: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+    def in_cooldown(self, now: float) -> bool:
+        return now < self.cooldown_until
+
+
+class ProviderRouter:
+    """Routes a request across providers, hedging slow ones and skipping sick ones.
+
+    The first provider in preference order runs alone until it exceeds its
+    recent ``hedge_percentile`` latency; then the next provider is started as
+    well and whichever returns a summary first wins. A provider whose recent
+    error rate reaches ``error_threshold`` is skipped for ``cooldown_seconds``.
+    """
+
+    def __init__(
+        self,
+        hedge_percentile: float = 0.9,
+        min_hedge_delay: float = 2.0,
+        default_hedge_delay: float = 20.0,
+        error_threshold: float = 0.5,
+        min_samples: int = 5,
+        cooldown_seconds: float = 300.0,
+    ):
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.default_hedge_delay = default_hedge_delay
+        self.error_threshold = error_threshold
+        self.min_samples = min_samples
+        self.cooldown_seconds = cooldown_seconds
+        self.stats: dict[str, ProviderStats] = {}
+
+    async def run(self, calls: dict[str, ProviderCall]) -> str | None:
+        """Run ``calls`` (in preference order) and return the first non-empty result."""
+        queue = self._available(list(calls))
+        pending: dict[asyncio.Task, tuple[str, float]] = {}
+        last_launched = ""
+
+        def launch() -> None:
+            nonlocal last_launched
+            name = queue.pop(0)
+            pending[asyncio.create_task(calls[name]())] = (name, time.monotonic())
+            last_launched = name
+
+        if not queue:
+            return None
+        launch()
+        try:
+            while pending:
+                timeout = self.hedge_delay(last_launched) if queue else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info("%s is slow; hedging with %s", last_launched, queue[0])
+                    launch()
+                    continue
+                for task in done:
+                    name, started = pending.pop(task)
+                    result = None if task.exception() else task.result()
+                    self._record(name, time.monotonic() - started, bool(result))
+                    if result:
+                        return result
+                if not pending and queue:
+                    launch()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def hedge_delay(self, name: str) -> float:
+        stats = self.stats.get(name)
+        if stats is None or len(stats.latencies) < self.min_samples:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, stats.percentile(self.hedge_percentile) or 0.0)
+
+    def _available(self, names: list[str]) -> list[str]:
+        now = time.monotonic()
+        healthy = [n for n in names if not self._stats(n).in_cooldown(now)]
+        # With every provider cooling down, trying anyway beats dropping the post.
+        return healthy or names
+
+    def _record(self, name: str, latency: float, ok: bool) -> None:
+        stats = self._stats(name)
+        stats.record(latency, ok)
+        if len(stats.outcomes) >= self.min_samples and stats.error_rate() >= self.error_threshold:
+            logger.warning(
+                "%s error rate %.0f%%; cooling down for %.0fs",
+                name,
+                stats.error_rate() * 100,
+                self.cooldown_seconds,
+            )
+            stats.cooldown_until = time.monotonic() + self.cooldown_seconds
+            stats.outcomes.clear()
+
+    def _stats(self, name: str) -> ProviderStats:
+        if name not in self.stats:
+            self.stats[name] = ProviderStats()
+        return self.stats[name]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursting up to ``capacity``.
+
+    A rate of 0 disables the limit. ``pause`` blocks every caller until a
+    deadline, which is how a server's Retry-After is honoured.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: int) -> TokenBucket:
+        return cls(rate=limit / 60.0, capacity=float(limit))
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        if self.rate <= 0:
+            await self._wait_pause()
+            return
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                await self._wait_pause()
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # Start from an empty bucket after the pause so the backlog does not burst.
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    async def _wait_pause(self) -> None:
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import random
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+from .db import Database, Feed
+
+if TYPE_CHECKING:
+    from .feed_worker import FeedWorker
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_interval(
+    published: list[float],
+    now: float,
+    min_seconds: float,
+    max_seconds: float,
+    default_seconds: float,
+) -> float:
+    """Pick a poll interval from a feed's recent publish timestamps.
+
+    Polls about twice per typical gap between posts, and backs off further
+    while the feed has been silent for much longer than usual.
+    """
+    stamps = sorted(set(published), reverse=True)[:20]
+    gaps = [a - b for a, b in zip(stamps, stamps[1:])]
+    if not gaps:
+        return _clamp(default_seconds, min_seconds, max_seconds)
+    typical = statistics.median(gaps)
+    interval = typical / 2
+    silence = now - stamps[0]
+    if silence > typical * 2:
+        interval = max(interval, silence / 4)
+    return _clamp(interval, min_seconds, max_seconds)
+
+
+def next_poll_time(now: float, interval: float, jitter: float) -> float:
+    return now + interval * (1 + random.uniform(-jitter, jitter))
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+class PollScheduler:
+    """Polls each active feed when it comes due, earliest first.
+
+    A feed is due at its ``next_poll_at``, or at ``next_retry_at`` while it is
+    backing off after errors.
+    """
+
+    def __init__(self, db: Database, worker: FeedWorker, max_sleep_seconds: float = 60.0):
+        self.db = db
+        self.worker = worker
+        self.max_sleep_seconds = max_sleep_seconds
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_due(self, now: float | None = None) -> list[Feed]:
+        """Poll every feed that is due. Returns the feeds polled."""
+        now = time.time() if now is None else now
+        heap = [(f.due_at, f.id, f) for f in await self.db.aio.active_feeds()]
+        heapq.heapify(heap)
+        due: list[Feed] = []
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap)[2])
+        if due:
+            await self.worker.run_once(due)
+        return due
+
+    async def _run(self) -> None:
+        while True:
+            if self.worker.polling_paused():
+                await asyncio.sleep(self.max_sleep_seconds)
+                continue
+            try:
+                await self.run_due()
+            except Exception:
+                logger.exception("Scheduled polling failed")
+            await asyncio.sleep(await self._sleep_seconds())
+
+    async def _sleep_seconds(self) -> float:
+        # Wake at least every max_sleep_seconds to pick up added or resumed feeds.
+        upcoming = [f.due_at for f in await self.db.aio.active_feeds()]
+        if not upcoming:
+            return self.max_sleep_seconds
+        return _clamp(min(upcoming) - time.time(), 1.0, self.max_sleep_seconds)
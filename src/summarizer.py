@@ -1,9 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import logging
 from dataclasses import dataclass
+from typing import Awaitable, Callable
 
 import google.generativeai as genai
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from .metrics import metrics
+from .prompt_budget import estimate_tokens, prepare_content
+from .provider_router import ProviderRouter
+from .rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Rough upper bound on what a summary costs in output tokens, charged against
+# the TPM bucket together with the prompt.
+_OUTPUT_TOKEN_BUDGET = 800
 
 
 @dataclass
@@ -13,19 +28,54 @@ class SummaryConfig:
     gemini_model: str
     openai_api_key: str
     openai_model: str
+    concurrency: int = 4
+    gemini_rpm: int = 0
+    gemini_tpm: int = 0
+    openai_rpm: int = 0
+    openai_tpm: int = 0
+    max_retries: int = 3
+    hedge_percentile: float = 0.9
+    provider_cooldown_seconds: float = 300.0
+    max_input_tokens: int = 4000
+
+
+class _ProviderLimits:
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket.per_minute(rpm) if rpm > 0 else TokenBucket(0)
+        self.tokens = TokenBucket.per_minute(tpm) if tpm > 0 else TokenBucket(0)
+
+    async def acquire(self, tokens: int) -> None:
+        await self.requests.acquire()
+        await self.tokens.acquire(tokens)
+
+    def pause(self, seconds: float) -> None:
+        self.requests.pause(seconds)
+        self.tokens.pause(seconds)
 
 
 class Summarizer:
     def __init__(self, config: SummaryConfig):
         self.config = config
         self.provider = config.provider
-        self._openai: OpenAI | None = None
+        self._openai: AsyncOpenAI | None = None
+        self._gemini: genai.GenerativeModel | None = None
         if config.openai_api_key:
-            self._openai = OpenAI(api_key=config.openai_api_key)
+            self._openai = AsyncOpenAI(api_key=config.openai_api_key)
         if config.gemini_api_key:
             genai.configure(api_key=config.gemini_api_key)
+            self._gemini = genai.GenerativeModel(config.gemini_model)
+        self._semaphore = asyncio.Semaphore(max(1, config.concurrency))
+        self._limits = {
+            "gemini": _ProviderLimits(config.gemini_rpm, config.gemini_tpm),
+            "openai": _ProviderLimits(config.openai_rpm, config.openai_tpm),
+        }
+        self.router = ProviderRouter(
+            hedge_percentile=config.hedge_percentile,
+            cooldown_seconds=config.provider_cooldown_seconds,
+        )
 
-    def summarize_ko(self, title: str, url: str, content: str) -> str | None:
+    async def summarize_ko(self, title: str, url: str, content: str) -> str | None:
+        content = prepare_content(content, self.config.max_input_tokens)
         prompt = (
             "다음 글을 한국어로 요약하세요.\n"
             "출력 형식:\n"
@@ -34,47 +84,91 @@ class Summarizer:
             "3) 투자 관점 체크포인트 2개\n\n"
             f"제목: {title}\n"
             f"링크: {url}\n"
-            f"본문:\n{content[:12000]}"
+            f"본문:\n{content}"
         )
 
-        if self.provider == "gemini":
-            result = self._summarize_gemini(prompt)
-            if result:
-                return result
-            result = self._summarize_openai(prompt)
-            if result:
-                return result
-        else:
-            result = self._summarize_openai(prompt)
-            if result:
-                return result
-            result = self._summarize_gemini(prompt)
-            if result:
-                return result
+        providers = {
+            "gemini": (self._gemini, self._summarize_gemini),
+            "openai": (self._openai, self._summarize_openai),
+        }
+        order = ("gemini", "openai") if self.provider == "gemini" else ("openai", "gemini")
+        calls = {
+            name: functools.partial(providers[name][1], prompt)
+            for name in order
+            if providers[name][0] is not None
+        }
+        return await self.router.run(calls)
 
-        return None
+    async def aclose(self) -> None:
+        if self._openai:
+            await self._openai.close()
 
-    def _summarize_gemini(self, prompt: str) -> str | None:
-        if not self.config.gemini_api_key:
-            return None
-        try:
-            model = genai.GenerativeModel(self.config.gemini_model)
-            resp = model.generate_content(prompt)
-            text = (resp.text or "").strip()
-            return text or None
-        except Exception:
+    async def _summarize_gemini(self, prompt: str) -> str | None:
+        if not self._gemini:
             return None
+        model = self._gemini
+
+        async def call() -> str:
+            resp = await model.generate_content_async(prompt)
+            return resp.text or ""
+
+        return await self._call("gemini", prompt, call)
 
-    def _summarize_openai(self, prompt: str) -> str | None:
+    async def _summarize_openai(self, prompt: str) -> str | None:
         if not self._openai:
             return None
-        try:
-            resp = self._openai.responses.create(
+        client = self._openai
+
+        async def call() -> str:
+            resp = await client.chat.completions.create(
                 model=self.config.openai_model,
-                input=prompt,
+                messages=[{"role": "user", "content": prompt}],
             )
-            text = (resp.output_text or "").strip()
-            return text or None
-        except Exception:
-            return None
+            return resp.choices[0].message.content or ""
+
+        return await self._call("openai", prompt, call)
+
+    async def _call(self, provider: str, prompt: str, call: Callable[[], Awaitable[str]]) -> str | None:
+        """Run one provider call under its concurrency and RPM/TPM limits.
+
+        Rate-limit errors pause the provider's buckets for Retry-After (or an
+        exponential backoff) and retry; any other error gives up on the provider.
+        """
+        limits = self._limits[provider]
+        tokens = estimate_tokens(prompt) + _OUTPUT_TOKEN_BUDGET
+        for attempt in range(self.config.max_retries + 1):
+            await limits.acquire(tokens)
+            try:
+                async with self._semaphore:
+                    with metrics.timer("rss_summarize_seconds", provider=provider):
+                        text = (await call()).strip()
+                metrics.inc("rss_summarize_total", provider=provider, result="ok" if text else "empty")
+                return text or None
+            except Exception as e:
+                if not _is_rate_limited(e):
+                    logger.warning("%s summarization failed: %s", provider, e)
+                    metrics.inc("rss_summarize_total", provider=provider, result="error")
+                    return None
+                metrics.inc("rss_summarize_total", provider=provider, result="rate_limited")
+                delay = _retry_after_seconds(e) or float(2 ** (attempt + 1))
+                logger.warning("%s rate limited; retrying in %.1fs", provider, delay)
+                limits.pause(delay)
+        logger.warning("%s still rate limited after %d retries", provider, self.config.max_retries)
+        return None
 
+
+def _is_rate_limited(exc: Exception) -> bool:
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    return status == 429
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    raw = headers.get("retry-after")
+    try:
+        return max(0.0, float(raw)) if raw is not None else None
+    except ValueError:
+        return None
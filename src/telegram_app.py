@@ -1,39 +1,66 @@
 from __future__ import annotations
 
 import asyncio
+import hmac
+import json
 import logging
+import signal
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
 
-import feedparser
 from telegram import Update
-from telegram.ext import Application, CallbackContext, CommandHandler
+from telegram.ext import Application, CallbackContext, CommandHandler, MessageHandler, filters
 
-from .db import Database
+from .db import Database, Feed
 from .feed_worker import FeedWorker
+from .opml import OpmlError, build_opml, parse_opml
+from .http_server import HttpServer, Request, Response
+from .metrics import Histogram, MetricsRegistry, metrics
+from .scheduler import PollScheduler
+from .time_utils import KST
 
 logger = logging.getLogger(__name__)
 
+_OPML_MAX_BYTES = 2_000_000
+
 
 def build_application(
     token: str,
     db: Database,
     worker: FeedWorker,
-    poll_interval_minutes: int,
     admin_user_ids: set[int],
+    http_server: HttpServer | None = None,
 ) -> Application:
-    app = Application.builder().token(token).build()
+    app = Application.builder().token(token).post_init(_startup).post_shutdown(_shutdown).build()
 
     app.add_handler(CommandHandler("add", _wrap_admin(add_feed, admin_user_ids)))
     app.add_handler(CommandHandler("list", _wrap_admin(list_feeds, admin_user_ids)))
     app.add_handler(CommandHandler("remove", _wrap_admin(remove_feed, admin_user_ids)))
     app.add_handler(CommandHandler("pause", _wrap_admin(pause_feed, admin_user_ids)))
     app.add_handler(CommandHandler("resume", _wrap_admin(resume_feed, admin_user_ids)))
+    app.add_handler(CommandHandler("digest", _wrap_admin(digest_feed, admin_user_ids)))
+    app.add_handler(CommandHandler("import", _wrap_admin(import_feeds, admin_user_ids)))
+    # An OPML file sent with "/import" as its caption.
+    app.add_handler(
+        MessageHandler(
+            filters.Document.ALL & filters.CaptionRegex(r"^/import(@\w+)?\b"),
+            _wrap_admin(import_feeds, admin_user_ids),
+        )
+    )
+    app.add_handler(CommandHandler("export", _wrap_admin(export_feeds, admin_user_ids)))
     app.add_handler(CommandHandler("runonce", _wrap_admin(run_once, admin_user_ids)))
+    app.add_handler(CommandHandler("stats", _wrap_admin(stats, admin_user_ids)))
+
+    if http_server is not None:
+        http_server.route("/metrics", _metrics_endpoint)
+        if worker.websub is not None:
+            worker.websub.register(http_server)
 
     app.bot_data["db"] = db
     app.bot_data["worker"] = worker
-
-    jq = app.job_queue
-    jq.run_repeating(_poll_job, interval=poll_interval_minutes * 60, first=10)
+    app.bot_data["scheduler"] = PollScheduler(db, worker)
+    app.bot_data["http_server"] = http_server
     return app
 
 
@@ -55,13 +82,15 @@ async def add_feed(update: Update, context: CallbackContext) -> None:
         await update.message.reply_text("사용법: /add <rss_or_atom_url>")
         return
     url = context.args[0].strip()
+    worker: FeedWorker = context.application.bot_data["worker"]
 
     await update.message.reply_text("피드 확인 중...")
-    parsed = await asyncio.to_thread(feedparser.parse, url)
-    entry_count = len(parsed.entries)
-    feed_title = parsed.feed.get("title", "")
+    # The validation fetch is reused by the feed's first poll.
+    probe = await worker.probe_feed(url)
+    entry_count = probe.entries
+    feed_title = probe.title
 
-    if not entry_count and not feed_title:
+    if not probe.ok:
         await update.message.reply_text(
             f"❌ 유효한 RSS/Atom 피드를 찾을 수 없습니다.\n"
             f"일반 웹페이지 URL 대신 피드 URL을 입력해주세요.\n"
@@ -70,38 +99,127 @@ async def add_feed(update: Update, context: CallbackContext) -> None:
         return
 
     try:
-        feed_id = db.add_feed(url)
+        feed_id = await db.aio.add_feed(url)
+        worker.keep_prefetched([probe])
         title_info = f" ({feed_title})" if feed_title else ""
         await update.message.reply_text(
             f"✅ 추가 완료{title_info}\nid={feed_id}, 항목 {entry_count}개 확인됨"
         )
     except Exception as e:
         await update.message.reply_text(f"추가 실패: {e}")
+        return
+
+    if worker.websub is not None:
+        await worker.websub.discover(feed_id, url, probe.hub)
+
+
+async def import_feeds(update: Update, context: CallbackContext) -> None:
+    """Add every feed of an OPML document after validating them concurrently.
+
+    The document is attached to the command, attached to the message it
+    replies to, or pasted after the command.
+    """
+    db: Database = context.application.bot_data["db"]
+    worker: FeedWorker = context.application.bot_data["worker"]
+    try:
+        content = await _opml_payload(update)
+    except OpmlError as e:
+        await update.message.reply_text(f"❌ {e}")
+        return
+    if content is None:
+        await update.message.reply_text("사용법: OPML 파일에 /import 캡션을 달아 보내거나, OPML 파일에 /import로 답장하세요.")
+        return
+    try:
+        urls = parse_opml(content)
+    except OpmlError as e:
+        await update.message.reply_text(f"OPML을 읽을 수 없습니다: {e}")
+        return
+    known = {f.url for f in await db.aio.list_feeds()}
+    candidates = [u for u in urls if u not in known]
+    if not candidates:
+        await update.message.reply_text(f"새 피드가 없습니다. (OPML {len(urls)}개, 모두 등록됨)")
+        return
+
+    await update.message.reply_text(f"피드 {len(candidates)}개 확인 중...")
+    probes = await worker.probe_feeds(candidates)
+    added = await db.aio.add_feeds([p.url for p in probes if p.ok])
+    inserted = set(added)
+    worker.keep_prefetched([p for p in probes if p.url in inserted])
+    failed = [p for p in probes if not p.ok]
+    lines = [f"✅ {len(added)}개 추가, 이미 등록 {len(urls) - len(candidates)}개, 실패 {len(failed)}개"]
+    lines.extend(f"❌ {p.url}: {p.error}" for p in failed[:20])
+    if len(failed) > 20:
+        lines.append(f"… 외 {len(failed) - 20}개")
+    await update.message.reply_text("\n".join(lines))
+
+
+async def _opml_payload(update: Update) -> bytes | None:
+    message = update.message
+    document = message.document or (message.reply_to_message.document if message.reply_to_message else None)
+    if document is not None:
+        too_large = OpmlError(f"파일이 너무 큽니다. (최대 {_OPML_MAX_BYTES // 1_000_000}MB)")
+        if document.file_size and document.file_size > _OPML_MAX_BYTES:
+            raise too_large
+        file = await document.get_file()
+        content = bytes(await file.download_as_bytearray())
+        if len(content) > _OPML_MAX_BYTES:
+            raise too_large
+        return content
+    text = (message.text or "").partition(" ")[2].strip()
+    return text.encode("utf-8") if text else None
+
+
+async def export_feeds(update: Update, context: CallbackContext) -> None:
+    db: Database = context.application.bot_data["db"]
+    feeds = await db.aio.list_feeds()
+    if not feeds:
+        await update.message.reply_text("등록된 피드가 없습니다.")
+        return
+    document = build_opml([(f.url, "") for f in feeds])
+    await update.message.reply_document(document=document, filename="feeds.opml", caption=f"피드 {len(feeds)}개")
 
 
 async def list_feeds(update: Update, context: CallbackContext) -> None:
     db: Database = context.application.bot_data["db"]
-    feeds = db.list_feeds()
+    feeds = await db.aio.list_feeds()
     if not feeds:
         await update.message.reply_text("등록된 피드가 없습니다.")
         return
     lines = []
     for f in feeds:
-        status = "paused" if f.paused else "active"
-        lines.append(f"{f.id}. [{status}] {f.url}")
+        digest = " · 다이제스트" if f.digest else ""
+        lines.append(f"{f.id}. [{_feed_status(f)}{digest}] {f.url}")
+        if f.consecutive_errors and f.last_error:
+            retry = ""
+            if f.next_retry_at:
+                retry = f", 다음 시도 {datetime.fromtimestamp(f.next_retry_at, KST):%m-%d %H:%M}"
+            lines.append(f"   ↳ {f.last_error[:120]}{retry}")
     await update.message.reply_text("\n".join(lines))
 
 
+def _feed_status(feed: Feed) -> str:
+    if feed.paused:
+        return "paused"
+    if feed.degraded:
+        return f"degraded, 연속 오류 {feed.consecutive_errors}회"
+    if feed.consecutive_errors:
+        return f"error, 연속 오류 {feed.consecutive_errors}회"
+    return "active"
+
+
 async def remove_feed(update: Update, context: CallbackContext) -> None:
     db: Database = context.application.bot_data["db"]
     if not context.args:
         await update.message.reply_text("사용법: /remove <id|url>")
         return
-    feed_id = _resolve_feed_id(db, context.args[0])
+    feed_id = await _resolve_feed_id(db, context.args[0])
     if feed_id is None:
         await update.message.reply_text("해당 id/url을 찾을 수 없습니다.")
         return
-    ok = db.remove_feed(feed_id)
+    worker: FeedWorker = context.application.bot_data["worker"]
+    if worker.websub is not None:
+        await worker.websub.unsubscribe(feed_id)
+    ok = await db.aio.remove_feed(feed_id)
     await update.message.reply_text("삭제 완료" if ok else "해당 id를 찾을 수 없습니다.")
 
 
@@ -110,11 +228,11 @@ async def pause_feed(update: Update, context: CallbackContext) -> None:
     if not context.args:
         await update.message.reply_text("사용법: /pause <id|url>")
         return
-    feed_id = _resolve_feed_id(db, context.args[0])
+    feed_id = await _resolve_feed_id(db, context.args[0])
     if feed_id is None:
         await update.message.reply_text("해당 id/url을 찾을 수 없습니다.")
         return
-    ok = db.set_paused(feed_id, True)
+    ok = await db.aio.set_paused(feed_id, True)
     await update.message.reply_text("일시중지 완료" if ok else "해당 id를 찾을 수 없습니다.")
 
 
@@ -123,14 +241,31 @@ async def resume_feed(update: Update, context: CallbackContext) -> None:
     if not context.args:
         await update.message.reply_text("사용법: /resume <id|url>")
         return
-    feed_id = _resolve_feed_id(db, context.args[0])
+    feed_id = await _resolve_feed_id(db, context.args[0])
     if feed_id is None:
         await update.message.reply_text("해당 id/url을 찾을 수 없습니다.")
         return
-    ok = db.set_paused(feed_id, False)
+    ok = await db.aio.set_paused(feed_id, False)
     await update.message.reply_text("재개 완료" if ok else "해당 id를 찾을 수 없습니다.")
 
 
+async def digest_feed(update: Update, context: CallbackContext) -> None:
+    db: Database = context.application.bot_data["db"]
+    if len(context.args or []) != 2 or context.args[1].lower() not in ("on", "off"):
+        await update.message.reply_text("사용법: /digest <id|url> on|off")
+        return
+    feed_id = await _resolve_feed_id(db, context.args[0])
+    if feed_id is None:
+        await update.message.reply_text("해당 id/url을 찾을 수 없습니다.")
+        return
+    enabled = context.args[1].lower() == "on"
+    ok = await db.aio.set_digest(feed_id, enabled)
+    if not ok:
+        await update.message.reply_text("해당 id를 찾을 수 없습니다.")
+        return
+    await update.message.reply_text("다이제스트 켜짐" if enabled else "다이제스트 꺼짐")
+
+
 async def run_once(update: Update, context: CallbackContext) -> None:
     worker: FeedWorker = context.application.bot_data["worker"]
     await update.message.reply_text("수집을 1회 실행합니다.")
@@ -138,21 +273,145 @@ async def run_once(update: Update, context: CallbackContext) -> None:
     await update.message.reply_text("실행 완료")
 
 
-async def _poll_job(context: CallbackContext) -> None:
-    worker: FeedWorker = context.application.bot_data["worker"]
+async def stats(update: Update, context: CallbackContext) -> None:
+    db: Database = context.application.bot_data["db"]
+    outbox = await db.aio.outbox_size()
+    held = await db.aio.held_message_count(time.time())
+    await update.message.reply_text(format_stats(metrics, outbox, held))
+
+
+def format_stats(registry: MetricsRegistry, outbox_size: int, held: int = 0) -> str:
+    lines = ["📊 처리 통계 (count · avg · p50 · p99)"]
+    stages = registry.histogram_series("rss_stage_seconds")
+    for key, hist in sorted(stages.items()):
+        lines.append(f"- {dict(key)['stage']}: {_hist_summary(hist)}")
+    providers = registry.histogram_series("rss_summarize_seconds")
+    if providers:
+        lines.append("\n요약 제공자")
+        for key, hist in sorted(providers.items()):
+            name = dict(key)["provider"]
+            outcomes = " / ".join(
+                f"{result} {int(registry.counter('rss_summarize_total', provider=name, result=result))}"
+                for result in ("ok", "empty", "error", "rate_limited")
+            )
+            lines.append(f"- {name}: {_hist_summary(hist)} ({outcomes})")
+    caches = registry.counter_series("rss_cache_requests_total")
+    if caches:
+        lines.append("\n캐시 적중률")
+        for kind in sorted({dict(key)["kind"] for key in caches}):
+            hits = registry.counter("rss_cache_requests_total", kind=kind, result="hit")
+            total = hits + registry.counter("rss_cache_requests_total", kind=kind, result="miss")
+            lines.append(f"- {kind}: {int(hits)}/{int(total)} ({hits / total:.0%})")
+    db_ops = registry.histogram_series("rss_db_seconds")
+    if db_ops:
+        lines.append("\nDB (누적 시간 상위 5개)")
+        for key, hist in sorted(db_ops.items(), key=lambda kv: kv[1].sum, reverse=True)[:5]:
+            lines.append(f"- {dict(key)['op']}: {_hist_summary(hist)}")
+    depths = registry.gauge_values("rss_queue_depth")
+    if depths:
+        lines.append("\n큐 대기: " + ", ".join(f"{dict(k)['queue']} {int(v)}" for k, v in sorted(depths.items())))
+    lines.append(f"아웃박스: {outbox_size}건" + (f" (조용한 시간 이후 발송 대기 {held}건)" if held else ""))
+    return "\n".join(lines)
+
+
+def _hist_summary(hist: Histogram) -> str:
+    avg = hist.sum / hist.count if hist.count else 0.0
+    return f"{hist.count} · {avg:.2f}s · ≤{hist.quantile(0.5):g}s · ≤{hist.quantile(0.99):g}s"
+
+
+async def _metrics_endpoint(request: Request) -> Response:
+    return Response.text(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def webhook_endpoint(app: Application, secret_token: str):
+    """HTTP handler that queues updates Telegram posts to the webhook.
+
+    Requests without the secret token registered with ``setWebhook`` are
+    rejected, so only Telegram can inject updates.
+    """
+    expected = secret_token.encode("utf-8")
+
+    async def handle(request: Request) -> Response:
+        received = request.headers.get("x-telegram-bot-api-secret-token", "").encode("utf-8")
+        if not hmac.compare_digest(received, expected):
+            return Response.text("forbidden", status=403)
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return Response.text("bad request", status=400)
+        update = Update.de_json(data, app.bot)
+        if update is not None:
+            await app.update_queue.put(update)
+        return Response.text("ok")
+
+    return handle
+
+
+async def run_webhook(
+    app: Application,
+    webhook_url: str,
+    secret_token: str,
+    allowed_updates: list[str] | None = None,
+) -> None:
+    """Receive updates on the embedded HTTP server until SIGINT/SIGTERM.
+
+    The webhook route, the poll scheduler and the feed worker share this one
+    event loop; between cycles the process just waits on the socket.
+    """
+    http_server: HttpServer = app.bot_data["http_server"]
+    http_server.route(urlsplit(webhook_url).path or "/", webhook_endpoint(app, secret_token), methods=("POST",))
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await app.initialize()
     try:
-        await worker.run_once()
-    except Exception:
-        logger.exception("Polling job failed")
+        if app.post_init:
+            await app.post_init(app)
+        await app.bot.set_webhook(webhook_url, secret_token=secret_token, allowed_updates=allowed_updates)
+        await app.start()
+        logger.info("Receiving Telegram updates via webhook at %s", webhook_url)
+        await stop.wait()
+    finally:
+        if app.running:
+            await app.stop()
+        await app.shutdown()
+        if app.post_shutdown:
+            await app.post_shutdown(app)
+
+
+async def _startup(app: Application) -> None:
+    worker: FeedWorker = app.bot_data["worker"]
+    worker.start()
+    scheduler: PollScheduler = app.bot_data["scheduler"]
+    scheduler.start()
+    http_server: HttpServer | None = app.bot_data["http_server"]
+    if http_server is not None:
+        await http_server.start()
+
+
+async def _shutdown(app: Application) -> None:
+    http_server: HttpServer | None = app.bot_data["http_server"]
+    if http_server is not None:
+        await http_server.stop()
+    scheduler: PollScheduler = app.bot_data["scheduler"]
+    await scheduler.stop()
+    worker: FeedWorker = app.bot_data["worker"]
+    await worker.aclose()
+    if worker.cache is not None:
+        worker.cache.close()
+    db: Database = app.bot_data["db"]
+    db.close()
 
 
-def _resolve_feed_id(db: Database, value: str) -> int | None:
+async def _resolve_feed_id(db: Database, value: str) -> int | None:
     raw = value.strip()
     try:
         return int(raw)
     except ValueError:
         pass
-    for feed in db.list_feeds():
+    for feed in await db.aio.list_feeds():
         if feed.url.strip() == raw:
             return feed.id
     return None
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 
@@ -16,3 +16,11 @@ def is_in_quiet_hours(quiet_start_hour: int, quiet_end_hour: int, now: datetime
         return quiet_start_hour <= hour < quiet_end_hour
     return hour >= quiet_start_hour or hour < quiet_end_hour
 
+
+def quiet_hours_end(quiet_end_hour: int, now: datetime | None = None) -> datetime:
+    """The next KST ``quiet_end_hour``:00 after ``now``."""
+    current = now.astimezone(KST) if now else datetime.now(KST)
+    end = current.replace(hour=quiet_end_hour, minute=0, second=0, microsecond=0)
+    if end <= current:
+        end += timedelta(days=1)
+    return end
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import re
+import secrets
+import time
+from typing import Awaitable, Callable
+from urllib.parse import urljoin
+
+import httpx
+
+from .db import Database, WebSubSubscription
+from .http_server import HttpServer, Request, Response
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CALLBACK_PATH = "/websub"
+
+# Hub links sit in the feed header; never scan a whole large document for them.
+_DISCOVERY_BYTES = 64 * 1024
+_RETRY_SECONDS = 3600
+# Pushes carry the whole feed document, and some publishers' feeds run to several MB.
+_MAX_PUSH_BYTES = 20 * 1024 * 1024
+# How long after a renewal request the hub's verification is still accepted.
+_RENEWAL_VERIFY_SECONDS = _RETRY_SECONDS
+_LINK_TAG_RE = re.compile(rb"<(?:atom:)?link\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(rb"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_LINK_HEADER_RE = re.compile(r"<([^>]*)>((?:\s*;\s*[^;,]+)*)")
+_REL_PARAM_RE = re.compile(r"""rel\s*=\s*(?:"([^"]*)"|([^\s;,]+))""", re.IGNORECASE)
+_SIGNATURE_ALGORITHMS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+PushHandler = Callable[[int, bytes, dict[str, str]], Awaitable[None]]
+
+
+def discover_hub(feed_url: str, headers: dict[str, str], content: bytes) -> tuple[str, str] | None:
+    """Return ``(hub_url, topic_url)`` advertised by a feed response, if any.
+
+    HTTP ``Link`` headers win over ``<link rel="hub">`` elements in the
+    document. The topic is the ``rel="self"`` URL, falling back to ``feed_url``.
+    """
+    links: dict[str, str] = {}
+    for url, params in _LINK_HEADER_RE.findall(headers.get("link", "")):
+        for rel in _rels(" ".join(a or b for a, b in _REL_PARAM_RE.findall(params))):
+            links.setdefault(rel, url.strip())
+    for tag in _LINK_TAG_RE.findall(content[:_DISCOVERY_BYTES]):
+        attrs = {m[0].lower(): (m[1] or m[2]) for m in _ATTR_RE.findall(tag)}
+        href = attrs.get(b"href", b"").decode("utf-8", "replace").strip()
+        if href:
+            for rel in _rels(attrs.get(b"rel", b"").decode("utf-8", "replace")):
+                links.setdefault(rel, href)
+    return hub_from_links(feed_url, links)
+
+
+def hub_from_links(feed_url: str, links: dict[str, str]) -> tuple[str, str] | None:
+    """Pick the hub and topic out of a ``rel -> href`` mapping."""
+    hub = links.get("hub")
+    if not hub:
+        return None
+    return urljoin(feed_url, hub), urljoin(feed_url, links.get("self") or feed_url)
+
+
+def _rels(value: str) -> list[str]:
+    return [rel.lower() for rel in value.split()]
+
+
+def sign(secret: str, body: bytes, algorithm: str = "sha256") -> str:
+    """``X-Hub-Signature`` value for ``body``, as a hub would send it."""
+    digest = hmac.new(secret.encode("utf-8"), body, _SIGNATURE_ALGORITHMS[algorithm]).hexdigest()
+    return f"{algorithm}={digest}"
+
+
+def verify_signature(secret: str, body: bytes, header: str | None) -> bool:
+    algorithm, _, received = (header or "").partition("=")
+    if algorithm.lower() not in _SIGNATURE_ALGORITHMS or not received:
+        return False
+    return hmac.compare_digest(sign(secret, body, algorithm.lower()), f"{algorithm.lower()}={received.lower()}")
+
+
+class WebSubManager:
+    """Keeps WebSub subscriptions for hub-enabled feeds and receives their pushes.
+
+    Subscriptions are requested from the hub, confirmed when the hub calls
+    back with a challenge, and renewed shortly before the lease runs out.
+    Pushes must carry an HMAC signature made with the subscription's secret;
+    unsigned or mis-signed bodies are acknowledged but dropped, as the spec
+    requires. Valid bodies are handed to ``on_push`` in a background task.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        http: httpx.AsyncClient,
+        callback_url: str,
+        on_push: PushHandler,
+        lease_seconds: int = 7 * 86400,
+        renew_margin_seconds: int = 86400,
+    ):
+        self.db = db
+        self.http = http
+        self.callback_url = callback_url.rstrip("/") + CALLBACK_PATH
+        self.on_push = on_push
+        self.lease_seconds = lease_seconds
+        self.renew_margin_seconds = renew_margin_seconds
+        self._tasks: set[asyncio.Task] = set()
+
+    def register(self, server: HttpServer) -> None:
+        server.route(CALLBACK_PATH, self._verify, methods=("GET",))
+        server.route(CALLBACK_PATH, self._receive, methods=("POST",), max_body_bytes=_MAX_PUSH_BYTES)
+
+    def callback_for(self, feed_id: int) -> str:
+        return f"{self.callback_url}?feed={feed_id}"
+
+    async def aclose(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def is_active(self, feed_id: int) -> bool:
+        sub = await self.db.aio.websub_subscription(feed_id)
+        return sub is not None and sub.active(time.time())
+
+    async def discover(self, feed_id: int, feed_url: str, hub: tuple[str, str] | None) -> None:
+        """Subscribe when a feed advertises a hub we are not subscribed to yet."""
+        if hub is None:
+            return
+        hub_url, topic_url = hub
+        sub = await self.db.aio.websub_subscription(feed_id)
+        if sub is not None and (sub.hub_url, sub.topic_url) == (hub_url, topic_url):
+            return
+        logger.info("Feed [%s] advertises WebSub hub %s", feed_url, hub_url)
+        await self.subscribe(feed_id, hub_url, topic_url)
+
+    async def subscribe(
+        self, feed_id: int, hub_url: str, topic_url: str, secret: str | None = None, renewal: bool = False
+    ) -> bool:
+        secret = secret or secrets.token_hex(20)
+        ok = await self._request(
+            hub_url,
+            {
+                "hub.mode": "subscribe",
+                "hub.topic": topic_url,
+                "hub.callback": self.callback_for(feed_id),
+                "hub.secret": secret,
+                "hub.lease_seconds": str(self.lease_seconds),
+            },
+        )
+        # A failed request is retried by renew_due like an unverified one. A
+        # renewal keeps the current lease active until the hub verifies again.
+        state = ("renewing" if renewal else "pending") if ok else "failed"
+        await self.db.aio.save_websub_request(feed_id, hub_url, topic_url, secret, state)
+        return ok
+
+    async def unsubscribe(self, feed_id: int) -> None:
+        """Ask the hub to stop pushing; the hub's confirmation is accepted once the row is gone."""
+        sub = await self.db.aio.websub_subscription(feed_id)
+        if sub is None:
+            return
+        await self.db.aio.delete_websub(feed_id)
+        await self._request(
+            sub.hub_url,
+            {"hub.mode": "unsubscribe", "hub.topic": sub.topic_url, "hub.callback": self.callback_for(feed_id)},
+        )
+
+    async def renew_due(self) -> int:
+        """Renew leases close to expiry and retry requests the hub never confirmed."""
+        now = time.time()
+        renewed = 0
+        for sub in await self.db.aio.websub_subscriptions():
+            active = sub.active(now)
+            if active:
+                due = (sub.lease_until or 0.0) - self.renew_margin_seconds <= now
+                # Ask again hourly, not every cycle, until the hub verifies.
+                due = due and sub.requested_at + min(_RETRY_SECONDS, self.renew_margin_seconds / 2) <= now
+            else:
+                due = sub.requested_at + _RETRY_SECONDS <= now
+            if due:
+                await self.subscribe(sub.feed_id, sub.hub_url, sub.topic_url, secret=sub.secret, renewal=active)
+                renewed += 1
+        return renewed
+
+    async def _request(self, hub_url: str, form: dict[str, str]) -> bool:
+        try:
+            resp = await self.http.post(hub_url, data=form)
+        except httpx.HTTPError as e:
+            logger.warning("WebSub %s request to %s failed: %s", form["hub.mode"], hub_url, e)
+            return False
+        if resp.status_code >= 300:
+            logger.warning("WebSub hub %s refused %s: HTTP %d", hub_url, form["hub.mode"], resp.status_code)
+            return False
+        return True
+
+    async def _verify(self, request: Request) -> Response:
+        """Answer the hub's verification of intent by echoing ``hub.challenge``."""
+        feed_id = _feed_param(request)
+        mode = request.param("hub.mode")
+        sub = await self.db.aio.websub_subscription(feed_id) if feed_id is not None else None
+        if mode == "denied":
+            logger.warning("WebSub hub denied subscription for feed %s: %s", feed_id, request.param("hub.reason"))
+            if sub is not None:
+                await self.db.aio.save_websub_request(feed_id, sub.hub_url, sub.topic_url, sub.secret, "failed")
+            return Response.text("ok")
+        challenge = request.param("hub.challenge")
+        if challenge is None or feed_id is None:
+            return Response.text("bad request", status=400)
+        if mode == "subscribe" and self._awaiting_verification(sub, request.param("hub.topic")):
+            # Never trust a longer lease than we asked for.
+            lease = min(_int(request.param("hub.lease_seconds")) or self.lease_seconds, self.lease_seconds)
+            await self.db.aio.activate_websub(feed_id, time.time() + lease)
+            logger.info("WebSub subscription active for feed %d (lease %ds)", feed_id, lease)
+            return Response.text(challenge)
+        if mode == "unsubscribe" and sub is None:
+            return Response.text(challenge)
+        return Response.text("not found", status=404)
+
+    @staticmethod
+    def _awaiting_verification(sub: WebSubSubscription | None, topic: str | None) -> bool:
+        """Only a subscribe request we actually sent, and still in flight, may be confirmed."""
+        if sub is None or sub.topic_url != topic:
+            return False
+        if sub.state == "pending":
+            return True
+        return sub.state == "renewing" and time.time() - sub.requested_at <= _RENEWAL_VERIFY_SECONDS
+
+    async def _receive(self, request: Request) -> Response:
+        feed_id = _feed_param(request)
+        sub = await self.db.aio.websub_subscription(feed_id) if feed_id is not None else None
+        if sub is None:
+            # 410 tells the hub to drop a subscription we no longer hold.
+            metrics.inc("rss_websub_pushes_total", result="unknown")
+            return Response.text("gone", status=410)
+        if not verify_signature(sub.secret, request.body, request.headers.get("x-hub-signature")):
+            logger.warning("Ignoring WebSub push with a bad signature for feed %d", feed_id)
+            metrics.inc("rss_websub_pushes_total", result="bad_signature")
+            return Response.text("accepted", status=202)
+        metrics.inc("rss_websub_pushes_total", result="ok")
+        task = asyncio.create_task(self._dispatch(sub, request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return Response.text("accepted", status=202)
+
+    async def _dispatch(self, sub: WebSubSubscription, request: Request) -> None:
+        try:
+            await self.on_push(sub.feed_id, request.body, request.headers)
+        except Exception:
+            logger.exception("WebSub push processing failed for feed %d", sub.feed_id)
+
+
+def _feed_param(request: Request) -> int | None:
+    return _int(request.param("feed"))
+
+
+def _int(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
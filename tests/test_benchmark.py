@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import unittest
+
+from benchmarks.pipeline import BenchConfig, compare, run_suite
+
+
+class TestPipelineBenchmark(unittest.IsolatedAsyncioTestCase):
+    async def test_suite_delivers_every_entry(self):
+        """로컬 피드 서버와 가짜 Bot/Summarizer로 모든 항목이 전송되고 단계별 지표가 남아야 함."""
+        cfg = BenchConfig(entries_per_feed=2, summary_latency=0.0, bot_latency=0.0)
+        results = await run_suite([3], cfg)
+
+        run = results["3"]
+        self.assertEqual(run["delivered"], 6)
+        self.assertEqual(run["stages"]["feed"]["count"], 3)
+        self.assertEqual(run["stages"]["summarize"]["count"], 6)
+        self.assertGreater(run["entries_per_second"], 0)
+
+
+class TestBaselineCompare(unittest.TestCase):
+    def test_flags_throughput_and_latency_regressions(self):
+        """처리량 감소와 p99 증가가 허용 범위를 넘으면 회귀로 보고해야 함."""
+        baseline = {"10": {"entries_per_second": 100.0, "stages": {"extract": {"p99": 0.05}}}}
+        fine = {"10": {"entries_per_second": 90.0, "stages": {"extract": {"p99": 0.055}}}}
+        slow = {"10": {"entries_per_second": 50.0, "stages": {"extract": {"p99": 0.2}}}}
+
+        self.assertEqual(compare(fine, baseline, tolerance=0.25), [])
+        self.assertEqual(len(compare(slow, baseline, tolerance=0.25)), 2)
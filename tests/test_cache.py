@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.cache import KIND_HTML, ContentCache
+from src.db import Database
+from src.feed_worker import FeedWorker, WorkerConfig
+
+
+class TestContentCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "cache.db"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_html_keyed_by_normalized_url(self):
+        """스킴/호스트 대소문자와 fragment가 달라도 같은 HTML을 돌려줘야 함."""
+        cache = ContentCache(self.path)
+        cache.put_html("https://Example.com/p/a#top", "<html>a</html>")
+        self.assertEqual(cache.get_html("HTTPS://example.com:443/p/a"), "<html>a</html>")
+
+    def test_entries_expire_after_ttl(self):
+        """TTL이 지난 항목은 반환하지 않아야 함."""
+        cache = ContentCache(self.path, ttl_seconds=60)
+        cache.put_summary("본문", "요약")
+        with patch("src.cache.time.time", return_value=time.time() + 120):
+            self.assertIsNone(cache.get_summary("본문"))
+
+    def test_size_eviction_drops_least_recently_used(self):
+        """용량을 넘으면 가장 오래 접근하지 않은 항목부터 제거해야 함."""
+        cache = ContentCache(self.path, max_bytes=250)
+        cache.put(KIND_HTML, "a", "x" * 100)
+        cache.put(KIND_HTML, "b", "x" * 100)
+        cache.get(KIND_HTML, "a")
+        cache.put(KIND_HTML, "c", "x" * 100)
+        self.assertIsNone(cache.get(KIND_HTML, "b"))
+        self.assertIsNotNone(cache.get(KIND_HTML, "a"))
+        self.assertIsNotNone(cache.get(KIND_HTML, "c"))
+
+    def test_persists_across_reopen(self):
+        """다시 열어도 저장된 항목이 유지돼야 함."""
+        ContentCache(self.path).put_text("<html/>", "text")
+        self.assertEqual(ContentCache(self.path).get_text("<html/>"), "text")
+
+    def test_hit_access_time_is_written_on_close(self):
+        """조회 시각은 조회마다 커밋하지 않고 모아 두었다가 닫을 때 기록해야 함."""
+        cache = ContentCache(self.path)
+        cache.put(KIND_HTML, "a", "x")
+        with patch("src.cache.time.time", return_value=time.time() + 30):
+            cache.get(KIND_HTML, "a")
+        before = cache.conn.execute("SELECT accessed_at, created_at FROM cache").fetchone()
+        self.assertEqual(before[0], before[1])
+        cache.close()
+
+        with sqlite3.connect(self.path) as conn:
+            accessed_at, created_at = conn.execute("SELECT accessed_at, created_at FROM cache").fetchone()
+        self.assertGreater(accessed_at, created_at + 20)
+
+
+class TestAsyncCache(unittest.IsolatedAsyncioTestCase):
+    async def test_aio_runs_off_the_event_loop_in_wal_mode(self):
+        """cache.aio는 이벤트 루프 밖의 스레드에서 실행되고, DB는 WAL 모드여야 함."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ContentCache(Path(tmp) / "cache.db")
+            threads = []
+            real_get = cache.get
+
+            def get(kind, key):
+                threads.append(threading.current_thread())
+                return real_get(kind, key)
+
+            with patch.object(cache, "get", side_effect=get):
+                await cache.aio.put_html("https://example.com/a", "<html>a</html>")
+                self.assertEqual(await cache.aio.get_html("https://example.com/a"), "<html>a</html>")
+
+            self.assertNotEqual(threads, [])
+            self.assertTrue(all(t is not threading.main_thread() for t in threads))
+            self.assertEqual(cache.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            cache.close()
+
+
+class TestRetryOnlyFailedStage(unittest.IsolatedAsyncioTestCase):
+    async def test_summary_failure_does_not_refetch_or_reextract(self):
+        """요약 실패 후 재시도할 때 fetch/추출은 다시 하지 않아야 함."""
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "test.db")
+            cache = ContentCache(Path(tmp) / "cache.db")
+            sent = []
+            bot = MagicMock()
+            bot.send_message = AsyncMock(side_effect=lambda **kw: sent.append(kw["text"]))
+            summarizer = MagicMock()
+            summarizer.summarize_ko = AsyncMock(return_value=None)
+            worker = FeedWorker(
+                db=db,
+                bot=bot,
+                summarizer=summarizer,
+                config=WorkerConfig(
+                    channel_id="@test", quiet_start_hour=23, quiet_end_hour=8, telegram_messages_per_minute=60_000
+                ),
+                cache=cache,
+            )
+            entry = {"id": "uid-1", "title": "Test", "link": "https://example.com/p/test"}
+
+            with patch("src.feed_worker.fetch_html", return_value="<html>x</html>") as mock_fetch, \
+                 patch("src.feed_worker.extract_main_text", return_value="본문") as mock_extract:
+                self.assertFalse(await worker._handle_entry(entry))
+                await worker.delivery.drain()
+                summarizer.summarize_ko = AsyncMock(return_value="요약")
+                self.assertTrue(await worker._handle_entry(entry))
+                await worker.delivery.drain()
+                # 같은 글을 다시 처리해도 요약은 캐시에서 나와야 함
+                self.assertTrue(await worker._handle_entry(entry))
+                await worker.delivery.drain()
+
+            self.assertEqual(mock_fetch.call_count, 1)
+            self.assertEqual(mock_extract.call_count, 1)
+            self.assertEqual(summarizer.summarize_ko.call_count, 1)
+            self.assertEqual(len(sent), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
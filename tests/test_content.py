@@ -1,6 +1,8 @@
 import unittest
 
-from src.content import is_probably_paid_substack
+import httpx
+
+from src.content import PaywallScanner, canonical_url, fetch_html, is_probably_paid_substack
 
 
 class PaidSubstackTests(unittest.TestCase):
@@ -24,6 +26,84 @@ class PaidSubstackTests(unittest.TestCase):
             )
         )
 
+    def test_scanner_finds_marker_split_across_chunks(self):
+        scanner = PaywallScanner()
+        self.assertFalse(scanner.feed(b"<div>This post is for pa"))
+        self.assertTrue(scanner.feed(b"ID SUBSCRIBERS</div>"))
+        self.assertFalse(PaywallScanner().feed(b"<p>free public post</p>"))
+
+
+class CanonicalUrlTests(unittest.TestCase):
+    def test_same_article_variants_share_a_key(self):
+        variants = [
+            "https://example.com/2026/01/post",
+            "http://www.Example.com/2026/01/post/",
+            "https://example.com:443/2026/01/post?utm_source=rss&utm_medium=feed#comments",
+            "https://example.com/2026/01/post?fbclid=abc",
+        ]
+        self.assertEqual({canonical_url(u) for u in variants}, {"https://example.com/2026/01/post"})
+
+    def test_meaningful_query_is_kept_and_sorted(self):
+        self.assertEqual(
+            canonical_url("https://example.com/read?p=2&id=7&utm_campaign=x"),
+            "https://example.com/read?id=7&p=2",
+        )
+        self.assertNotEqual(canonical_url("https://example.com/?id=1"), canonical_url("https://example.com/?id=2"))
+
+
+class FetchHtmlTests(unittest.IsolatedAsyncioTestCase):
+    async def _fetch(self, handler, **kwargs):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_html(client, "https://example.com/p/a", **kwargs)
+
+    async def test_returns_decoded_text(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                content="<p>안녕</p>".encode("euc-kr"),
+                headers={"content-type": "text/html; charset=euc-kr"},
+            )
+
+        self.assertEqual(await self._fetch(handler), "<p>안녕</p>")
+
+    async def test_error_status_returns_none(self):
+        self.assertIsNone(await self._fetch(lambda request: httpx.Response(404)))
+
+    async def test_large_body_is_cut_at_cap(self):
+        def handler(request):
+            return httpx.Response(200, content=b"x" * 100_000)
+
+        html = await self._fetch(handler, max_bytes=10_000, max_decoded_bytes=20_000)
+        self.assertIsNotNone(html)
+        self.assertLessEqual(len(html), 20_000)
+        self.assertLess(len(html), 100_000)
+
+    async def test_scanner_aborts_download_at_paywall(self):
+        served = []
+
+        async def body():
+            for i in range(100):
+                served.append(i)
+                yield b"<p>intro</p>" if i != 2 else b'<div class="paywall">'
+
+        scanner = PaywallScanner()
+        html = await self._fetch(lambda request: httpx.Response(200, content=body()), scanner=scanner)
+        self.assertTrue(scanner.matched)
+        self.assertTrue(html.endswith('<div class="paywall">'))
+        self.assertLess(len(served), 10)
+
+    async def test_reports_final_url_after_redirect(self):
+        def handler(request):
+            if request.url.path == "/p/a":
+                return httpx.Response(301, headers={"location": "https://example.com/2026/real-post"})
+            return httpx.Response(200, content=b"<p>ok</p>")
+
+        finals = []
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True) as client:
+            html = await fetch_html(client, "https://example.com/p/a", on_redirect=finals.append)
+        self.assertEqual(html, "<p>ok</p>")
+        self.assertEqual(finals, ["https://example.com/2026/real-post"])
+
 
 if __name__ == "__main__":
     unittest.main()
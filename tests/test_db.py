@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import tempfile
 import unittest
 from pathlib import Path
@@ -29,6 +30,14 @@ class TestEnsureFeed(unittest.TestCase):
         self.assertFalse(added_again)
         self.assertEqual(len(self.db.list_feeds()), 1)
 
+    def test_add_feeds_skips_known_urls(self):
+        """여러 URL을 한 번에 추가하고, 이미 있는 URL은 건너뛰어야 함."""
+        self.db.add_feed("https://a.example.com/feed")
+        urls = ["https://a.example.com/feed", "https://b.example.com/feed", "https://c.example.com/feed"]
+        added = self.db.add_feeds(urls)
+        self.assertEqual(added, ["https://b.example.com/feed", "https://c.example.com/feed"])
+        self.assertEqual(len(self.db.list_feeds()), 3)
+
     def test_ensure_feed_active_by_default(self):
         """시딩된 피드는 active 상태여야 함."""
         self.db.ensure_feed("https://example.com/feed")
@@ -45,5 +54,151 @@ class TestEnsureFeed(unittest.TestCase):
         self.assertEqual(len(feeds), 0)  # paused 상태 유지
 
 
+class TestFeedValidators(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "test.db"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_update_feed_validators(self):
+        """ETag/Last-Modified/본문 해시가 저장되고 다시 읽혀야 함."""
+        db = Database(self.path)
+        feed_id = db.add_feed("https://example.com/feed")
+        db.update_feed_validators(feed_id, '"abc"', "Mon, 01 Jan 2026 00:00:00 GMT", "deadbeef")
+        feed = db.active_feeds()[0]
+        self.assertEqual(feed.etag, '"abc"')
+        self.assertEqual(feed.last_modified, "Mon, 01 Jan 2026 00:00:00 GMT")
+        self.assertEqual(feed.content_hash, "deadbeef")
+
+    def test_old_schema_is_migrated(self):
+        """검증값 컬럼이 없는 기존 DB도 열 수 있어야 함."""
+        import sqlite3
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE feeds (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE NOT NULL, "
+            "paused INTEGER NOT NULL DEFAULT 0, created_at TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO feeds (url, paused, created_at) VALUES ('https://old.example.com/rss', 0, 'x')")
+        conn.commit()
+        conn.close()
+
+        feeds = Database(self.path).list_feeds()
+        self.assertEqual(len(feeds), 1)
+        self.assertIsNone(feeds[0].etag)
+
+
+class TestBulkEntries(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self._tmp.name) / "test.db")
+        self.feed_id = self.db.add_feed("https://example.com/feed")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_unseen_entry_uids_preserves_order(self):
+        """seen이 아닌 UID만 입력 순서대로 반환해야 함."""
+        self.db.mark_entry_seen(self.feed_id, "b")
+        self.assertEqual(self.db.unseen_entry_uids(self.feed_id, ["c", "b", "a", "c"]), ["c", "a"])
+
+    def test_mark_entries_seen_many(self):
+        """여러 UID를 한 번에 seen 처리하고, 청크 경계를 넘어도 조회돼야 함."""
+        uids = [f"uid-{i}" for i in range(1200)]
+        self.db.mark_entries_seen(self.feed_id, uids[:1100])
+        self.db.mark_entries_seen(self.feed_id, uids[:10])  # 중복은 무시
+        self.assertEqual(self.db.unseen_entry_uids(self.feed_id, uids), uids[1100:])
+
+    def test_entries_are_scoped_per_feed(self):
+        """다른 피드의 seen 기록은 영향을 주지 않아야 함."""
+        other = self.db.add_feed("https://other.example.com/feed")
+        self.db.mark_entries_seen(other, ["x"])
+        self.assertEqual(self.db.unseen_entry_uids(self.feed_id, ["x"]), ["x"])
+
+
+class TestEntryRetention(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "test.db"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_prune_keeps_entries_still_in_feed_or_recent(self):
+        """오래됐고 피드에서 사라진 항목만 삭제해야 함."""
+        import time
+        db = Database(self.path)
+        feed_id = db.add_feed("https://example.com/feed")
+        db.mark_entries_seen(feed_id, ["gone", "still-listed"])
+        removed = db.prune_entries(feed_id, ["still-listed"], older_than=time.time() + 10)
+        self.assertEqual(removed, 1)
+        self.assertEqual(db.unseen_entry_uids(feed_id, ["gone", "still-listed"]), ["gone"])
+
+        db.mark_entries_seen(feed_id, ["fresh"])
+        self.assertEqual(db.prune_entries(feed_id, [], older_than=time.time() - 3600), 0)
+
+    def test_remove_feed_drops_its_entries(self):
+        """피드를 삭제하면 seen 기록도 함께 삭제돼야 함."""
+        db = Database(self.path)
+        feed_id = db.add_feed("https://example.com/feed")
+        db.mark_entries_seen(feed_id, ["a", "b"])
+        db.remove_feed(feed_id)
+        self.assertEqual(db.entry_count(), 0)
+
+    def test_old_entries_table_is_migrated(self):
+        """UID 텍스트를 저장하던 기존 entries 테이블은 해시 키로 옮겨져야 함."""
+        import sqlite3
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE feeds (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE NOT NULL, "
+            "paused INTEGER NOT NULL DEFAULT 0, created_at TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE entries (id INTEGER PRIMARY KEY AUTOINCREMENT, feed_id INTEGER NOT NULL, "
+            "entry_uid TEXT NOT NULL, created_at TEXT NOT NULL, UNIQUE(feed_id, entry_uid))"
+        )
+        conn.execute("INSERT INTO feeds (url, paused, created_at) VALUES ('https://old.example.com/rss', 0, 'x')")
+        conn.execute("INSERT INTO entries (feed_id, entry_uid, created_at) VALUES (1, 'old-uid', 'x')")
+        conn.commit()
+        conn.close()
+
+        db = Database(self.path)
+        self.assertTrue(db.seen_entry(1, "old-uid"))
+        tables = {r[0] for r in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertNotIn("entries", tables)
+        self.assertEqual(db.conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestAsyncDatabase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self._tmp.name) / "test.db")
+
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+
+    def test_wal_mode_enabled(self):
+        """WAL 저널 모드와 NORMAL 동기화 수준이 설정되어야 함."""
+        self.assertEqual(self.db.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(self.db.conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+
+    async def test_async_writes_visible_to_readers(self):
+        """aio로 쓴 내용이 동시 읽기에서 보여야 함."""
+        feed_id = await self.db.aio.add_feed("https://example.com/feed")
+        await self.db.aio.mark_entries_seen(feed_id, [f"uid-{i}" for i in range(100)])
+        results = await asyncio.gather(
+            *(self.db.aio.unseen_entry_uids(feed_id, ["uid-1", "new"]) for _ in range(8))
+        )
+        self.assertEqual(results, [["new"]] * 8)
+        self.assertEqual([f.id for f in await self.db.aio.list_feeds()], [feed_id])
+
+    async def test_only_marked_methods_are_exposed(self):
+        """읽기/쓰기로 표시되지 않은 메서드는 aio에 노출되지 않아야 함."""
+        with self.assertRaises(AttributeError):
+            self.db.aio.close
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from telegram.error import BadRequest, RetryAfter, TimedOut
+
+from src.db import Database
+from src.delivery import DeliveryLoop
+
+
+class TestDeliveryLoop(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self._tmp.name) / "test.db")
+        self.sent: list[str] = []
+        self.bot = MagicMock()
+        self.bot.send_message = AsyncMock(side_effect=lambda **kw: self.sent.append(kw["text"]))
+        self.loop = DeliveryLoop(self.db, self.bot, messages_per_minute=60_000, burst=10)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_sends_in_order_and_empties_outbox(self):
+        """outbox의 메시지는 넣은 순서대로 전송되고 삭제돼야 함."""
+        for i in range(3):
+            self.db.enqueue_message("@test", f"m{i}")
+        self.assertEqual(await self.loop.drain(), 3)
+        self.assertEqual(self.sent, ["m0", "m1", "m2"])
+        self.assertEqual(self.db.outbox_size(), 0)
+
+    async def test_retry_after_pauses_and_keeps_message(self):
+        """RetryAfter를 받으면 메시지를 잃지 않고 대기 후 같은 순서로 재전송해야 함."""
+        self.db.enqueue_message("@test", "m0")
+        self.db.enqueue_message("@test", "m1")
+        calls = []
+
+        async def flaky(**kw):
+            calls.append(kw["text"])
+            if len(calls) == 1:
+                raise RetryAfter(0)
+            self.sent.append(kw["text"])
+
+        self.bot.send_message = AsyncMock(side_effect=flaky)
+        self.assertEqual(await self.loop.drain(), 0)
+        self.assertEqual(self.db.outbox_size(), 2)
+        self.assertEqual(await self.loop.drain(), 2)
+        self.assertEqual(self.sent, ["m0", "m1"])
+
+    async def test_network_error_backs_off_and_keeps_order(self):
+        """네트워크 오류 후 대기했다가 재전송할 때도 앞 메시지가 먼저 나가야 함."""
+        for i in range(3):
+            self.db.enqueue_message("@test", f"m{i}")
+        calls = []
+
+        async def flaky(**kw):
+            calls.append(kw["text"])
+            if len(calls) == 1:
+                raise TimedOut()
+            self.sent.append(kw["text"])
+
+        self.bot.send_message = AsyncMock(side_effect=flaky)
+        with patch("src.delivery._backoff", return_value=0.05):
+            self.assertEqual(await self.loop.drain(), 0)
+            self.assertEqual(self.db.outbox_size(), 3)
+            self.assertEqual(await self.loop.drain(), 3)
+        self.assertEqual(self.sent, ["m0", "m1", "m2"])
+
+    async def test_rejected_message_dropped_after_max_attempts(self):
+        """Telegram이 거부한 메시지는 최대 시도 후 버리고 나머지는 계속 보내야 함."""
+        self.loop.max_attempts = 1
+        self.db.enqueue_message("@test", "bad")
+        self.db.enqueue_message("@test", "good")
+
+        async def reject_bad(**kw):
+            if kw["text"] == "bad":
+                raise BadRequest("can't parse entities")
+            self.sent.append(kw["text"])
+
+        self.bot.send_message = AsyncMock(side_effect=reject_bad)
+        self.assertEqual(await self.loop.drain(), 1)
+        self.assertEqual(self.sent, ["good"])
+        self.assertEqual(self.db.outbox_size(), 0)
+
+    async def test_held_messages_released_in_order_with_spacing(self):
+        """조용한 시간에 보류된 메시지는 해제 시각부터 간격을 두고 순서대로 나가고, 이후 메시지는 그 뒤에 서야 함."""
+        release = time.time() + 3600
+        for i in range(3):
+            self.db.enqueue_message("@test", f"held{i}", release_at=release, spacing_seconds=20)
+        self.db.enqueue_message("@test", "later")
+
+        self.assertEqual(await self.loop.drain(), 0)
+        self.assertEqual(self.db.held_message_count(time.time()), 4)
+        self.assertEqual(self.db.next_message_due_at(), release)
+
+        with patch("src.delivery.time.time", return_value=release + 20):
+            self.assertEqual(await self.loop.drain(), 2)
+        self.assertEqual(self.sent, ["held0", "held1"])
+        with patch("src.delivery.time.time", return_value=release + 60):
+            self.assertEqual(await self.loop.drain(), 2)
+        self.assertEqual(self.sent, ["held0", "held1", "held2", "later"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+import unittest
+
+from src.extraction import ExtractionPool
+
+
+def _upper(url: str, html: str | None) -> str:
+    return (html or "").upper()
+
+
+def _hang(url: str, html: str | None) -> str:
+    time.sleep(30)
+    return "never"
+
+
+class TestExtractionPool(unittest.IsolatedAsyncioTestCase):
+    async def test_thread_mode(self):
+        """processes=0이면 스레드에서 실행해야 함."""
+        pool = ExtractionPool(processes=0)
+        self.assertEqual(await pool.extract("u", "<p>a</p>", _upper), "<P>A</P>")
+        self.assertEqual(await pool.extract("u", None, _upper), "")
+
+    async def test_process_mode_runs_in_parallel(self):
+        """프로세스 풀에서 여러 문서를 동시에 추출해야 함."""
+        import asyncio
+        pool = ExtractionPool(processes=2, timeout_seconds=30)
+        try:
+            results = await asyncio.gather(*(pool.extract("u", f"doc{i}", _upper) for i in range(4)))
+            self.assertEqual(results, [f"DOC{i}" for i in range(4)])
+        finally:
+            pool.close()
+
+    async def test_timeout_restarts_pool(self):
+        """제한 시간을 넘긴 문서는 빈 문자열을 반환하고, 풀은 다시 쓸 수 있어야 함."""
+        pool = ExtractionPool(processes=1, timeout_seconds=3)
+        try:
+            self.assertEqual(await pool.extract("u", "x", _hang), "")
+            self.assertEqual(await pool.extract("u", "ok", _upper), "OK")
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
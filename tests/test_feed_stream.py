@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import calendar
+import unittest
+
+import feedparser
+
+from src.feed_stream import EntryStream, FeedStreamError
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>
+<title>Blog</title>
+<item><title>First &amp; best</title><link>https://example.com/p/1</link><guid>uid-1</guid>
+<pubDate>Mon, 05 Jan 2026 10:00:00 +0900</pubDate><content:encoded><![CDATA[<p>body</p>]]></content:encoded></item>
+<item><title>Second</title><link>https://example.com/p/2</link></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Blog</title>
+<entry><title>Atom post</title><id>tag:example.com,2026:1</id>
+<link rel="replies" href="https://example.com/p/1#comments"/><link href="https://example.com/p/1"/>
+<updated>2026-01-05T01:00:00Z</updated></entry>
+</feed>"""
+
+BASE_URL = "https://example.com/blog/feed.xml"
+
+RELATIVE_RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Blog</title>
+<item><title>Relative</title><link>/post/1</link><guid isPermaLink="false">g1</guid></item>
+<item><title>Guid only</title><guid>https://example.com/p/2</guid></item>
+<item><title>Opaque guid</title><guid isPermaLink="false">x-3</guid></item>
+</channel></rss>"""
+
+XML_BASE_ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:base="https://cdn.example.net/base/"><title>Blog</title>
+<entry><title>One</title><id>tag:a,1</id><link href="posts/1"/></entry>
+<entry xml:base="/other/"><title>Two</title><id>tag:a,2</id><link href="2.html"/></entry>
+<entry><title>Three</title><id>tag:a,3</id><link href="https://abs.example.org/x"/></entry>
+</feed>"""
+
+
+class TestEntryStream(unittest.TestCase):
+    def test_rss_entries(self):
+        """RSS item을 feedparser와 같은 키의 dict로 읽어야 함."""
+        entries = EntryStream(RSS).read(10)
+        self.assertEqual([e["title"] for e in entries], ["First & best", "Second"])
+        self.assertEqual(entries[0]["id"], "uid-1")
+        self.assertEqual(entries[1]["link"], "https://example.com/p/2")
+        self.assertNotIn("id", entries[1])
+        self.assertEqual(calendar.timegm(entries[0]["published_parsed"]), 1767574800)
+
+    def test_atom_entries_use_alternate_link(self):
+        """Atom entry는 alternate 링크와 updated 시각을 사용해야 함."""
+        (entry,) = EntryStream(ATOM).read(10)
+        self.assertEqual(entry["id"], "tag:example.com,2026:1")
+        self.assertEqual(entry["link"], "https://example.com/p/1")
+        self.assertEqual(calendar.timegm(entry["updated_parsed"]), 1767574800)
+
+    def test_extension_elements_do_not_override_core_fields(self):
+        """itunes:title 같은 확장 요소가 item의 title/link/guid를 덮어쓰면 안 됨."""
+        doc = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"
+ xmlns:media="http://search.yahoo.com/mrss/"><channel><title>Podcast</title><itunes:title>Show</itunes:title>
+<item><title>Real &amp; title</title><itunes:title>Ep 5</itunes:title><media:title>Cover</media:title>
+<link>https://example.com/ep/5</link><guid>ep-5</guid></item>
+</channel></rss>"""
+        stream = EntryStream(doc)
+        (entry,) = stream.read(10)
+        self.assertEqual(entry["title"], "Real & title")
+        self.assertEqual(entry["link"], "https://example.com/ep/5")
+        self.assertEqual(entry["id"], "ep-5")
+        self.assertEqual(stream.title, "Podcast")
+
+    def test_links_match_feedparser(self):
+        """상대 링크(xml:base, 피드 URL 기준)와 permalink guid 처리가 feedparser와 같아야 함."""
+        headers = {"content-location": BASE_URL, "content-type": "application/xml"}
+        for doc in (RELATIVE_RSS, XML_BASE_ATOM):
+            expected = [(e.get("id"), e.get("link")) for e in feedparser.parse(doc, response_headers=headers).entries]
+            streamed = [(e.get("id"), e.get("link")) for e in EntryStream(doc, base_url=BASE_URL).read(10)]
+            self.assertEqual(streamed, expected)
+        self.assertEqual(EntryStream(RELATIVE_RSS, base_url=BASE_URL).read(1)[0]["link"], "https://example.com/post/1")
+
+    def test_feed_title(self):
+        """채널/피드 제목은 항목 제목과 구분해 title에 담아야 함."""
+        for doc in (RSS, ATOM):
+            stream = EntryStream(doc)
+            stream.read(10)
+            self.assertEqual(stream.title, "Blog")
+
+    def test_reads_lazily(self):
+        """앞쪽 항목만 요청하면 문서 전체를 파싱하지 않아야 함."""
+        items = b"".join(b"<item><guid>uid-%d</guid><description>%s</description></item>" % (i, b"x" * 1000)
+                         for i in range(1000))
+        doc = b"<rss><channel>" + items + b"</channel></rss>"
+        stream = EntryStream(doc, chunk_size=4096)
+        self.assertEqual([e["id"] for e in stream.read(3)], ["uid-0", "uid-1", "uid-2"])
+        self.assertLess(stream._offset, len(doc) // 10)
+        self.assertFalse(stream.done)
+
+    def test_rejects_malformed_and_non_feed_documents(self):
+        """깨진 XML이나 RSS/Atom이 아닌 문서는 FeedStreamError를 내야 함."""
+        with self.assertRaises(FeedStreamError):
+            EntryStream(b"<rss><channel><item>").read(10)
+        with self.assertRaises(FeedStreamError):
+            EntryStream(b"<html><body>not a feed</body></html>").read(10)
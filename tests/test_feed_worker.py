@@ -6,7 +6,9 @@ from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.db import Database
-from src.feed_worker import FeedWorker, WorkerConfig
+from src.feed_stream import EntryStream
+from src.feed_worker import FeedWorker, WorkerConfig, pack_messages
+from src.fetcher import FeedFetchResult
 
 
 def _make_worker(db: Database, sent_messages: list) -> FeedWorker:
@@ -14,9 +16,11 @@ def _make_worker(db: Database, sent_messages: list) -> FeedWorker:
     bot.send_message = AsyncMock(side_effect=lambda **kw: sent_messages.append(kw["text"]))
 
     summarizer = MagicMock()
-    summarizer.summarize_ko = MagicMock(return_value="요약 내용")
+    summarizer.summarize_ko = AsyncMock(return_value="요약 내용")
 
-    config = WorkerConfig(channel_id="@test", quiet_start_hour=23, quiet_end_hour=8)
+    config = WorkerConfig(
+        channel_id="@test", quiet_start_hour=23, quiet_end_hour=8, telegram_messages_per_minute=60_000
+    )
     return FeedWorker(db=db, bot=bot, summarizer=summarizer, config=config)
 
 
@@ -24,6 +28,10 @@ def _make_db(tmp_path: Path) -> Database:
     return Database(tmp_path / "test.db")
 
 
+def _fetched(url: str = "https://example.com/feed") -> FeedFetchResult:
+    return FeedFetchResult(url=url, status_code=200, content=b"<rss></rss>")
+
+
 class TestMarkEntrySeenOnlyOnSuccess(unittest.IsolatedAsyncioTestCase):
     async def test_entry_not_marked_seen_when_summarizer_fails(self):
         """요약 실패 시 entry를 seen 처리하지 않아서 다음에 재시도 가능해야 함."""
@@ -35,7 +43,7 @@ class TestMarkEntrySeenOnlyOnSuccess(unittest.IsolatedAsyncioTestCase):
 
             sent = []
             worker = _make_worker(db, sent)
-            worker.summarizer.summarize_ko = MagicMock(return_value=None)  # 요약 실패
+            worker.summarizer.summarize_ko = AsyncMock(return_value=None)  # 요약 실패
 
             entry = {"id": "uid-1", "title": "Test", "link": "https://example.com/p/test"}
             html_doc = "<html><body>Some article text here</body></html>"
@@ -43,6 +51,7 @@ class TestMarkEntrySeenOnlyOnSuccess(unittest.IsolatedAsyncioTestCase):
             with patch("src.feed_worker.fetch_html", return_value=html_doc), \
                  patch("src.feed_worker.extract_main_text", return_value="본문 내용"):
                 result = await worker._handle_entry(entry)
+                await worker.delivery.drain()
 
             self.assertFalse(result)
             self.assertEqual(sent, [])
@@ -66,6 +75,7 @@ class TestMarkEntrySeenOnlyOnSuccess(unittest.IsolatedAsyncioTestCase):
             with patch("src.feed_worker.fetch_html", return_value=html_doc), \
                  patch("src.feed_worker.extract_main_text", return_value="본문 내용"):
                 result = await worker._handle_entry(entry)
+                await worker.delivery.drain()
 
             self.assertTrue(result)
             self.assertEqual(len(sent), 1)
@@ -94,10 +104,12 @@ class TestNewestEntriesProcessedFirst(unittest.IsolatedAsyncioTestCase):
             mock_parsed.bozo = False
             mock_parsed.entries = entries
 
-            with patch("src.feed_worker.feedparser.parse", return_value=mock_parsed), \
+            with patch("src.feed_worker.fetch_feed", return_value=_fetched()), \
+                 patch("src.feed_worker.feedparser.parse", return_value=mock_parsed), \
                  patch("src.feed_worker.fetch_html", return_value="<html><body>text</body></html>"), \
                  patch("src.feed_worker.extract_main_text", return_value="본문"):
                 await worker._process_feed(feed)
+                await worker.delivery.drain()
 
             self.assertEqual(len(sent), 1)
             self.assertIn("Article 0", sent[0])
@@ -121,10 +133,12 @@ class TestNewestEntriesProcessedFirst(unittest.IsolatedAsyncioTestCase):
             mock_parsed.bozo = False
             mock_parsed.entries = entries
 
-            with patch("src.feed_worker.feedparser.parse", return_value=mock_parsed), \
+            with patch("src.feed_worker.fetch_feed", return_value=_fetched()), \
+                 patch("src.feed_worker.feedparser.parse", return_value=mock_parsed), \
                  patch("src.feed_worker.fetch_html", return_value="<html><body>text</body></html>"), \
                  patch("src.feed_worker.extract_main_text", return_value="본문"):
                 await worker._process_feed(feed)
+                await worker.delivery.drain()
 
             self.assertEqual(len(sent), 5)
             # 오래된 것(4)부터 최신(0) 순으로 전송
@@ -150,9 +164,11 @@ class TestProcessFeedBozoLogging(unittest.IsolatedAsyncioTestCase):
             broken_result.get = lambda k, d=None: Exception("SSL error") if k == "bozo_exception" else d
             broken_result.entries = []
 
-            with patch("src.feed_worker.feedparser.parse", return_value=broken_result), \
+            with patch("src.feed_worker.fetch_feed", return_value=_fetched(feed.url)), \
+                 patch("src.feed_worker.feedparser.parse", return_value=broken_result), \
                  patch("src.feed_worker.logger") as mock_logger:
                 await worker._process_feed(feed)
+                await worker.delivery.drain()
 
             mock_logger.warning.assert_called_once()
             self.assertEqual(sent, [])
@@ -173,10 +189,650 @@ class TestProcessFeedBozoLogging(unittest.IsolatedAsyncioTestCase):
             mock_parsed.bozo = False
             mock_parsed.entries = [{"id": "uid-already-seen", "title": "Old", "link": "https://example.com/p/old"}]
 
-            with patch("src.feed_worker.feedparser.parse", return_value=mock_parsed):
+            with patch("src.feed_worker.fetch_feed", return_value=_fetched()), \
+                 patch("src.feed_worker.feedparser.parse", return_value=mock_parsed):
+                await worker._process_feed(feed)
+                await worker.delivery.drain()
+
+            self.assertEqual(sent, [])
+
+
+class TestConcurrentPolling(unittest.IsolatedAsyncioTestCase):
+    async def test_per_host_concurrency_is_capped(self):
+        """같은 호스트의 피드는 per-host 한도 이상 동시에 가져오지 않아야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            for i in range(6):
+                db.add_feed(f"https://same.example.com/feed{i}")
+            for i in range(6):
+                db.add_feed(f"https://host{i}.example.com/feed")
+
+            sent = []
+            worker = _make_worker(db, sent)
+            worker.config.feed_per_host_concurrency = 2
+            worker.config.feed_concurrency = 8
+            from src.fetcher import HostLimiter
+            worker._limiter = HostLimiter(8, 2)
+
+            in_flight: dict[str, int] = {}
+            peak: dict[str, int] = {}
+            total = {"now": 0, "peak": 0}
+
+            async def fake_fetch(client, url, **kwargs):
+                host = url.split("/")[2]
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+                total["now"] += 1
+                total["peak"] = max(total["peak"], total["now"])
+                await asyncio.sleep(0.01)
+                in_flight[host] -= 1
+                total["now"] -= 1
+                return _fetched(url)
+
+            empty = MagicMock()
+            empty.bozo = False
+            empty.entries = []
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False), \
+                 patch("src.feed_worker.fetch_feed", side_effect=fake_fetch), \
+                 patch("src.feed_worker.feedparser.parse", return_value=empty):
+                await worker.run_once()
+                await worker.delivery.drain()
+
+            self.assertEqual(peak["same.example.com"], 2)
+            self.assertGreater(total["peak"], 2)
+            self.assertLessEqual(total["peak"], 8)
+
+    async def test_fetch_error_logs_warning(self):
+        """HTTP 오류 시 경고 로그 후 파싱 없이 스킵해야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://broken.example.com/feed")
+            feed = db.active_feeds()[0]
+
+            sent = []
+            worker = _make_worker(db, sent)
+            failed = FeedFetchResult(url=feed.url, status_code=503, content=b"")
+
+            with patch("src.feed_worker.fetch_feed", return_value=failed), \
+                 patch("src.feed_worker.feedparser.parse") as mock_parse, \
+                 patch("src.feed_worker.logger") as mock_logger:
+                await worker._process_feed(feed)
+                await worker.delivery.drain()
+
+            mock_parse.assert_not_called()
+            mock_logger.warning.assert_called_once()
+            self.assertEqual(sent, [])
+
+
+class TestConditionalGet(unittest.IsolatedAsyncioTestCase):
+    async def test_validators_sent_and_304_skips_parse(self):
+        """저장된 ETag/Last-Modified를 보내고 304면 파싱하지 않아야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            feed_id = db.add_feed("https://example.com/feed")
+            db.update_feed_validators(feed_id, '"v1"', "Wed, 01 Jan 2026 00:00:00 GMT", "abc")
+            feed = db.active_feeds()[0]
+
+            sent = []
+            worker = _make_worker(db, sent)
+            not_modified = FeedFetchResult(url=feed.url, status_code=304, content=b"")
+
+            with patch("src.feed_worker.fetch_feed", return_value=not_modified) as mock_fetch, \
+                 patch("src.feed_worker.feedparser.parse") as mock_parse:
+                await worker._process_feed(feed)
+                await worker.delivery.drain()
+
+            kwargs = mock_fetch.call_args.kwargs
+            self.assertEqual(kwargs["etag"], '"v1"')
+            self.assertEqual(kwargs["last_modified"], "Wed, 01 Jan 2026 00:00:00 GMT")
+            mock_parse.assert_not_called()
+
+    async def test_unchanged_body_hash_skips_parse(self):
+        """본문 해시가 같으면 파싱하지 않아야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            feed_id = db.add_feed("https://example.com/feed")
+            db.update_feed_validators(feed_id, None, None, _fetched().content_hash)
+            feed = db.active_feeds()[0]
+
+            worker = _make_worker(db, [])
+            with patch("src.feed_worker.fetch_feed", return_value=_fetched()), \
+                 patch("src.feed_worker.feedparser.parse") as mock_parse:
+                await worker._process_feed(feed)
+                await worker.delivery.drain()
+
+            mock_parse.assert_not_called()
+
+    async def test_validators_stored_only_when_all_entries_handled(self):
+        """요약 실패로 남은 글이 있으면 검증값을 저장하지 않아 다음 주기에 재시도돼야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://example.com/feed")
+            feed = db.active_feeds()[0]
+
+            worker = _make_worker(db, [])
+            worker.summarizer.summarize_ko = AsyncMock(return_value=None)
+
+            mock_parsed = MagicMock()
+            mock_parsed.bozo = False
+            mock_parsed.entries = [{"id": "uid-1", "title": "A", "link": "https://example.com/p/1"}]
+            fetched = FeedFetchResult(
+                url=feed.url, status_code=200, content=b"<rss></rss>", headers={"etag": '"v2"'}
+            )
+
+            with patch("src.feed_worker.fetch_feed", return_value=fetched), \
+                 patch("src.feed_worker.feedparser.parse", return_value=mock_parsed), \
+                 patch("src.feed_worker.fetch_html", return_value="<html></html>"), \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker._process_feed(feed)
+                await worker.delivery.drain()
+                self.assertIsNone(db.active_feeds()[0].etag)
+
+                worker.summarizer.summarize_ko = AsyncMock(return_value="요약")
+                await worker._process_feed(db.active_feeds()[0])
+                await worker.delivery.drain()
+
+            stored = db.active_feeds()[0]
+            self.assertEqual(stored.etag, '"v2"')
+            self.assertEqual(stored.content_hash, fetched.content_hash)
+
+
+class TestStagedPipeline(unittest.IsolatedAsyncioTestCase):
+    async def test_pipeline_overlaps_summaries_and_keeps_feed_order(self):
+        """요약이 병렬로 진행돼도 피드별 전송 순서는 오래된 글부터 유지돼야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://a.example.com/feed")
+            db.add_feed("https://b.example.com/feed")
+
+            sent = []
+            worker = _make_worker(db, sent)
+            worker.config.summarize_workers = 4
+
+            active = {"now": 0, "peak": 0}
+
+            async def slow_summary(title, link, text):
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+                # 오래된 글일수록 오래 걸리게 해서 완료 순서를 뒤집음
+                await asyncio.sleep(0.02 * int(title.split()[-1]))
+                active["now"] -= 1
+                return f"요약 {title}"
+
+            worker.summarizer.summarize_ko = AsyncMock(side_effect=slow_summary)
+
+            def parsed_for(url, **kwargs):
+                host = url.split("/")[2][0]
+                parsed = MagicMock()
+                parsed.bozo = False
+                parsed.entries = [
+                    {"id": f"{host}-{i}", "title": f"{host.upper()} {i}", "link": f"https://{host}.example.com/p/{i}"}
+                    for i in range(4)
+                ]
+                return parsed
+
+            async def fake_fetch(client, url, **kwargs):
+                return FeedFetchResult(url=url, status_code=200, content=url.encode())
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False), \
+                 patch("src.feed_worker.fetch_feed", side_effect=fake_fetch), \
+                 patch("src.feed_worker.feedparser.parse", side_effect=lambda content, **kw: parsed_for(content.decode())), \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker.run_once()
+                await worker.delivery.drain()
+
+            self.assertEqual(len(sent), 8)
+            self.assertGreater(active["peak"], 1)
+            for host in ("A", "B"):
+                order = [m.split("</b>")[0].removeprefix("<b>") for m in sent if m.startswith(f"<b>{host} ")]
+                self.assertEqual(order, [f"{host} {i}" for i in range(3, -1, -1)])
+            feed_ids = [f.id for f in db.active_feeds()]
+            self.assertEqual(db.unseen_entry_uids(feed_ids[0], ["a-0", "a-3"]), [])
+
+    async def test_failed_entry_does_not_block_later_entries(self):
+        """중간 글의 요약이 실패해도 뒤의 글은 전송되고, 실패한 글만 seen 처리되지 않아야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://example.com/feed")
+            feed = db.active_feeds()[0]
+
+            sent = []
+            worker = _make_worker(db, sent)
+            worker.summarizer.summarize_ko = AsyncMock(
+                side_effect=lambda title, link, text: None if title == "Article 1" else "요약"
+            )
+            mock_parsed = MagicMock()
+            mock_parsed.bozo = False
+            mock_parsed.entries = [
+                {"id": f"uid-{i}", "title": f"Article {i}", "link": f"https://example.com/p/{i}"} for i in range(3)
+            ]
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False), \
+                 patch("src.feed_worker.fetch_feed", return_value=_fetched()), \
+                 patch("src.feed_worker.feedparser.parse", return_value=mock_parsed), \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker.run_once()
+                await worker.delivery.drain()
+
+            self.assertEqual(len(sent), 2)
+            self.assertIn("Article 2", sent[0])
+            self.assertIn("Article 0", sent[1])
+            self.assertEqual(db.unseen_entry_uids(feed.id, ["uid-0", "uid-1", "uid-2"]), ["uid-1"])
+            self.assertIsNone(db.active_feeds()[0].content_hash)
+
+    async def test_db_error_during_delivery_does_not_hang_the_cycle(self):
+        """전송 후 DB 기록이 실패해도 주기가 멈추지 않고 다음 글을 계속 처리해야 함."""
+        import sqlite3
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://example.com/feed")
+            feed = db.active_feeds()[0]
+
+            sent = []
+            worker = _make_worker(db, sent)
+            mock_parsed = MagicMock()
+            mock_parsed.bozo = False
+            mock_parsed.entries = [
+                {"id": f"uid-{i}", "title": f"Article {i}", "link": f"https://example.com/p/{i}"} for i in range(3)
+            ]
+            real_mark = db.mark_entry_seen
+            failures = []
+
+            def flaky_mark(feed_id, uid):
+                if not failures:
+                    failures.append(uid)
+                    raise sqlite3.OperationalError("disk I/O error")
+                return real_mark(feed_id, uid)
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False), \
+                 patch("src.feed_worker.fetch_feed", return_value=_fetched()), \
+                 patch("src.feed_worker.feedparser.parse", return_value=mock_parsed), \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"), \
+                 patch.object(db, "mark_entry_seen", side_effect=flaky_mark):
+                await asyncio.wait_for(worker.run_once(), 5)
+                await worker.delivery.drain()
+
+            self.assertEqual(len(sent), 3)
+            self.assertEqual(db.unseen_entry_uids(feed.id, ["uid-0", "uid-1", "uid-2"]), failures)
+            self.assertIsNone(db.active_feeds()[0].content_hash)
+
+
+class TestPaywallSkip(unittest.IsolatedAsyncioTestCase):
+    async def test_paid_title_skips_article_download(self):
+        """제목만으로 유료 글이 확실하면 본문을 내려받지 않고 건너뛰어야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            sent = []
+            worker = _make_worker(db, sent)
+            entry = {"id": "uid-1", "title": "Paid subscribers only", "link": "https://abc.substack.com/p/x"}
+
+            with patch("src.feed_worker.fetch_html") as mock_fetch:
+                result = await worker._handle_entry(entry)
+                await worker.delivery.drain()
+
+            self.assertTrue(result)
+            mock_fetch.assert_not_called()
+            self.assertEqual(sent, [])
+
+
+class TestFeedFailures(unittest.IsolatedAsyncioTestCase):
+    async def test_backoff_grows_then_degrades_and_recovers(self):
+        """연속 실패 시 재시도 간격이 지수적으로 늘고, 임계치에서 degraded, 성공하면 초기화돼야 함."""
+        import tempfile, time
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://down.example.com/feed")
+            worker = _make_worker(db, [])
+            worker.config.poll_jitter = 0
+            worker.config.feed_retry_base_minutes = 5
+            worker.config.feed_degraded_after_errors = 3
+            failed = FeedFetchResult(url="https://down.example.com/feed", status_code=503, content=b"")
+
+            delays = []
+            with patch("src.feed_worker.fetch_feed", return_value=failed):
+                for _ in range(3):
+                    await worker._process_feed(db.active_feeds()[0])
+                    feed = db.active_feeds()[0]
+                    delays.append(round((feed.next_retry_at - time.time()) / 60))
+
+            self.assertEqual(delays[:2], [5, 10])
+            self.assertEqual(delays[2], worker.config.feed_retry_max_minutes)
+            self.assertEqual(feed.consecutive_errors, 3)
+            self.assertTrue(feed.degraded)
+            self.assertEqual(feed.last_error, "HTTP 503")
+            self.assertEqual(feed.due_at, feed.next_retry_at)
+
+            with patch("src.feed_worker.fetch_feed", return_value=_fetched(feed.url)):
                 await worker._process_feed(feed)
+            feed = db.active_feeds()[0]
+            self.assertEqual(feed.consecutive_errors, 0)
+            self.assertFalse(feed.degraded)
+            self.assertIsNone(feed.next_retry_at)
+
+    async def test_run_once_skips_feeds_in_backoff(self):
+        """백오프 중인 피드는 수동 실행에서도 건너뛰어야 함."""
+        import tempfile, time
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            down = db.add_feed("https://down.example.com/feed")
+            db.add_feed("https://up.example.com/feed")
+            db.record_feed_failure(down, "HTTP 500", time.time() + 600, degraded=False)
+            worker = _make_worker(db, [])
+
+            polled = []
+
+            async def fake_fetch(client, url, **kwargs):
+                polled.append(url)
+                return FeedFetchResult(url=url, status_code=304, content=b"")
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False), \
+                 patch("src.feed_worker.fetch_feed", side_effect=fake_fetch):
+                await worker.run_once()
+
+            self.assertEqual(polled, ["https://up.example.com/feed"])
+
+
+class TestCrossFeedDedupe(unittest.IsolatedAsyncioTestCase):
+    async def test_same_article_in_two_feeds_is_processed_once(self):
+        """여러 피드에 같은 글(추적 파라미터만 다름)이 있으면 한 번만 요약·전송하고 이후 주기에도 건너뛰어야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://blog.example.com/feed")
+            db.add_feed("https://aggregator.example.net/feed")
 
+            sent = []
+            worker = _make_worker(db, sent)
+            links = {
+                "https://blog.example.com/feed": "https://blog.example.com/post?utm_source=rss",
+                "https://aggregator.example.net/feed": "http://www.blog.example.com/post/",
+                "https://mirror.example.org/feed": "https://blog.example.com/post#top",
+            }
+
+            def parsed_for(url):
+                parsed = MagicMock()
+                parsed.bozo = False
+                parsed.entries = [{"id": f"{url}#1", "title": "Same post", "link": links[url]}]
+                return parsed
+
+            async def fake_fetch(client, url, **kwargs):
+                return FeedFetchResult(url=url, status_code=200, content=url.encode())
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False), \
+                 patch("src.feed_worker.fetch_feed", side_effect=fake_fetch), \
+                 patch("src.feed_worker.feedparser.parse", side_effect=lambda content, **kw: parsed_for(content.decode())), \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>") as mock_fetch, \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker.run_once()
+                db.add_feed("https://mirror.example.org/feed")
+                await worker.run_once(db.active_feeds()[2:])
+                await worker.delivery.drain()
+
+            self.assertEqual(len(sent), 1)
+            self.assertEqual(worker.summarizer.summarize_ko.call_count, 1)
+            self.assertEqual(mock_fetch.call_count, 1)
+            for feed in db.active_feeds():
+                self.assertEqual(db.unseen_entry_uids(feed.id, [f"{feed.url}#1"]), [])
+            self.assertEqual(worker._claimed, set())
+
+
+class TestQuietHoursPrefetch(unittest.IsolatedAsyncioTestCase):
+    async def test_prefetch_holds_posts_until_quiet_hours_end(self):
+        """QUIET_PREFETCH면 조용한 시간에도 수집·요약하되 메시지는 종료 시각까지 보류해야 함."""
+        import tempfile
+        import time
+        from datetime import datetime, timezone
+        from email.utils import format_datetime
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://example.com/feed")
+            sent = []
+            worker = _make_worker(db, sent)
+            stamp = format_datetime(datetime.now(timezone.utc))
+            fetched = FeedFetchResult(
+                url="https://example.com/feed",
+                status_code=200,
+                content=(
+                    "<rss><channel><item><title>Night post</title><link>https://example.com/p/n</link>"
+                    f"<guid>n</guid><pubDate>{stamp}</pubDate></item></channel></rss>"
+                ).encode(),
+            )
+            release = time.time() + 3600
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=True), \
+                 patch("src.feed_worker.fetch_feed", return_value=fetched) as mock_fetch, \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker.run_once()
+                mock_fetch.assert_not_called()
+
+                worker.config.quiet_prefetch = True
+                with patch("src.feed_worker.quiet_hours_end", return_value=datetime.fromtimestamp(release)):
+                    await worker.run_once()
+                await worker.delivery.drain()
+
+            worker.summarizer.summarize_ko.assert_awaited_once()
             self.assertEqual(sent, [])
+            self.assertEqual(db.held_message_count(time.time()), 1)
+            self.assertAlmostEqual(db.next_message_due_at(), release, places=3)
+
+
+class TestDigestMode(unittest.TestCase):
+    def test_pack_messages_splits_on_entry_boundaries(self):
+        """다이제스트는 길이 제한 안에서 최대한 합치고, 항목 중간에서 자르지 않아야 함."""
+        texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 90]
+        packed = pack_messages(texts, 100, "\n\n")
+        self.assertEqual(packed, ["a" * 40 + "\n\n" + "b" * 40, "c" * 40, "d" * 90])
+        self.assertEqual(pack_messages(["x" * 150], 100), ["x" * 150])
+        self.assertEqual(pack_messages([], 100), [])
+
+
+class TestDigestCycle(unittest.IsolatedAsyncioTestCase):
+    async def test_digest_feed_summaries_sent_as_one_message(self):
+        """다이제스트 피드의 한 주기 요약들은 메시지 하나로 묶여 전송되고 모두 seen 처리돼야 함."""
+        import tempfile
+        from datetime import datetime, timezone
+        from email.utils import format_datetime
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            feed_id = db.add_feed("https://example.com/feed")
+            db.set_digest(feed_id, True)
+            sent = []
+            worker = _make_worker(db, sent)
+            stamp = format_datetime(datetime.now(timezone.utc))
+            items = "".join(
+                f"<item><title>Post {i}</title><link>https://example.com/p/{i}</link>"
+                f"<guid>uid-{i}</guid><pubDate>{stamp}</pubDate></item>"
+                for i in range(3)
+            )
+            fetched = FeedFetchResult(
+                url="https://example.com/feed",
+                status_code=200,
+                content=f"<rss><channel>{items}</channel></rss>".encode(),
+            )
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False), \
+                 patch("src.feed_worker.fetch_feed", return_value=fetched), \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker.run_once()
+                await worker.delivery.drain()
+
+            self.assertEqual(len(sent), 1)
+            self.assertLess(sent[0].index("Post 2"), sent[0].index("Post 0"))
+            self.assertIn("Post 1", sent[0])
+            self.assertEqual(db.outbox_size(), 0)
+            for i in range(3):
+                self.assertTrue(db.seen_entry(feed_id, f"uid-{i}"))
+
+    async def test_leftover_digest_parts_flushed_next_cycle(self):
+        """중단된 주기에 남은 다이제스트 항목은 다음 주기에 묶어서 보내야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            sent = []
+            worker = _make_worker(db, sent)
+            db.enqueue_digest_part(1, "@test", "left 1")
+            db.enqueue_digest_part(1, "@test", "left 2")
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False):
+                await worker.delivery.drain()
+                self.assertEqual(sent, [])
+                await worker.run_once()
+                await worker.delivery.drain()
+
+            self.assertEqual(sent, ["left 1\n\nleft 2"])
+
+
+class TestFeedProbe(unittest.IsolatedAsyncioTestCase):
+    async def test_probes_run_concurrently_and_first_poll_reuses_fetch(self):
+        """여러 피드를 동시에 검증하고, 검증 때 받은 응답을 첫 폴링에서 재사용해야 함."""
+        import tempfile
+        import time
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            worker = _make_worker(db, [])
+            calls = []
+
+            async def fake_fetch(client, url, **kwargs):
+                calls.append(url)
+                await asyncio.sleep(0.1)
+                if "missing" in url:
+                    return FeedFetchResult(url=url, status_code=404, content=b"")
+                if "page" in url:
+                    return FeedFetchResult(url=url, status_code=200, content=b"<html><body>hi</body></html>")
+                content = b"<rss><channel><title>T</title><item><guid>a</guid></item></channel></rss>"
+                return FeedFetchResult(url=url, status_code=200, content=content)
+
+            urls = [f"https://host{i}.example.com/feed" for i in range(20)]
+            urls += ["https://x.example.com/missing", "https://y.example.com/page"]
+            with patch("src.feed_worker.fetch_feed", side_effect=fake_fetch):
+                started = time.perf_counter()
+                probes = await worker.probe_feeds(urls)
+                elapsed = time.perf_counter() - started
+
+            self.assertLess(elapsed, 1.0)
+            self.assertEqual([p.url for p in probes], urls)
+            self.assertTrue(all(p.ok and p.title == "T" and p.entries == 1 for p in probes[:20]))
+            self.assertEqual(probes[20].error, "HTTP 404")
+            self.assertFalse(probes[21].ok)
+
+            # 검증만 하고 추가하지 않은 피드의 응답은 보관하지 않아야 함
+            self.assertEqual(worker._prefetched, {})
+            added = db.add_feeds([p.url for p in probes[:2]])
+            worker.keep_prefetched([p for p in probes if p.url in added])
+            self.assertEqual(list(worker._prefetched), added)
+            feed = db.active_feeds()[0]
+            calls.clear()
+            with patch("src.feed_worker.fetch_feed", side_effect=fake_fetch), \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker._process_feed(feed)
+                await worker._process_feed(db.get_feed(feed.id))
+
+            self.assertEqual(calls, [feed.url])
+
+    async def test_prefetched_bodies_are_capped(self):
+        """첫 폴링용으로 보관하는 응답은 전체 용량 한도를 넘지 않아야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            worker = _make_worker(_make_db(Path(tmp)), [])
+            body = b"<rss><channel><title>T</title><item><guid>a</guid></item></channel></rss>" + b" " * 400
+
+            async def fake_fetch(client, url, **kwargs):
+                return FeedFetchResult(url=url, status_code=200, content=body)
+
+            urls = [f"https://host{i}.example.com/feed" for i in range(10)]
+            with patch("src.feed_worker._PREFETCH_MAX_BYTES", 3 * len(body)), \
+                 patch("src.feed_worker.fetch_feed", side_effect=fake_fetch):
+                probes = await worker.probe_feeds(urls)
+                self.assertTrue(all(p.ok for p in probes))
+                self.assertEqual(sum(p.response is not None for p in probes), 3)
+                worker.keep_prefetched(probes)
+                first = list(worker._prefetched)
+                worker.keep_prefetched([await worker.probe_feed("https://new.example.com/feed")])
+
+            self.assertEqual(len(first), 3)
+            self.assertEqual(list(worker._prefetched), first[1:] + ["https://new.example.com/feed"])
+
+
+class TestStreamingParse(unittest.IsolatedAsyncioTestCase):
+    async def test_stops_after_run_of_seen_entries(self):
+        """이미 본 글이 연속으로 나오면 나머지 피드를 파싱하지 않고 새 글만 처리해야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://example.com/feed")
+            feed = db.active_feeds()[0]
+            db.mark_entries_seen(feed.id, [f"uid-{i}" for i in range(2, 300)])
+
+            sent = []
+            worker = _make_worker(db, sent)
+            items = "".join(
+                f"<item><title>Article {i}</title><link>https://example.com/p/{i}</link><guid>uid-{i}</guid>"
+                f"<description>{'본문 ' * 500}</description></item>"
+                for i in range(300)
+            )
+            fetched = FeedFetchResult(
+                url=feed.url, status_code=200, content=f"<rss><channel>{items}</channel></rss>".encode()
+            )
+
+            with patch("src.feed_worker.fetch_feed", return_value=fetched), \
+                 patch("src.feed_worker.feedparser.parse") as mock_parse, \
+                 patch.object(EntryStream, "read", autospec=True, side_effect=EntryStream.read) as mock_read, \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker._process_feed(feed)
+                await worker.delivery.drain()
+
+            mock_parse.assert_not_called()
+            self.assertEqual(mock_read.call_count, 2)
+            self.assertEqual(len(sent), 2)
+            self.assertIn("Article 1", sent[0])
+            self.assertIn("Article 0", sent[1])
+
+    async def test_relative_and_guid_links_are_fetched_and_marked_seen(self):
+        """상대 링크는 피드 URL 기준으로, guid만 있는 글은 guid로 본문을 가져오고 seen 처리돼야 함."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            db = _make_db(Path(tmp))
+            db.add_feed("https://example.com/blog/feed.xml")
+            feed = db.active_feeds()[0]
+            sent = []
+            worker = _make_worker(db, sent)
+            content = (
+                b"<rss><channel><title>Blog</title>"
+                b"<item><title>Relative</title><link>/post/1</link><guid isPermaLink='false'>r1</guid></item>"
+                b"<item><title>Guid only</title><guid>https://example.com/p/2</guid></item>"
+                b"</channel></rss>"
+            )
+            fetched = FeedFetchResult(url=feed.url, status_code=200, content=content)
+
+            with patch("src.feed_worker.is_in_quiet_hours", return_value=False), \
+                 patch("src.feed_worker.fetch_feed", return_value=fetched), \
+                 patch("src.feed_worker.fetch_html", return_value="<html>x</html>") as mock_fetch, \
+                 patch("src.feed_worker.extract_main_text", return_value="본문"):
+                await worker.run_once()
+                await worker.delivery.drain()
+
+            fetched_links = sorted(call.args[1] for call in mock_fetch.call_args_list)
+            self.assertEqual(fetched_links, ["https://example.com/p/2", "https://example.com/post/1"])
+            self.assertEqual(len(sent), 2)
+            self.assertEqual(db.unseen_entry_uids(feed.id, ["r1", "https://example.com/p/2"]), [])
+            self.assertIsNotNone(db.active_feeds()[0].content_hash)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+from src.cache import ContentCache
+from src.http_server import HttpServer, Request, Response
+from src.metrics import MetricsRegistry, metrics
+from src.telegram_app import _metrics_endpoint, format_stats
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_histogram_quantiles_and_prometheus_text(self):
+        """히스토그램 분위수와 Prometheus 텍스트 출력이 올바라야 함."""
+        registry = MetricsRegistry()
+        for seconds in (0.004, 0.004, 0.02, 3.0):
+            registry.observe("rss_stage_seconds", seconds, stage="extract")
+        registry.inc("rss_cache_requests_total", kind="html", result="hit")
+
+        hist = registry.histogram("rss_stage_seconds", stage="extract")
+        self.assertEqual(hist.quantile(0.5), 0.005)
+        self.assertEqual(hist.quantile(0.99), 5.0)
+
+        text = registry.render()
+        self.assertIn('rss_cache_requests_total{kind="html",result="hit"} 1', text)
+        self.assertIn('rss_stage_seconds_bucket{stage="extract",le="0.005"} 2', text)
+        self.assertIn('rss_stage_seconds_bucket{stage="extract",le="+Inf"} 4', text)
+        self.assertIn('rss_stage_seconds_count{stage="extract"} 4', text)
+
+    def test_format_stats_reports_cache_hit_rate_and_queues(self):
+        """/stats 출력에 단계 시간, 캐시 적중률, 큐 대기, 아웃박스 크기가 포함돼야 함."""
+        registry = MetricsRegistry()
+        registry.observe("rss_stage_seconds", 0.2, stage="summarize")
+        registry.inc("rss_cache_requests_total", kind="text", result="hit")
+        registry.inc("rss_cache_requests_total", kind="text", result="miss", amount=3)
+        registry.set_gauge("rss_queue_depth", lambda: 7, queue="extract")
+
+        text = format_stats(registry, outbox_size=2)
+        self.assertIn("- summarize: 1 ·", text)
+        self.assertIn("- text: 1/4 (25%)", text)
+        self.assertIn("extract 7", text)
+        self.assertIn("아웃박스: 2건", text)
+
+
+class TestCacheMetrics(unittest.TestCase):
+    def test_cache_counts_hits_and_misses(self):
+        """캐시 조회마다 hit/miss 카운터가 증가해야 함."""
+        metrics.reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ContentCache(Path(tmp) / "cache.db")
+            cache.get_html("https://example.com/a")
+            cache.put_html("https://example.com/a", "<html></html>")
+            cache.get_html("https://example.com/a")
+            cache.close()
+        self.assertEqual(metrics.counter("rss_cache_requests_total", kind="html", result="miss"), 1)
+        self.assertEqual(metrics.counter("rss_cache_requests_total", kind="html", result="hit"), 1)
+
+
+class TestHttpServer(unittest.IsolatedAsyncioTestCase):
+    async def test_serves_metrics_and_rejects_unknown_routes(self):
+        """내장 HTTP 서버가 /metrics를 제공하고 없는 경로는 404를 반환해야 함."""
+        metrics.reset()
+        metrics.inc("rss_feed_fetch_total", result="ok")
+
+        async def echo(request: Request) -> Response:
+            return Response.text(request.body.decode() + (request.param("x") or ""))
+
+        server = HttpServer("127.0.0.1", 0)
+        server.route("/metrics", _metrics_endpoint)
+        server.route("/echo", echo, methods=("POST",))
+        await server.start()
+        try:
+            base = f"http://127.0.0.1:{server.bound_port}"
+            async with httpx.AsyncClient() as client:
+                resp = await client.get(f"{base}/metrics")
+                self.assertEqual(resp.status_code, 200)
+                self.assertIn('rss_feed_fetch_total{result="ok"} 1', resp.text)
+                self.assertEqual((await client.post(f"{base}/echo?x=!", content=b"hi")).text, "hi!")
+                self.assertEqual((await client.get(f"{base}/echo")).status_code, 405)
+                self.assertEqual((await client.get(f"{base}/missing")).status_code, 404)
+        finally:
+            await server.stop()
+
+    async def test_body_cap_is_per_route(self):
+        """본문 한도는 경로마다 지정할 수 있고, 기본 경로는 1MB를 넘으면 413이어야 함."""
+
+        async def size(request: Request) -> Response:
+            return Response.text(str(len(request.body)))
+
+        server = HttpServer("127.0.0.1", 0)
+        server.route("/small", size, methods=("POST",))
+        server.route("/large", size, methods=("POST",), max_body_bytes=4_000_000)
+        await server.start()
+        try:
+            base = f"http://127.0.0.1:{server.bound_port}"
+            body = b"x" * 2_000_000
+            async with httpx.AsyncClient() as client:
+                self.assertEqual((await client.post(f"{base}/small", content=body)).status_code, 413)
+                self.assertEqual((await client.post(f"{base}/large", content=body)).text, "2000000")
+        finally:
+            await server.stop()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import unittest
+
+from src.opml import OpmlError, build_opml, parse_opml
+
+
+class TestOpml(unittest.TestCase):
+    def test_parse_nested_outlines(self):
+        """카테고리로 중첩된 outline의 xmlUrl도 순서대로, 중복 없이 읽어야 함."""
+        doc = b"""<?xml version="1.0"?>
+        <opml version="1.0"><head><title>subs</title></head><body>
+          <outline text="Tech">
+            <outline type="rss" text="A" xmlUrl="https://a.example.com/feed"/>
+            <outline type="rss" text="B" xmlUrl=" https://b.example.com/rss "/>
+          </outline>
+          <outline type="rss" text="A again" xmlUrl="https://a.example.com/feed"/>
+          <outline text="no url"/>
+        </body></opml>"""
+        self.assertEqual(parse_opml(doc), ["https://a.example.com/feed", "https://b.example.com/rss"])
+
+    def test_rejects_non_opml(self):
+        """OPML이 아니거나 깨진 문서는 OpmlError를 내야 함."""
+        with self.assertRaises(OpmlError):
+            parse_opml(b"<rss><channel/></rss>")
+        with self.assertRaises(OpmlError):
+            parse_opml(b"<opml><body>")
+
+    def test_export_round_trip(self):
+        """내보낸 OPML을 다시 읽으면 같은 피드 목록이어야 함."""
+        urls = ["https://a.example.com/feed", "https://b.example.com/rss?x=1&y=2"]
+        self.assertEqual(parse_opml(build_opml([(u, "") for u in urls])), urls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import unittest
+
+from src.content import extract_main_text
+from src.prompt_budget import estimate_tokens, prepare_content
+
+
+class TestPrepareContent(unittest.TestCase):
+    def test_short_text_is_kept(self):
+        """예산 이하의 본문은 그대로 유지돼야 함."""
+        text = "첫 문단입니다.\n\n두 번째 문단입니다."
+        self.assertEqual(prepare_content(text, 1000), text)
+
+    def test_duplicates_and_boilerplate_are_removed(self):
+        """중복 문단과 짧은 상용구 문단은 제거돼야 함."""
+        text = "\n\n".join(
+            [
+                "Rates rose again this quarter as inflation persisted.",
+                "Subscribe to our newsletter for more.",
+                "Rates rose again   this quarter as inflation persisted.",
+                "Share this post",
+                "Banks responded by tightening credit standards.",
+            ]
+        )
+        self.assertEqual(
+            prepare_content(text, 1000),
+            "Rates rose again this quarter as inflation persisted.\n\n"
+            "Banks responded by tightening credit standards.",
+        )
+
+    def test_content_sentences_with_boilerplate_words_survive(self):
+        """subscribers, 광고, sign up, newsletter, cookie가 들어간 본문 문장은 지우지 않아야 함."""
+        content = [
+            "The company added 19 million subscribers in the quarter.",
+            "광고 매출은 전년 대비 20% 증가했다.",
+            "Ad-supported tier now accounts for 55% of sign ups in new markets.",
+            "Its newsletter business grew while cookie deprecation hit ad targeting.",
+        ]
+        chrome = ["광고", "Subscribe now", "© 2026 Example Media. All rights reserved."]
+        text = "\n".join(content[:2] + chrome[:1] + content[2:] + chrome[1:])
+        self.assertEqual(prepare_content(text, 1000), "\n\n".join(content))
+
+    def test_over_budget_keeps_informative_paragraphs_in_order(self):
+        """예산을 넘으면 핵심 문단을 원래 순서대로 골라 예산 안에 맞춰야 함."""
+        topic = "Semiconductor demand and memory pricing drive margins for Samsung and SK Hynix."
+        filler = "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor."
+        paragraphs = [topic]
+        paragraphs += [f"{filler} {i}" for i in range(20)]
+        paragraphs.append("Memory pricing and semiconductor demand remain the key margin drivers.")
+        text = "\n\n".join(paragraphs)
+
+        reduced = prepare_content(text, 80)
+        self.assertLessEqual(estimate_tokens(reduced), 80)
+        kept = reduced.split("\n\n")
+        self.assertEqual(kept[0], topic)
+        self.assertEqual(kept[-1], paragraphs[-1])
+        self.assertEqual(kept, [p for p in paragraphs if p in kept])
+
+    def test_trafilatura_output_is_split_into_paragraphs(self):
+        """trafilatura가 한 줄씩 내놓는 문단에서도 상용구를 지우고 문단 단위로 골라야 함."""
+        topic = "Semiconductor demand and memory pricing drive margins for Samsung and SK Hynix."
+        paragraphs = [topic]
+        filler = "Analysts compared quarterly shipment figures across region number {} in detail."
+        paragraphs += [filler.format(i) for i in range(40)]
+        paragraphs.append("Subscribe to our newsletter for more.")
+        body = "".join(f"<p>{p}</p>" for p in paragraphs)
+        html = f"<html><body><article><h1>Memory prices</h1>{body}</article></body></html>"
+        text = extract_main_text("https://example.com/a", html)
+        self.assertIn("\n", text)
+        self.assertNotIn("\n\n", text)
+
+        cleaned = prepare_content(text, 10_000)
+        self.assertNotIn("Subscribe", cleaned)
+        self.assertGreaterEqual(len(cleaned.split("\n\n")), 40)
+
+        reduced = prepare_content(text, 120)
+        self.assertLessEqual(estimate_tokens(reduced), 120)
+        kept = reduced.split("\n\n")
+        self.assertGreater(len(kept), 1)
+        self.assertTrue(set(kept) <= set(text.splitlines()))
+
+    def test_oversized_single_paragraph_is_cut_at_a_sentence(self):
+        """문단 하나가 예산보다 크면 문장 경계에서 잘라야 함."""
+        text = " ".join(f"Sentence number {i} talks about memory chips." for i in range(50))
+        reduced = prepare_content(text, 40)
+        self.assertLessEqual(estimate_tokens(reduced), 40)
+        self.assertTrue(reduced.endswith("chips."))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+
+from src.provider_router import ProviderRouter
+
+
+def _after(seconds: float, result: str | None):
+    async def call():
+        await asyncio.sleep(seconds)
+        return result
+
+    return call
+
+
+class TestProviderRouter(unittest.IsolatedAsyncioTestCase):
+    async def test_primary_answers_within_hedge_delay(self):
+        """1순위가 제때 응답하면 2순위는 호출하지 않아야 함."""
+        router = ProviderRouter(default_hedge_delay=0.5)
+        called = []
+
+        async def secondary():
+            called.append("openai")
+            return "b"
+
+        result = await router.run({"gemini": _after(0.01, "a"), "openai": secondary})
+        self.assertEqual(result, "a")
+        self.assertEqual(called, [])
+
+    async def test_slow_primary_is_hedged(self):
+        """1순위가 지연되면 2순위를 병렬로 보내 먼저 온 응답을 써야 함."""
+        router = ProviderRouter(default_hedge_delay=0.05)
+        start = time.monotonic()
+        result = await router.run({"gemini": _after(2.0, "slow"), "openai": _after(0.01, "fast")})
+        self.assertEqual(result, "fast")
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    async def test_failed_primary_falls_through_immediately(self):
+        """1순위가 실패하면 지연 없이 2순위로 넘어가야 함."""
+        router = ProviderRouter(default_hedge_delay=5.0)
+        start = time.monotonic()
+        result = await router.run({"gemini": _after(0, None), "openai": _after(0, "b")})
+        self.assertEqual(result, "b")
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    async def test_hedge_delay_follows_recent_latency(self):
+        """충분한 표본이 쌓이면 hedge 지연은 최근 지연시간 백분위를 따라야 함."""
+        router = ProviderRouter(min_hedge_delay=0.0, min_samples=3)
+        for latency in (0.1, 0.2, 0.3, 0.4):
+            router._record("gemini", latency, True)
+        self.assertAlmostEqual(router.hedge_delay("gemini"), 0.4)
+
+    async def test_erroring_provider_cools_down(self):
+        """오류율이 높은 provider는 cooldown 동안 건너뛰어야 함."""
+        router = ProviderRouter(min_samples=3, error_threshold=0.5, cooldown_seconds=60)
+        called = []
+
+        async def flaky():
+            called.append(1)
+            return None
+
+        for _ in range(3):
+            await router.run({"gemini": flaky, "openai": _after(0, "b")})
+        self.assertEqual(len(called), 3)
+        self.assertEqual(await router.run({"gemini": flaky, "openai": _after(0, "b")}), "b")
+        self.assertEqual(len(called), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
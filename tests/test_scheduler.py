@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.db import Database
+from src.feed_worker import FeedWorker, WorkerConfig
+from src.fetcher import FeedFetchResult
+from src.scheduler import PollScheduler, estimate_interval
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+class TestEstimateInterval(unittest.TestCase):
+    def test_busy_feed_polled_often(self):
+        """한 시간마다 글이 올라오는 피드는 최소 간격 근처로 폴링해야 함."""
+        now = 1_000_000.0
+        stamps = [now - i * HOUR for i in range(10)]
+        self.assertEqual(estimate_interval(stamps, now, 15 * 60, DAY, HOUR), 30 * 60)
+
+    def test_dormant_feed_backs_off_to_max(self):
+        """한 달에 한 번 올라오고 오래 조용한 피드는 최대 간격으로 폴링해야 함."""
+        now = 100_000_000.0
+        stamps = [now - 60 * DAY - i * 30 * DAY for i in range(5)]
+        self.assertEqual(estimate_interval(stamps, now, 15 * 60, DAY, HOUR), DAY)
+
+    def test_without_history_uses_default(self):
+        """발행 시각이 하나 이하이면 기본 간격을 써야 함."""
+        self.assertEqual(estimate_interval([123.0], 200.0, 60, DAY, HOUR), HOUR)
+
+
+class TestPollScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_only_due_feeds_are_polled(self):
+        """next_poll_at이 지난 피드만, 빠른 순서대로 폴링해야 함."""
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "test.db")
+            a = db.add_feed("https://a.example.com/feed")
+            b = db.add_feed("https://b.example.com/feed")
+            c = db.add_feed("https://c.example.com/feed")
+            now = time.time()
+            db.update_feed_schedule(a, 3600, now - 10)
+            db.update_feed_schedule(b, 3600, now + 600)
+            db.update_feed_schedule(c, 3600, now - 100)
+
+            worker = MagicMock()
+            worker.run_once = AsyncMock()
+            due = await PollScheduler(db, worker).run_due(now)
+
+            self.assertEqual([f.id for f in due], [c, a])
+            worker.run_once.assert_awaited_once()
+
+    async def test_poll_stores_next_poll_at_from_cadence(self):
+        """폴링 후 피드의 발행 주기로 다음 폴링 시각을 저장해야 함."""
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "test.db")
+            db.add_feed("https://example.com/feed")
+            feed = db.active_feeds()[0]
+            worker = FeedWorker(
+                db=db,
+                bot=MagicMock(),
+                summarizer=MagicMock(),
+                config=WorkerConfig(channel_id="@test", quiet_start_hour=23, quiet_end_hour=8, poll_jitter=0),
+            )
+            now = time.time()
+            parsed = MagicMock()
+            parsed.bozo = False
+            parsed.entries = [
+                {"id": f"uid-{i}", "published_parsed": time.gmtime(now - 60 * DAY - i * 2 * HOUR)} for i in range(5)
+            ]
+            fetched = FeedFetchResult(url=feed.url, status_code=200, content=b"<rss/>")
+
+            with patch("src.feed_worker.fetch_feed", return_value=fetched), \
+                 patch("src.feed_worker.feedparser.parse", return_value=parsed):
+                await worker._process_feed(feed)
+
+            stored = db.active_feeds()[0]
+            # 2시간 간격으로 올라왔지만 60일째 조용하므로 최대 간격(1일)
+            self.assertEqual(stored.poll_interval_seconds, DAY)
+            self.assertAlmostEqual(stored.next_poll_at, now + DAY, delta=60)
+
+
+if __name__ == "__main__":
+    unittest.main()
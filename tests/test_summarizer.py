@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+
+from src.rate_limit import TokenBucket
+from src.summarizer import Summarizer, SummaryConfig
+
+
+def _config(**kwargs) -> SummaryConfig:
+    return SummaryConfig(
+        provider="openai",
+        gemini_api_key="",
+        gemini_model="gemini-test",
+        openai_api_key="",
+        openai_model="gpt-test",
+        **kwargs,
+    )
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str):
+        super().__init__("rate limited")
+        self.response = type("Resp", (), {"headers": {"retry-after": retry_after}})()
+
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_then_paced(self):
+        """용량만큼은 즉시, 그 이후는 rate에 맞춰 대기해야 함."""
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    async def test_pause_blocks_callers(self):
+        """pause 중에는 acquire가 대기해야 함."""
+        bucket = TokenBucket(0)
+        bucket.pause(0.1)
+        start = time.monotonic()
+        await bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+class TestSummarizerRetries(unittest.IsolatedAsyncioTestCase):
+    async def test_rate_limit_is_retried_after_retry_after(self):
+        """429 응답은 None으로 삼키지 않고 Retry-After 후 재시도해야 함."""
+        summarizer = Summarizer(_config(max_retries=2))
+        calls = []
+
+        async def call():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise _RateLimited("0.1")
+            return " 요약 "
+
+        self.assertEqual(await summarizer._call("openai", "prompt", call), "요약")
+        self.assertEqual(len(calls), 2)
+        self.assertGreaterEqual(calls[1] - calls[0], 0.09)
+
+    async def test_other_errors_give_up(self):
+        """429가 아닌 오류는 재시도 없이 None을 반환해야 함."""
+        summarizer = Summarizer(_config())
+        calls = []
+
+        async def call():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        self.assertIsNone(await summarizer._call("openai", "prompt", call))
+        self.assertEqual(len(calls), 1)
+
+    async def test_concurrency_is_capped(self):
+        """동시 호출 수가 concurrency 설정을 넘지 않아야 함."""
+        summarizer = Summarizer(_config(concurrency=2))
+        active = {"now": 0, "peak": 0}
+
+        async def call():
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return "ok"
+
+        await asyncio.gather(*(summarizer._call("gemini", "p", call) for _ in range(6)))
+        self.assertEqual(active["peak"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from telegram.ext import Application
+
+from src.http_server import Request
+from src.telegram_app import import_feeds, webhook_endpoint
+
+_UPDATE = {
+    "update_id": 42,
+    "message": {
+        "message_id": 1,
+        "date": 1700000000,
+        "chat": {"id": 7, "type": "private"},
+        "from": {"id": 7, "is_bot": False, "first_name": "Admin"},
+        "text": "/list",
+    },
+}
+
+
+def _request(body: bytes, secret: str | None) -> Request:
+    headers = {"content-type": "application/json"}
+    if secret is not None:
+        headers["x-telegram-bot-api-secret-token"] = secret
+    return Request(method="POST", path="/telegram", query={}, headers=headers, body=body)
+
+
+class TestWebhookEndpoint(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.app = Application.builder().token("123456:TEST").updater(None).build()
+        self.handle = webhook_endpoint(self.app, "s3cret")
+
+    async def test_update_with_secret_is_queued(self):
+        """올바른 secret 헤더가 있는 업데이트는 update_queue에 들어가야 함."""
+        resp = await self.handle(_request(json.dumps(_UPDATE).encode(), "s3cret"))
+
+        self.assertEqual(resp.status, 200)
+        update = self.app.update_queue.get_nowait()
+        self.assertEqual(update.update_id, 42)
+        self.assertEqual(update.message.text, "/list")
+
+    async def test_missing_or_wrong_secret_is_rejected(self):
+        """secret 헤더가 없거나 다르면 403으로 거부하고 큐에 넣지 않아야 함."""
+        body = json.dumps(_UPDATE).encode()
+        self.assertEqual((await self.handle(_request(body, None))).status, 403)
+        self.assertEqual((await self.handle(_request(body, "guess"))).status, 403)
+        self.assertTrue(self.app.update_queue.empty())
+
+    async def test_malformed_body_is_rejected(self):
+        """JSON이 아닌 본문은 400으로 거부해야 함."""
+        resp = await self.handle(_request(b"{not json", "s3cret"))
+        self.assertEqual(resp.status, 400)
+        self.assertTrue(self.app.update_queue.empty())
+
+
+class TestImportFeeds(unittest.IsolatedAsyncioTestCase):
+    async def test_oversized_file_gets_size_error(self):
+        """너무 큰 OPML 파일은 내려받지 않고 용량 초과를 알려야 함."""
+        update = MagicMock()
+        update.message.document.file_size = 50_000_000
+        update.message.document.get_file = AsyncMock()
+        update.message.reply_text = AsyncMock()
+        context = MagicMock()
+        context.application.bot_data = {"db": MagicMock(), "worker": MagicMock()}
+
+        await import_feeds(update, context)
+
+        update.message.document.get_file.assert_not_called()
+        update.message.reply_text.assert_awaited_once()
+        self.assertIn("너무 큽니다", update.message.reply_text.await_args.args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 import unittest
 
-from src.time_utils import is_in_quiet_hours
+from src.time_utils import is_in_quiet_hours, quiet_hours_end
 
 
 class QuietHourTests(unittest.TestCase):
@@ -13,6 +13,12 @@ class QuietHourTests(unittest.TestCase):
         self.assertFalse(is_in_quiet_hours(23, 8, datetime(2026, 2, 16, 8, 0, tzinfo=kst)))
         self.assertFalse(is_in_quiet_hours(23, 8, datetime(2026, 2, 16, 12, 0, tzinfo=kst)))
 
+    def test_quiet_hours_end_is_next_end_hour(self):
+        kst = ZoneInfo("Asia/Seoul")
+        morning = datetime(2026, 2, 16, 8, 0, tzinfo=kst)
+        self.assertEqual(quiet_hours_end(8, datetime(2026, 2, 15, 23, 10, tzinfo=kst)), morning)
+        self.assertEqual(quiet_hours_end(8, datetime(2026, 2, 16, 7, 59, tzinfo=kst)), morning)
+
 
 if __name__ == "__main__":
     unittest.main()
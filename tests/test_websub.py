@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import parse_qs, urlencode
+
+import httpx
+
+from src.db import Database
+from src.feed_worker import FeedWorker, WorkerConfig
+from src.fetcher import FeedFetchResult
+from src.http_server import HttpServer, Request, Response
+from src.metrics import metrics
+from src.websub import discover_hub, sign
+
+FEED_URL = "https://example.com/feed"
+
+
+class StandInHub:
+    """Minimal WebSub hub: verifies subscribers with a challenge and publishes signed bodies."""
+
+    def __init__(self):
+        self.server = HttpServer("127.0.0.1", 0)
+        self.server.route("/hub", self._subscribe, methods=("POST",))
+        self.http = httpx.AsyncClient()
+        self.subscriptions: dict[str, dict[str, str]] = {}
+        self.verified = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.bound_port}/hub"
+
+    async def _subscribe(self, request: Request) -> Response:
+        form = {k: v[0] for k, v in parse_qs(request.body.decode()).items()}
+        task = asyncio.create_task(self._verify(form))
+        self._tasks.add(task)
+        return Response(status=202)
+
+    async def _verify(self, form: dict[str, str]) -> None:
+        query = urlencode(
+            {
+                "hub.mode": form["hub.mode"],
+                "hub.topic": form["hub.topic"],
+                "hub.challenge": "challenge-123",
+                "hub.lease_seconds": form["hub.lease_seconds"],
+            }
+        )
+        resp = await self.http.get(f"{form['hub.callback']}&{query}")
+        if resp.status_code == 200 and resp.text == "challenge-123":
+            self.subscriptions[form["hub.topic"]] = form
+            self.verified.set()
+
+    async def publish(self, topic: str, body: bytes, secret: str | None = None) -> httpx.Response:
+        form = self.subscriptions[topic]
+        headers = {"Content-Type": "application/rss+xml", "X-Hub-Signature": sign(secret or form["hub.secret"], body)}
+        return await self.http.post(form["hub.callback"], content=body, headers=headers)
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.http.aclose()
+        await self.server.stop()
+
+
+def _rss(*items: tuple[str, str]) -> bytes:
+    stamp = format_datetime(datetime.now(timezone.utc))
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/p/{uid}</link><guid>{uid}</guid>"
+        f"<pubDate>{stamp}</pubDate></item>"
+        for uid, title in items
+    )
+    return f"<rss><channel><title>Example</title>{body}</channel></rss>".encode()
+
+
+class TestDiscoverHub(unittest.TestCase):
+    def test_hub_from_link_header_and_document(self):
+        """Link 헤더와 문서 안의 <atom:link rel="hub">에서 허브와 토픽을 찾아야 함."""
+        headers = {"link": '<https://hub.example.com/>; rel="hub", <https://example.com/feed.xml>; rel="self"'}
+        self.assertEqual(
+            discover_hub(FEED_URL, headers, b"<rss></rss>"),
+            ("https://hub.example.com/", "https://example.com/feed.xml"),
+        )
+        doc = (
+            b'<rss xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            b'<atom:link href="https://pubsubhubbub.appspot.com/" rel="hub"/></channel></rss>'
+        )
+        self.assertEqual(discover_hub(FEED_URL, {}, doc), ("https://pubsubhubbub.appspot.com/", FEED_URL))
+        self.assertIsNone(discover_hub(FEED_URL, {}, b"<rss><channel></channel></rss>"))
+
+
+class TestWebSubPush(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        metrics.reset()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Database(Path(self._tmp.name) / "test.db")
+        self.hub = StandInHub()
+        await self.hub.server.start()
+        self.callback_server = HttpServer("127.0.0.1", 0)
+        await self.callback_server.start()
+
+        self.sent: list[str] = []
+        bot = MagicMock()
+        bot.send_message = AsyncMock(side_effect=lambda **kw: self.sent.append(kw["text"]))
+        summarizer = MagicMock()
+        summarizer.summarize_ko = AsyncMock(return_value="요약 내용")
+        summarizer.aclose = AsyncMock()
+        config = WorkerConfig(
+            channel_id="@test",
+            quiet_start_hour=0,
+            quiet_end_hour=0,
+            telegram_messages_per_minute=60_000,
+            websub_callback_url=f"http://127.0.0.1:{self.callback_server.bound_port}",
+        )
+        self.worker = FeedWorker(db=self.db, bot=bot, summarizer=summarizer, config=config)
+        self.worker.websub.register(self.callback_server)
+
+    async def asyncTearDown(self):
+        await self.worker.aclose()
+        await self.hub.aclose()
+        await self.callback_server.stop()
+        self.db.close()
+        self._tmp.cleanup()
+
+    async def _poll(self, feed_id: int, content: bytes) -> None:
+        fetched = FeedFetchResult(
+            url=FEED_URL,
+            status_code=200,
+            content=content,
+            headers={"link": f'<{self.hub.url}>; rel="hub", <{FEED_URL}>; rel="self"'},
+        )
+        with patch("src.feed_worker.fetch_feed", return_value=fetched), \
+             patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+             patch("src.feed_worker.extract_main_text", return_value="본문"):
+            await self.worker._process_feed(self.db.get_feed(feed_id))
+            await self.worker.delivery.drain()
+
+    async def _push(self, content: bytes, secret: str | None = None) -> httpx.Response:
+        with patch("src.feed_worker.fetch_html", return_value="<html>x</html>"), \
+             patch("src.feed_worker.extract_main_text", return_value="본문"):
+            resp = await self.hub.publish(FEED_URL, content, secret=secret)
+            await asyncio.gather(*self.worker.websub._tasks)
+            await self.worker.delivery.drain()
+        return resp
+
+    async def test_subscribe_on_poll_then_receive_signed_push(self):
+        """폴링 중 허브를 발견해 구독하고, 서명된 푸시의 새 글은 즉시 전송되며 폴링 주기는 길어져야 함."""
+        feed_id = self.db.add_feed(FEED_URL)
+        await self._poll(feed_id, _rss(("uid-1", "First")))
+        await asyncio.wait_for(self.hub.verified.wait(), 5)
+
+        sub = self.db.websub_subscription(feed_id)
+        self.assertEqual(sub.state, "active")
+        self.assertEqual(sub.hub_url, self.hub.url)
+        self.assertGreater(sub.lease_until, time.time())
+        self.assertEqual(len(self.sent), 1)
+
+        resp = await self._push(_rss(("uid-2", "Pushed post"), ("uid-1", "First")))
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(len(self.sent), 2)
+        self.assertIn("Pushed post", self.sent[1])
+        self.assertTrue(self.db.seen_entry(feed_id, "uid-2"))
+
+        await self._poll(feed_id, _rss(("uid-2", "Pushed post"), ("uid-1", "First")))
+        self.assertEqual(len(self.sent), 2)
+        self.assertGreaterEqual(self.db.get_feed(feed_id).poll_interval_seconds, 12 * 3600)
+
+    async def test_push_larger_than_default_body_cap_is_accepted(self):
+        """기본 본문 한도(1MB)를 넘는 몇 MB짜리 피드 푸시도 받아 처리해야 함."""
+        feed_id = self.db.add_feed(FEED_URL)
+        await self._poll(feed_id, _rss())
+        await asyncio.wait_for(self.hub.verified.wait(), 5)
+
+        padding = "<!--" + "x" * 3_000_000 + "-->"
+        body = _rss(("uid-big", "Big feed post")).replace(b"</channel>", padding.encode() + b"</channel>")
+        resp = await self._push(body)
+
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(len(self.sent), 1)
+        self.assertIn("Big feed post", self.sent[0])
+
+    async def test_push_with_bad_signature_is_ignored(self):
+        """잘못된 서명의 푸시는 202로 응답하되 처리하지 않아야 함."""
+        feed_id = self.db.add_feed(FEED_URL)
+        await self._poll(feed_id, _rss())
+        await asyncio.wait_for(self.hub.verified.wait(), 5)
+
+        resp = await self._push(_rss(("uid-9", "Forged")), secret="wrong-secret")
+
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(self.sent, [])
+        self.assertFalse(self.db.seen_entry(feed_id, "uid-9"))
+        self.assertEqual(metrics.counter("rss_websub_pushes_total", result="bad_signature"), 1)
+
+    async def test_lease_near_expiry_is_renewed(self):
+        """만료가 가까운 구독은 같은 secret으로 다시 요청해야 함."""
+        feed_id = self.db.add_feed(FEED_URL)
+        await self._poll(feed_id, _rss())
+        await asyncio.wait_for(self.hub.verified.wait(), 5)
+        secret = self.db.websub_subscription(feed_id).secret
+        self.db.activate_websub(feed_id, time.time() + 60)
+        self.hub.verified.clear()
+        self.assertEqual(await self.worker.websub.renew_due(), 0)  # requested moments ago
+
+        with self.db.conn:
+            self.db.conn.execute("UPDATE websub SET requested_at = requested_at - 7200")
+        self.assertEqual(await self.worker.websub.renew_due(), 1)
+        self.assertTrue(await self.worker.websub.is_active(feed_id))
+        await asyncio.wait_for(self.hub.verified.wait(), 5)
+
+        sub = self.db.websub_subscription(feed_id)
+        self.assertEqual(sub.secret, secret)
+        self.assertGreater(sub.lease_until, time.time() + 86400)
+
+    async def test_unsolicited_verification_is_refused_and_lease_capped(self):
+        """요청하지 않은 확인 요청은 거부하고, 허브가 준 lease는 요청한 값을 넘지 않아야 함."""
+        feed_id = self.db.add_feed(FEED_URL)
+        callback = self.worker.websub.callback_for(feed_id)
+        forged = {
+            "hub.mode": "subscribe",
+            "hub.topic": FEED_URL,
+            "hub.challenge": "c",
+            "hub.lease_seconds": "999999999",
+        }
+        async with httpx.AsyncClient() as client:
+            resp = await client.get(f"{callback}&{urlencode(forged)}")
+            self.assertEqual(resp.status_code, 404)
+            self.assertIsNone(self.db.websub_subscription(feed_id))
+
+            self.db.save_websub_request(feed_id, self.hub.url, FEED_URL, "secret", "pending")
+            resp = await client.get(f"{callback}&{urlencode(forged)}")
+            self.assertEqual(resp.text, "c")
+            sub = self.db.websub_subscription(feed_id)
+            self.assertEqual(sub.state, "active")
+            self.assertLessEqual(sub.lease_until, time.time() + self.worker.websub.lease_seconds)
+
+            # 이미 확인된 구독에 다시 온 확인 요청은 lease를 늘리지 못해야 함
+            self.db.activate_websub(feed_id, time.time() + 60)
+            resp = await client.get(f"{callback}&{urlencode(forged)}")
+            self.assertEqual(resp.status_code, 404)
+            self.assertLess(self.db.websub_subscription(feed_id).lease_until, time.time() + 120)
+
+
+if __name__ == "__main__":
+    unittest.main()